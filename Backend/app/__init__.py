@@ -32,14 +32,22 @@ def create_app():
     })
     bcrypt.init_app(app)
 
+    from . import db
+    db.init_app(app)
+
     from . import (
         auth, dashboard, upload,
         academic_stats, administrative_stats, grievance_stats,
         ewd_stats, iar_stats, education_stats, placement_stats,
         academic_module, research_module, innovation_module,
         industry_connect_module, outreach_extension_module, nirf_stats,
+        export,
     )
 
+    from . import schema, aggregates
+    schema.init_app(app, upload.UPDATABLE_TABLES)
+    aggregates.init_app(app)
+
     app.register_blueprint(auth.auth_bp,                              url_prefix='/auth')
     app.register_blueprint(dashboard.dashboard_bp,                    url_prefix='/api')
     app.register_blueprint(upload.upload_bp,                          url_prefix='/api')
@@ -56,6 +64,7 @@ def create_app():
     app.register_blueprint(innovation_module.innovation_bp,            url_prefix='/api/innovation')
     app.register_blueprint(industry_connect_module.industry_connect_bp, url_prefix='/api/industry-connect')
     app.register_blueprint(outreach_extension_module.outreach_extension_bp, url_prefix='/api/outreach-extension')
+    app.register_blueprint(export.export_bp,                          url_prefix='/api')
 
     @app.route('/health')
     def health_check():
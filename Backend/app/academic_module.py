@@ -1,12 +1,16 @@
 """Analytics for the Academic module (courses_table)."""
 from flask import Blueprint, jsonify, request
 
+from . import pagination, schema, search
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 academic_module_bp = Blueprint('academic_module', __name__)
 
 COURSES_TABLE = 'courses_table'
+COURSE_SEARCH_COLUMNS = ('course_code', 'course_name', 'proposing_faculty_name')
+COURSE_ORDER = [pagination.Key('course_code')]
 
 
 def build_where_clause(filters, mapping):
@@ -23,28 +27,8 @@ def build_where_clause(filters, mapping):
 
 
 def table_exists(table_name: str) -> bool:
-    """Returns True if the given table exists in the public schema."""
-    conn = None
-    try:
-        conn = get_db_connection()
-        if not conn:
-            return False
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND table_name = %s) AS exists_flag;",
-            (table_name,)
-        )
-        row = cur.fetchone()
-        return bool(row and row.get('exists_flag'))
-    except Exception as exc:
-        print(f"Table check failed ({table_name}): {exc}")
-        return False
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    """Returns True if the given table exists in the public schema (served from the schema cache)."""
+    return schema.tables_available(table_name)
 
 
 def module_tables_available() -> bool:
@@ -55,6 +39,7 @@ def module_tables_available() -> bool:
 
 @academic_module_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached(COURSES_TABLE)
 def get_filter_options(current_user_id):
     if not module_tables_available():
         return jsonify({'message': 'Academic module tables are missing.'}), 500
@@ -104,6 +89,7 @@ def get_filter_options(current_user_id):
 
 @academic_module_bp.route('/summary', methods=['GET'])
 @token_required
+@cached(COURSES_TABLE)
 def get_summary(current_user_id):
     if not module_tables_available():
         return jsonify({'message': 'Academic module tables are missing.'}), 500
@@ -178,6 +164,7 @@ def get_summary(current_user_id):
 
 @academic_module_bp.route('/category-breakdown', methods=['GET'])
 @token_required
+@cached(COURSES_TABLE)
 def get_category_breakdown(current_user_id):
     """Course count by category (CORE, ELECTIVE, MOOC)."""
     if not module_tables_available():
@@ -222,6 +209,7 @@ def get_category_breakdown(current_user_id):
 
 @academic_module_bp.route('/programme-breakdown', methods=['GET'])
 @token_required
+@cached(COURSES_TABLE)
 def get_programme_breakdown(current_user_id):
     """Course count by target programme (BTECH, MTECH, MSC, PHD)."""
     if not module_tables_available():
@@ -266,6 +254,7 @@ def get_programme_breakdown(current_user_id):
 
 @academic_module_bp.route('/courses', methods=['GET'])
 @token_required
+@cached(COURSES_TABLE)
 def get_courses(current_user_id):
     """Paginated, filterable course list."""
     if not module_tables_available():
@@ -277,9 +266,8 @@ def get_courses(current_user_id):
         'status': request.args.get('status'),
         'proposal_type': request.args.get('proposal_type'),
     }
-    search = request.args.get('search', '', type=str).strip()
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
+    search_term = request.args.get('search', '', type=str).strip()
+    page_request = pagination.from_request(default_per_page=20, max_per_page=100)
 
     conn = None
     cur = None
@@ -306,22 +294,14 @@ def get_courses(current_user_id):
             where_clause = f"WHERE {industry_filter}"
 
         # Add search
-        if search:
-            search_cond = "(course_code ILIKE %s OR course_name ILIKE %s OR proposing_faculty_name ILIKE %s)"
-            pattern = f'%{search}%'
-            if where_clause:
-                where_clause += f" AND {search_cond}"
-            else:
-                where_clause = f"WHERE {search_cond}"
-            params.extend([pattern, pattern, pattern])
-
-        # Total count
-        cur.execute(f"SELECT COUNT(*) AS total FROM {COURSES_TABLE} {where_clause}", params)
-        total = (cur.fetchone() or {}).get('total', 0)
-
-        # Paginated data
-        offset = (page - 1) * per_page
-        cur.execute(
+        search_cond, search_params = search.condition(search_term, COURSE_SEARCH_COLUMNS)
+        if search_cond:
+            where_clause += f" AND {search_cond}"
+            params.extend(search_params)
+        rank, rank_params, rank_keys = search.rank_column(conn, search_term, COURSE_SEARCH_COLUMNS)
+
+        rows, page_info = pagination.fetch(
+            cur,
             f"""
             SELECT
                 course_code,
@@ -339,25 +319,22 @@ def get_courses(current_user_id):
                     ELSE 'Inactive'
                 END AS status,
                 proposal_type
+                {rank}
             FROM {COURSES_TABLE}
             {where_clause}
-            ORDER BY course_code ASC
-            LIMIT %s OFFSET %s
             """,
-            params + [per_page, offset]
+            rank_params + params,
+            rank_keys + COURSE_ORDER,
+            [COURSES_TABLE],
+            page_request,
         )
-        rows = cur.fetchall() or []
         courses = [dict(row) for row in rows]
+        for course in courses:
+            course.pop('search_rank', None)
 
-        return jsonify({
-            'data': courses,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': (total + per_page - 1) // per_page if total > 0 else 0
-            }
-        }), 200
+        return jsonify({'data': courses, 'pagination': page_info}), 200
+    except pagination.InvalidCursor as exc:
+        return jsonify({'message': str(exc)}), 400
     except UndefinedTable:
         return jsonify({'message': 'Academic module tables are missing.'}), 500
     except Exception as exc:
@@ -1,35 +1,53 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
 from flask import Blueprint, jsonify, request
 from .db import get_db_connection
+from .cache import cached, memoize
 from .auth import token_required
+from .filter_options import Dimension, distinct_values
+from . import aggregates, periods
 
 academic_bp = Blueprint('academic', __name__)
 
 # New table name (was 'student')
 STUDENT_TABLE = 'student_table'
 
-
-def get_latest_year():
-    """Returns the maximum admission_year from the student_table."""
-    conn = None
+# Filter-option key → student_table column, in the order the UI shows them.
+STUDENT_FILTER_DIMENSIONS = (
+    Dimension('yearofadmission', 'admission_year', 'DESC'),
+    Dimension('program', 'programme_current'),
+    Dimension('batch', 'admission_batch'),
+    Dimension('branch', 'stream_current'),
+    Dimension('department', 'department_current'),
+    Dimension('category', 'original_category'),
+    Dimension('state', 'state'),
+)
+
+# Frontend filter names → student_table (and student_cube) columns.
+FILTER_COLUMNS = {
+    'yearofadmission': 'admission_year',
+    'program': 'programme_current',
+    'batch': 'admission_batch',
+    'branch': 'stream_current',
+    'department': 'department_current',
+    'category': 'original_category',
+    'gender': 'gender',
+    'state': 'state',
+    'pwd': 'pwd_status'
+}
+
+
+def get_latest_year(conn):
+    """
+    Returns the maximum admission_year from the student_table, memoized
+    until the next student upload.
+    """
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return None
-
-        cur = conn.cursor()
-        cur.execute(f"SELECT MAX(admission_year) as latest_year FROM {STUDENT_TABLE};")
-        result = cur.fetchone()
-
-        if result and result['latest_year']:
-            return result['latest_year']
-        return None
+        return periods.latest(conn, periods.ADMISSION_YEAR) or None
     except Exception as e:
         print(f"Error getting latest year: {e}")
+        conn.rollback()
         return None
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
 
 def build_filter_query(filters):
@@ -40,24 +58,11 @@ def build_filter_query(filters):
     conditions = []
     params = []
 
-    # Map frontend filter names to new database column names
-    filter_mapping = {
-        'yearofadmission': 'admission_year',
-        'program': 'programme_current',
-        'batch': 'admission_batch',
-        'branch': 'stream_current',
-        'department': 'department_current',
-        'category': 'original_category',
-        'gender': 'gender',
-        'state': 'state',
-        'pwd': 'pwd_status'
-    }
-
     for filter_name, value in filters.items():
         if value is None or value == '' or value == 'All':
             continue
 
-        column_name = filter_mapping.get(filter_name)
+        column_name = FILTER_COLUMNS.get(filter_name)
         if not column_name:
             continue
 
@@ -83,368 +88,363 @@ def build_filter_query(filters):
     return where_clause, params
 
 
-@academic_bp.route('/stats/filter-options', methods=['GET'])
-@token_required
-def get_filter_options(current_user_id):
-    """Fetches distinct values for each filter field."""
-    conn = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': 'Database connection failed!'}), 500
+# ---------------------------------------------------------------------------
+# Widgets. Each chart of the academic page counts students by a few
+# student_cube columns under its own filters. compute_widgets() answers any
+# set of them from one GROUP BY: filters every widget shares go into the
+# WHERE clause, the rest become extra grouping columns and are applied while
+# slicing the counted rows for each widget in Python.
+# ---------------------------------------------------------------------------
 
-        cur = conn.cursor()
+GENDERS = ('Male', 'Female', 'Transgender')
 
-        filter_options = {}
 
-        # Year of Admission (admission_year)
-        cur.execute(f"SELECT DISTINCT admission_year FROM {STUDENT_TABLE} WHERE admission_year IS NOT NULL ORDER BY admission_year DESC;")
-        filter_options['yearofadmission'] = [row['admission_year'] for row in cur.fetchall()]
+class WidgetError(Exception):
+    """A widget that cannot be computed for the given filters (answered with a 400)."""
 
-        # Program (programme_current)
-        cur.execute(f"SELECT DISTINCT programme_current FROM {STUDENT_TABLE} WHERE programme_current IS NOT NULL ORDER BY programme_current;")
-        filter_options['program'] = [row['programme_current'] for row in cur.fetchall()]
 
-        # Batch (admission_batch)
-        cur.execute(f"SELECT DISTINCT admission_batch FROM {STUDENT_TABLE} WHERE admission_batch IS NOT NULL ORDER BY admission_batch;")
-        filter_options['batch'] = [row['admission_batch'] for row in cur.fetchall()]
+class Widget(NamedTuple):
+    label: str                    # used in error messages
+    filters: Tuple[str, ...]      # filter keys the widget accepts
+    group_by: Tuple[str, ...]     # student_cube columns it counts by
+    view: Callable[[List[Dict[str, Any]], Dict[str, Any]], Dict[str, Any]]
+    latest_year: Optional[str] = None   # 'default' / 'required': yearofadmission falls back to the latest year
 
-        # Branch (stream_current)
-        cur.execute(f"SELECT DISTINCT stream_current FROM {STUDENT_TABLE} WHERE stream_current IS NOT NULL ORDER BY stream_current;")
-        filter_options['branch'] = [row['stream_current'] for row in cur.fetchall()]
 
-        # Department (department_current)
-        cur.execute(f"SELECT DISTINCT department_current FROM {STUDENT_TABLE} WHERE department_current IS NOT NULL ORDER BY department_current;")
-        filter_options['department'] = [row['department_current'] for row in cur.fetchall()]
+def _filters_applied(filters):
+    return {k: v for k, v in filters.items() if v is not None and v != '' and v != 'All'}
 
-        # Category (original_category)
-        cur.execute(f"SELECT DISTINCT original_category FROM {STUDENT_TABLE} WHERE original_category IS NOT NULL ORDER BY original_category;")
-        filter_options['category'] = [row['original_category'] for row in cur.fetchall()]
 
-        # State
-        cur.execute(f"SELECT DISTINCT state FROM {STUDENT_TABLE} WHERE state IS NOT NULL ORDER BY state;")
-        filter_options['state'] = [row['state'] for row in cur.fetchall()]
+def gender_distribution_view(rows, filters):
+    gender_data = dict.fromkeys(GENDERS, 0)
+    for row in rows:
+        if row['gender'] in gender_data:
+            gender_data[row['gender']] = row['count']
+    return {
+        'data': gender_data,
+        'total': sum(gender_data.values()),
+        'filters_applied': _filters_applied(filters),
+    }
 
-        # Get latest year
-        latest_year = get_latest_year()
-        filter_options['latest_year'] = latest_year
 
-        return jsonify(filter_options), 200
+def student_strength_view(rows, filters):
+    # programme_current is aliased as 'name' for frontend compatibility.
+    program_data = {}
+    for row in rows:
+        program = row['programme_current']
+        if program not in program_data:
+            program_data[program] = {'name': program, **dict.fromkeys(GENDERS, 0)}
+        if row['gender'] in program_data[program]:
+            program_data[program][row['gender']] = row['count']
+    data = list(program_data.values())
+    return {
+        'data': data,
+        'total': sum(sum(entry[g] for g in GENDERS) for entry in data),
+        'filters_applied': _filters_applied(filters),
+    }
 
-    except Exception as e:
-        print(f"Error fetching filter options: {e}")
-        return jsonify({'message': 'An error occurred while fetching filter options.'}), 500
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
+def gender_trends_view(rows, filters):
+    year_data = {}
+    for row in rows:
+        year = row['admission_year']
+        if year is None:
+            continue
+        if year not in year_data:
+            year_data[year] = {'year': year, **dict.fromkeys(GENDERS, 0)}
+        if row['gender'] in year_data[year]:
+            year_data[year][row['gender']] = row['count']
+    return {'data': sorted(year_data.values(), key=lambda x: x['year'])}
+
+
+def program_trends_view(rows, filters):
+    year_data = {}
+    all_programs = set()
+    for row in rows:
+        year = row['admission_year']
+        if year is None:
+            continue
+        all_programs.add(row['programme_current'])
+        year_data.setdefault(year, {'year': year})[row['programme_current']] = row['count']
+
+    final_data = []
+    for year in sorted(year_data.keys()):
+        entry = year_data[year]
+        for prog in all_programs:
+            entry.setdefault(prog, 0)
+        final_data.append(entry)
+    return {'data': final_data, 'programs': list(all_programs)}
+
+
+WIDGETS = {
+    'gender-distribution-filtered': Widget(
+        'gender distribution',
+        ('yearofadmission', 'program', 'batch', 'branch', 'department', 'category', 'pwd'),
+        ('gender',), gender_distribution_view, latest_year='default'),
+    'student-strength': Widget(
+        'student strength',
+        ('yearofadmission', 'category', 'state'),
+        ('programme_current', 'gender'), student_strength_view, latest_year='required'),
+    'gender-trends': Widget(
+        'gender trends',
+        ('program', 'batch', 'branch', 'department', 'category', 'pwd'),
+        ('admission_year', 'gender'), gender_trends_view),
+    'program-trends': Widget(
+        'program trends',
+        ('category', 'state'),
+        ('admission_year', 'programme_current'), program_trends_view),
+}
+
+
+def widget_filters(conn, widget, values):
+    """
+    The widget's filters from request arguments or a batch spec, normalised
+    as the endpoints always have: '' means unset, 'All' means every year,
+    pwd 'true' / 'false' becomes a boolean.
+    """
+    filters = {}
+    for key in widget.filters:
+        value = values.get(key)
+        if value is None or value == '':
+            value = None
+        elif key == 'pwd':
+            value = {'true': True, 'false': False}.get(value, value) if isinstance(value, str) else value
+        else:
+            value = str(value)
+        filters[key] = value
 
-@academic_bp.route('/stats/gender-distribution-filtered', methods=['GET'])
-@token_required
-def get_gender_distribution_filtered(current_user_id):
-    """Fetches gender distribution based on provided filters."""
-    conn = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': 'Database connection failed!'}), 500
+    if widget.latest_year and filters.get('yearofadmission') is None:
+        filters['yearofadmission'] = get_latest_year(conn)
+        if filters['yearofadmission'] is None and widget.latest_year == 'required':
+            raise WidgetError('No admission year data available.')
+    return filters
 
-        yearofadmission_param = request.args.get('yearofadmission', type=str)
-
-        filters = {
-            'yearofadmission': None,
-            'program': request.args.get('program', type=str),
-            'batch': request.args.get('batch', type=str),
-            'branch': request.args.get('branch', type=str),
-            'department': request.args.get('department', type=str),
-            'category': request.args.get('category', type=str),
-            'pwd': request.args.get('pwd', type=str)
-        }
-
-        if yearofadmission_param == 'All':
-            filters['yearofadmission'] = 'All'
-        elif yearofadmission_param:
-            filters['yearofadmission'] = yearofadmission_param
-
-        # Convert PWD string to boolean if provided
-        if filters['pwd'] == 'true':
-            filters['pwd'] = True
-        elif filters['pwd'] == 'false':
-            filters['pwd'] = False
-        elif filters['pwd'] == '' or filters['pwd'] is None:
-            filters['pwd'] = None
-
-        if filters['yearofadmission'] is None:
-            latest_year = get_latest_year()
-            if latest_year:
-                filters['yearofadmission'] = latest_year
-
-        where_clause, params = build_filter_query(filters)
-
-        query = f"""
-            SELECT gender, COUNT(*) as count
-            FROM {STUDENT_TABLE}
-            {where_clause}
-            GROUP BY gender
-            ORDER BY gender;
-        """
 
-        cur = conn.cursor()
-        cur.execute(query, params)
-        results = cur.fetchall()
+def _active_filters(filters):
+    """The (key, value) pairs build_filter_query() turns into conditions."""
+    return {
+        k: v for k, v in _filters_applied(filters).items()
+        if k in FILTER_COLUMNS and (k != 'pwd' or isinstance(v, bool))
+    }
 
-        gender_data = {
-            'Male': 0,
-            'Female': 0,
-            'Transgender': 0
-        }
 
-        for row in results:
-            gender = row['gender']
-            if gender in gender_data:
-                gender_data[gender] = row['count']
+def fetch_student_counts(conn, where_clause, params, columns):
+    """
+    Student counts grouped by ``columns`` for the given filter, from the
+    student cube (or the live table while it is stale). Memoized until the
+    next student upload; the returned rows are shared, do not mutate them.
+    """
+    def fetch():
+        src = aggregates.source(conn, aggregates.STUDENT_CUBE)
+        cur = conn.cursor()
+        try:
+            # <column>_rank: position of the value in SQL order, so slices sort as ORDER BY would.
+            ranks = ', '.join(f"DENSE_RANK() OVER (ORDER BY {c}) AS {c}_rank" for c in columns)
+            cur.execute(
+                f"""
+                SELECT {', '.join(columns)}, {src.count} AS count, {ranks}
+                FROM {src.relation}
+                {where_clause}
+                GROUP BY {', '.join(columns)};
+                """,
+                params
+            )
+            return [dict(row) for row in cur.fetchall()]
+        finally:
+            cur.close()
 
-        total = sum(gender_data.values())
+    return memoize(('student-counts', where_clause, tuple(params), tuple(columns)), [STUDENT_TABLE], fetch)
 
-        filters_applied = {
-            k: v for k, v in filters.items()
-            if v is not None and v != '' and v != 'All'
-        }
 
-        return jsonify({
-            'data': gender_data,
-            'total': total,
-            'filters_applied': filters_applied
-        }), 200
+def _slice(rows, filters, group_by):
+    """
+    Re-counts ``rows`` by ``group_by`` over the rows matching ``filters``,
+    ordered by ``group_by`` like the equivalent GROUP BY ... ORDER BY query.
+    """
+    conditions = []
+    for key, value in filters.items():
+        if key == 'pwd':
+            value = 'Yes' if value else 'No'
+        conditions.append((FILTER_COLUMNS[key], value))
 
-    except Exception as e:
-        print(f"Error fetching gender distribution: {e}")
-        return jsonify({'message': 'An error occurred while fetching gender distribution.'}), 500
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    counts, order = {}, {}
+    for row in rows:
+        if all(row[column] is not None and str(row[column]) == value for column, value in conditions):
+            key = tuple(row[column] for column in group_by)
+            counts[key] = counts.get(key, 0) + row['count']
+            order[key] = tuple(row[f'{column}_rank'] for column in group_by)
+    return [dict(zip(group_by, key), count=counts[key]) for key in sorted(counts, key=order.get)]
 
 
-@academic_bp.route('/stats/student-strength', methods=['GET'])
-@token_required
-def get_student_strength(current_user_id):
-    """Fetches student strength grouped by program with gender breakdown."""
+def compute_widgets(conn, requested):
+    """
+    Computes ``[(widget, filters), ...]`` (filters from widget_filters()) and
+    returns their payloads in order, from a single grouped student count.
+    """
+    active = [_active_filters(filters) for _, filters in requested]
+    shared = dict(set.intersection(*(set(a.items()) for a in active))) if active else {}
+
+    columns = []
+    for (widget, _), own in zip(requested, active):
+        extra = [FILTER_COLUMNS[k] for k in own if k not in shared]
+        for column in list(widget.group_by) + extra:
+            if column not in columns:
+                columns.append(column)
+    if not columns:
+        return []
+
+    where_clause, params = build_filter_query(shared)
+    rows = fetch_student_counts(conn, where_clause, params, columns)
+    return [
+        widget.view(_slice(rows, {k: v for k, v in own.items() if k not in shared}, widget.group_by), filters)
+        for (widget, filters), own in zip(requested, active)
+    ]
+
+
+def filter_options_view(conn):
+    # One GROUPING SETS scan for every dropdown, memoized until the next upload.
+    options = distinct_values(conn, STUDENT_TABLE, STUDENT_FILTER_DIMENSIONS)
+    filter_options = {key: list(values) for key, values in options.items()}
+
+    # Latest year is the first entry of the descending year list.
+    years = filter_options['yearofadmission']
+    filter_options['latest_year'] = (years[0] or None) if years else None
+    return filter_options
+
+
+def widget_response(name):
+    """Serves one widget for the current request's query string."""
+    widget = WIDGETS[name]
     conn = None
     try:
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed!'}), 500
-
-        yearofadmission_param = request.args.get('yearofadmission', type=str)
-
-        filters = {
-            'yearofadmission': None,
-            'category': request.args.get('category', type=str),
-            'state': request.args.get('state', type=str)
-        }
-
-        if yearofadmission_param == 'All':
-            filters['yearofadmission'] = 'All'
-        elif yearofadmission_param:
-            filters['yearofadmission'] = yearofadmission_param
-
-        if filters['yearofadmission'] is None:
-            latest_year = get_latest_year()
-            if latest_year:
-                filters['yearofadmission'] = latest_year
-            else:
-                return jsonify({'message': 'No admission year data available.'}), 400
-
-        if filters['yearofadmission'] is None:
-            return jsonify({'message': 'yearofadmission is required.'}), 400
-
-        where_clause, params = build_filter_query(filters)
-
-        # Use programme_current but alias as 'name' for frontend compatibility
-        query = f"""
-            SELECT programme_current as name, gender, COUNT(*) as count
-            FROM {STUDENT_TABLE}
-            {where_clause}
-            GROUP BY programme_current, gender
-            ORDER BY programme_current, gender;
-        """
-
-        cur = conn.cursor()
-        cur.execute(query, params)
-        results = cur.fetchall()
-
-        program_data = {}
-        for row in results:
-            program = row['name']
-            gender = row['gender']
-            count = row['count']
-
-            if program not in program_data:
-                program_data[program] = {
-                    'name': program,
-                    'Male': 0,
-                    'Female': 0,
-                    'Transgender': 0
-                }
-
-            if gender in program_data[program]:
-                program_data[program][gender] = count
-
-        data = list(program_data.values())
-        total = sum(row['Male'] + row['Female'] + row['Transgender'] for row in data)
-
-        filters_applied = {
-            k: v for k, v in filters.items()
-            if v is not None and v != '' and v != 'All'
-        }
-
-        return jsonify({
-            'data': data,
-            'total': total,
-            'filters_applied': filters_applied
-        }), 200
-
+        filters = widget_filters(conn, widget, request.args)
+        return jsonify(compute_widgets(conn, [(widget, filters)])[0]), 200
+    except WidgetError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
-        print(f"Error fetching student strength: {e}")
-        return jsonify({'message': 'An error occurred while fetching student strength.'}), 500
+        print(f"Error fetching {widget.label}: {e}")
+        return jsonify({'message': f'An error occurred while fetching {widget.label}.'}), 500
     finally:
         if conn:
-            cur.close()
             conn.close()
 
 
-@academic_bp.route('/stats/gender-trends', methods=['GET'])
+@academic_bp.route('/stats/filter-options', methods=['GET'])
 @token_required
-def get_gender_trends(current_user_id):
-    """Fetches gender distribution grouped by year of admission."""
+@cached(STUDENT_TABLE)
+def get_filter_options(current_user_id):
+    """Fetches distinct values for each filter field."""
     conn = None
     try:
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed!'}), 500
+        return jsonify(filter_options_view(conn)), 200
 
-        filters = {
-            'program': request.args.get('program', type=str),
-            'batch': request.args.get('batch', type=str),
-            'branch': request.args.get('branch', type=str),
-            'department': request.args.get('department', type=str),
-            'category': request.args.get('category', type=str),
-            'pwd': request.args.get('pwd', type=str)
-        }
-
-        if filters['pwd'] == 'true':
-            filters['pwd'] = True
-        elif filters['pwd'] == 'false':
-            filters['pwd'] = False
-        elif filters['pwd'] == '' or filters['pwd'] is None:
-            filters['pwd'] = None
-
-        where_clause, params = build_filter_query(filters)
-
-        # Use admission_year but alias as 'yearofadmission' for frontend compatibility
-        query = f"""
-            SELECT admission_year as yearofadmission, gender, COUNT(*) as count
-            FROM {STUDENT_TABLE}
-            {where_clause}
-            GROUP BY admission_year, gender
-            ORDER BY admission_year;
-        """
-
-        cur = conn.cursor()
-        cur.execute(query, params)
-        results = cur.fetchall()
-
-        year_data = {}
-        for row in results:
-            year = row['yearofadmission']
-            if year is None:
-                continue
+    except Exception as e:
+        print(f"Error fetching filter options: {e}")
+        return jsonify({'message': 'An error occurred while fetching filter options.'}), 500
+    finally:
+        if conn:
+            conn.close()
 
-            gender = row['gender']
-            count = row['count']
 
-            if year not in year_data:
-                year_data[year] = {'year': year, 'Male': 0, 'Female': 0, 'Transgender': 0}
+@academic_bp.route('/stats/gender-distribution-filtered', methods=['GET'])
+@token_required
+@cached(STUDENT_TABLE)
+def get_gender_distribution_filtered(current_user_id):
+    """Fetches gender distribution based on provided filters (latest admission year by default)."""
+    return widget_response('gender-distribution-filtered')
 
-            if gender in year_data[year]:
-                year_data[year][gender] = count
 
-        data = sorted(list(year_data.values()), key=lambda x: x['year'])
+@academic_bp.route('/stats/student-strength', methods=['GET'])
+@token_required
+@cached(STUDENT_TABLE)
+def get_student_strength(current_user_id):
+    """Fetches student strength grouped by program with gender breakdown."""
+    return widget_response('student-strength')
 
-        return jsonify({'data': data}), 200
 
-    except Exception as e:
-        print(f"Error fetching gender trends: {e}")
-        return jsonify({'message': 'An error occurred while fetching gender trends.'}), 500
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+@academic_bp.route('/stats/gender-trends', methods=['GET'])
+@token_required
+@cached(STUDENT_TABLE)
+def get_gender_trends(current_user_id):
+    """Fetches gender distribution grouped by year of admission."""
+    return widget_response('gender-trends')
 
 
 @academic_bp.route('/stats/program-trends', methods=['GET'])
 @token_required
+@cached(STUDENT_TABLE)
 def get_program_trends(current_user_id):
     """Fetches student strength by program grouped by year of admission."""
-    conn = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': 'Database connection failed!'}), 500
+    return widget_response('program-trends')
 
-        filters = {
-            'category': request.args.get('category', type=str),
-            'state': request.args.get('state', type=str)
-        }
 
-        where_clause, params = build_filter_query(filters)
+@academic_bp.route('/stats/batch', methods=['POST'])
+@token_required
+def get_batch(current_user_id):
+    """
+    Several academic widgets in one request, on one connection and from one
+    grouped student count. JSON body::
 
-        # Use admission_year and programme_current with aliases for frontend compatibility
-        query = f"""
-            SELECT admission_year as yearofadmission, programme_current as program, COUNT(*) as count
-            FROM {STUDENT_TABLE}
-            {where_clause}
-            GROUP BY admission_year, programme_current
-            ORDER BY admission_year;
-        """
+        {"filters": {"category": "OBC"},
+         "widgets": ["filter-options", "gender-trends",
+                     {"type": "student-strength", "id": "strength", "filters": {"state": "Kerala"}}]}
 
-        cur = conn.cursor()
-        cur.execute(query, params)
-        results = cur.fetchall()
+    ``filters`` apply to every widget (each takes the keys its own endpoint
+    takes); a widget's own ``filters`` override them. The response maps each
+    widget's ``id`` (default: its type) to what its endpoint returns, with
+    per-widget failures under ``errors``.
+    """
+    body = request.get_json(silent=True) or {}
+    shared = body.get('filters') or {}
+    specs = body.get('widgets')
+    if not isinstance(shared, dict) or not isinstance(specs, list) or not specs:
+        return jsonify({'message': 'Expected {"filters": {...}, "widgets": [...]}.'}), 400
+
+    parsed = []
+    for spec in specs:
+        if isinstance(spec, str):
+            spec = {'type': spec}
+        if not isinstance(spec, dict) or not isinstance(spec.get('filters') or {}, dict):
+            return jsonify({'message': 'Each widget must be a type name or {"type": ..., "filters": {...}}.'}), 400
+        kind = spec.get('type')
+        if kind != 'filter-options' and kind not in WIDGETS:
+            return jsonify({'message': f"Unknown widget type: {kind}"}), 400
+        key = str(spec.get('id') or kind)
+        if any(key == k for k, _, _ in parsed):
+            return jsonify({'message': f"Duplicate widget id: {key}"}), 400
+        parsed.append((key, kind, {**shared, **(spec.get('filters') or {})}))
 
-        year_data = {}
-        all_programs = set()
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({'message': 'Database connection failed!'}), 500
 
-        for row in results:
-            year = row['yearofadmission']
-            if year is None:
+        data, errors, requested = {}, {}, []
+        for key, kind, values in parsed:
+            if kind == 'filter-options':
+                data[key] = filter_options_view(conn)
                 continue
+            widget = WIDGETS[kind]
+            try:
+                requested.append((key, widget, widget_filters(conn, widget, values)))
+            except WidgetError as e:
+                errors[key] = str(e)
 
-            program = row['program']
-            count = row['count']
-            all_programs.add(program)
-
-            if year not in year_data:
-                year_data[year] = {'year': year}
-
-            year_data[year][program] = count
-
-        final_data = []
-        for year in sorted(year_data.keys()):
-            entry = year_data[year]
-            for prog in all_programs:
-                if prog not in entry:
-                    entry[prog] = 0
-            final_data.append(entry)
-
-        return jsonify({'data': final_data, 'programs': list(all_programs)}), 200
+        payloads = compute_widgets(conn, [(widget, filters) for _, widget, filters in requested])
+        for (key, _, _), payload in zip(requested, payloads):
+            data[key] = payload
+        return jsonify({'data': data, 'errors': errors}), 200
 
     except Exception as e:
-        print(f"Error fetching program trends: {e}")
-        return jsonify({'message': 'An error occurred while fetching program trends.'}), 500
+        print(f"Error fetching academic batch: {e}")
+        return jsonify({'message': 'An error occurred while fetching the academic widgets.'}), 500
     finally:
         if conn:
-            cur.close()
             conn.close()
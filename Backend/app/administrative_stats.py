@@ -1,11 +1,62 @@
 from flask import Blueprint, jsonify, request
 from .db import get_db_connection
+from .cache import cached
 from .auth import token_required
+from .filter_options import Dimension, distinct_values
+from . import aggregates
 import psycopg2.extras
 from datetime import date
 
 administrative_bp = Blueprint('administrative', __name__)
 
+# Longest year range the year-wise endpoints will build a series for.
+MAX_YEAR_SPAN = 100
+
+FACULTY_GENDERS = ['Male', 'Female', 'Other', 'Transgender']
+
+# One row per calendar year in [%s, %s] with a FILTERed count per gender.
+FACULTY_GENDER_BY_YEAR_QUERY = """
+    SELECT
+        y.yr                                                   AS year,
+        COUNT(e.id) FILTER (WHERE e.gender = 'Male')           AS male,
+        COUNT(e.id) FILTER (WHERE e.gender = 'Female')         AS female,
+        COUNT(e.id) FILTER (WHERE e.gender = 'Other')          AS other,
+        COUNT(e.id) FILTER (WHERE e.gender = 'Transgender')    AS transgender
+    FROM generate_series(%s::int, %s::int) AS y(yr)
+    LEFT JOIN employees e
+        ON  e.doj <= make_date(y.yr, 12, 31)
+        AND (e.dor IS NULL OR e.dor >= make_date(y.yr, 1, 1))
+        AND e.emp_type = 'Teaching'
+    GROUP BY y.yr
+    ORDER BY y.yr;
+"""
+
+# Same counts read from the per-year employee_headcount table (migration 003).
+FACULTY_GENDER_BY_YEAR_HEADCOUNT_QUERY = """
+    SELECT
+        y.yr                                                            AS year,
+        SUM(h.in_year_count) FILTER (WHERE h.gender = 'Male')           AS male,
+        SUM(h.in_year_count) FILTER (WHERE h.gender = 'Female')         AS female,
+        SUM(h.in_year_count) FILTER (WHERE h.gender = 'Other')          AS other,
+        SUM(h.in_year_count) FILTER (WHERE h.gender = 'Transgender')    AS transgender
+    FROM generate_series(%s::int, %s::int) AS y(yr)
+    LEFT JOIN employee_headcount h
+        ON  h.year = y.yr
+        AND h.emp_type = 'Teaching'
+    GROUP BY y.yr
+    ORDER BY y.yr;
+"""
+
+EMPLOYEE_FILTER_DIMENSIONS = (
+    Dimension('department', 'department'),
+    Dimension('designation', 'designation'),
+    Dimension('gender', 'gender'),
+    Dimension('emp_type', 'emp_type'),
+    Dimension('empstatus', 'empstatus'),
+    Dimension('group_name', 'group_name'),
+    Dimension('appointed_category', 'appointed_category'),
+)
+
 
 # ---------------------------------------------------------------------------
 # Helper: build dynamic WHERE clause from filter dict
@@ -94,6 +145,7 @@ def _read_common_filters():
 
 @administrative_bp.route('/stats/filter-options', methods=['GET'])
 @token_required
+@cached('employees')
 def get_filter_options(current_user_id):
     """Fetches distinct values for each filter field from the employees table."""
     conn = None
@@ -103,37 +155,9 @@ def get_filter_options(current_user_id):
         if conn is None:
             return jsonify({'message': 'Database connection failed!'}), 500
 
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-
-        filter_options = {}
-
-        # Department
-        cur.execute("SELECT DISTINCT department FROM employees WHERE department IS NOT NULL ORDER BY department;")
-        filter_options['department'] = [row['department'] for row in cur.fetchall()]
-
-        # Designation
-        cur.execute("SELECT DISTINCT designation FROM employees WHERE designation IS NOT NULL ORDER BY designation;")
-        filter_options['designation'] = [row['designation'] for row in cur.fetchall()]
-
-        # Gender
-        cur.execute("SELECT DISTINCT gender FROM employees WHERE gender IS NOT NULL ORDER BY gender;")
-        filter_options['gender'] = [row['gender'] for row in cur.fetchall()]
-
-        # Employee Type (Teaching / Non Teaching)
-        cur.execute("SELECT DISTINCT emp_type FROM employees WHERE emp_type IS NOT NULL ORDER BY emp_type;")
-        filter_options['emp_type'] = [row['emp_type'] for row in cur.fetchall()]
-
-        # Employee Status
-        cur.execute("SELECT DISTINCT empstatus FROM employees WHERE empstatus IS NOT NULL ORDER BY empstatus;")
-        filter_options['empstatus'] = [row['empstatus'] for row in cur.fetchall()]
-
-        # Group Name
-        cur.execute("SELECT DISTINCT group_name FROM employees WHERE group_name IS NOT NULL ORDER BY group_name;")
-        filter_options['group_name'] = [row['group_name'] for row in cur.fetchall()]
-
-        # Appointed Category
-        cur.execute("SELECT DISTINCT appointed_category FROM employees WHERE appointed_category IS NOT NULL ORDER BY appointed_category;")
-        filter_options['appointed_category'] = [row['appointed_category'] for row in cur.fetchall()]
+        # One GROUPING SETS scan for every dropdown, memoized until the next upload.
+        options = distinct_values(conn, 'employees', EMPLOYEE_FILTER_DIMENSIONS)
+        filter_options = {key: list(values) for key, values in options.items()}
 
         return jsonify(filter_options), 200
 
@@ -149,6 +173,7 @@ def get_filter_options(current_user_id):
 
 @administrative_bp.route('/stats/employee-overview', methods=['GET'])
 @token_required
+@cached('employees')
 def get_employee_overview(current_user_id):
     """
     Department-wise breakdown by gender.
@@ -168,12 +193,14 @@ def get_employee_overview(current_user_id):
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
         where_clause, params = _append_emp_type(where_clause, params, employee_type)
 
+        # Served from the employee cube unless an upload has not been rolled up yet.
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
             SELECT
                 COALESCE(department, 'Unknown') AS department,
                 gender,
-                COUNT(*) AS count
-            FROM employees
+                {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY department, gender
             ORDER BY department, gender;
@@ -220,72 +247,44 @@ def get_employee_overview(current_user_id):
 
 @administrative_bp.route('/stats/faculty-gender-last-five-years', methods=['GET'])
 @token_required
+@cached('employees')
 def get_faculty_gender_last_five_years(current_user_id):
     """
-    Faculty (Teaching) gender distribution for the last five calendar years.
+    Faculty (Teaching) gender distribution per calendar year.
     An employee is counted for a year if their doj <= year-end AND (dor IS NULL OR dor >= year-start).
+
+    Defaults to the last five completed years; pass start_year / end_year for
+    any other range. All years are counted in a single query.
     """
     conn = None
     cur = None
     try:
+        current_year = date.today().year
+        start_year = request.args.get('start_year', type=int) or current_year - 5
+        end_year = request.args.get('end_year', type=int) or current_year - 1
+        if start_year > end_year:
+            return jsonify({'message': 'start_year must not be after end_year.'}), 400
+        if end_year - start_year + 1 > MAX_YEAR_SPAN:
+            return jsonify({'message': f'A maximum of {MAX_YEAR_SPAN} years can be requested.'}), 400
+
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed!'}), 500
 
+        if aggregates.headcount_covers(conn, end_year):
+            query = FACULTY_GENDER_BY_YEAR_HEADCOUNT_QUERY
+        else:
+            query = FACULTY_GENDER_BY_YEAR_QUERY
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-
-        current_year = date.today().year
-        genders = ['Male', 'Female', 'Other', 'Transgender']
-
-        year_labels = []
-        for i in range(5, 0, -1):
-            yr = current_year - i
-            label = f"{yr}-{str((yr + 1) % 100).zfill(2)}"
-            year_labels.append((yr, label))
-
-        rows = []
-        for year_start, label in year_labels:
-            for gender in genders:
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS count
-                    FROM employees
-                    WHERE doj <= make_date(%s, 12, 31)
-                      AND (dor IS NULL OR dor >= make_date(%s, 1, 1))
-                      AND gender = %s
-                      AND emp_type = 'Teaching';
-                    """,
-                    (year_start, year_start, gender)
-                )
-                result = cur.fetchone()
-                count = int(result['count']) if result and result.get('count') else 0
-                rows.append({
-                    'label': label,
-                    'gender': gender,
-                    'count': count
-                })
-
-        # Build per-year dict
-        year_map = {}
-        for row in rows:
-            label = row['label']
-            gender = row['gender']
-            count = row['count']
-            if label not in year_map:
-                year_map[label] = {g: 0 for g in genders}
-            if gender in genders:
-                year_map[label][gender] = count
-
-        labels = [label for _, label in year_labels]
-        for _, label in year_labels:
-            if label not in year_map:
-                year_map[label] = {g: 0 for g in genders}
+        cur.execute(query, (start_year, end_year))
+        counts = {row['year']: row for row in cur.fetchall()}
 
         data = []
-        for label in labels:
-            entry = {'year_label': label}
-            entry.update(year_map[label])
-            entry['total'] = sum(year_map[label].values())
+        for yr in range(start_year, end_year + 1):
+            row = counts.get(yr) or {}
+            entry = {'year_label': f"{yr}-{str((yr + 1) % 100).zfill(2)}"}
+            entry.update({g: int(row.get(g.lower()) or 0) for g in FACULTY_GENDERS})
+            entry['total'] = sum(entry[g] for g in FACULTY_GENDERS)
             data.append(entry)
 
         return jsonify({'data': data}), 200
@@ -303,6 +302,7 @@ def get_faculty_gender_last_five_years(current_user_id):
 
 @administrative_bp.route('/stats/faculty-by-department-designation', methods=['GET'])
 @token_required
+@cached('employees')
 def get_faculty_by_department_designation(current_user_id):
     """Department × designation breakdown."""
     conn = None
@@ -319,12 +319,13 @@ def get_faculty_by_department_designation(current_user_id):
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
         where_clause, params = _append_emp_type(where_clause, params, employee_type)
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
             SELECT
                 COALESCE(department, 'Unknown') AS department,
                 COALESCE(designation, 'Unknown') AS designation,
-                COUNT(*) AS count
-            FROM employees
+                {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY department, designation
             ORDER BY department, designation;
@@ -371,6 +372,7 @@ def get_faculty_by_department_designation(current_user_id):
 
 @administrative_bp.route('/stats/staff-count', methods=['GET'])
 @token_required
+@cached('employees')
 def get_staff_count(current_user_id):
     """
     Staff count grouped by emp_type (Teaching / Non Teaching).
@@ -387,11 +389,12 @@ def get_staff_count(current_user_id):
         where_clause, params = build_filter_query(filters)
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
             SELECT
                 COALESCE(emp_type, 'Unknown') AS emp_type,
-                COUNT(*) AS count
-            FROM employees
+                {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY emp_type
             ORDER BY emp_type;
@@ -426,6 +429,7 @@ def get_staff_count(current_user_id):
 
 @administrative_bp.route('/stats/gender-distribution', methods=['GET'])
 @token_required
+@cached('employees')
 def get_gender_distribution(current_user_id):
     """Gender-wise distribution with optional emp_type filtering."""
     conn = None
@@ -442,9 +446,10 @@ def get_gender_distribution(current_user_id):
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
         where_clause, params = _append_emp_type(where_clause, params, employee_type)
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
-            SELECT gender, COUNT(*) AS count
-            FROM employees
+            SELECT gender, {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY gender
             ORDER BY gender;
@@ -484,6 +489,7 @@ def get_gender_distribution(current_user_id):
 
 @administrative_bp.route('/stats/category-distribution', methods=['GET'])
 @token_required
+@cached('employees')
 def get_category_distribution(current_user_id):
     """
     Group-wise distribution (group_name: A, B, C …).
@@ -503,11 +509,12 @@ def get_category_distribution(current_user_id):
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
         where_clause, params = _append_emp_type(where_clause, params, employee_type)
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
             SELECT
                 COALESCE(group_name, 'Not Specified') AS group_name,
-                COUNT(*) AS count
-            FROM employees
+                {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY group_name
             ORDER BY group_name;
@@ -543,6 +550,7 @@ def get_category_distribution(current_user_id):
 
 @administrative_bp.route('/stats/data-summary', methods=['GET'])
 @token_required
+@cached('employees')
 def get_data_summary(current_user_id):
     """Diagnostic endpoint — quick stats from the employees table."""
     conn = None
@@ -552,29 +560,30 @@ def get_data_summary(current_user_id):
         if conn is None:
             return jsonify({'message': 'Database connection failed!'}), 500
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         summary = {}
 
         # Total employees
-        cur.execute("SELECT COUNT(*) AS total FROM employees;")
+        cur.execute(f"SELECT {src.count} AS total FROM {src.relation};")
         summary['total_employees'] = cur.fetchone()['total']
 
         # Active vs Relieved
-        cur.execute("SELECT empstatus, COUNT(*) AS count FROM employees GROUP BY empstatus;")
+        cur.execute(f"SELECT empstatus, {src.count} AS count FROM {src.relation} GROUP BY empstatus;")
         summary['status_distribution'] = {row['empstatus'] or 'Unknown': row['count'] for row in cur.fetchall()}
 
         # Gender distribution
-        cur.execute("SELECT gender, COUNT(*) AS count FROM employees GROUP BY gender ORDER BY gender;")
+        cur.execute(f"SELECT gender, {src.count} AS count FROM {src.relation} GROUP BY gender ORDER BY gender;")
         summary['gender_distribution'] = {row['gender'] or 'Unknown': row['count'] for row in cur.fetchall()}
 
         # Employee type distribution
-        cur.execute("SELECT emp_type, COUNT(*) AS count FROM employees GROUP BY emp_type;")
+        cur.execute(f"SELECT emp_type, {src.count} AS count FROM {src.relation} GROUP BY emp_type;")
         summary['employee_type_distribution'] = {row['emp_type'] or 'Unknown': row['count'] for row in cur.fetchall()}
 
         # Top departments
-        cur.execute("""
-            SELECT COALESCE(department, 'Unknown') AS dept, COUNT(*) AS count
-            FROM employees
+        cur.execute(f"""
+            SELECT COALESCE(department, 'Unknown') AS dept, {src.count} AS count
+            FROM {src.relation}
             GROUP BY department
             ORDER BY count DESC
             LIMIT 10;
@@ -582,7 +591,7 @@ def get_data_summary(current_user_id):
         summary['top_departments'] = {row['dept']: row['count'] for row in cur.fetchall()}
 
         # Sample designations
-        cur.execute("SELECT DISTINCT designation FROM employees WHERE designation IS NOT NULL LIMIT 10;")
+        cur.execute(f"SELECT DISTINCT designation FROM {src.relation} WHERE designation IS NOT NULL LIMIT 10;")
         summary['sample_designations'] = [row['designation'] for row in cur.fetchall()]
 
         return jsonify(summary), 200
@@ -600,6 +609,7 @@ def get_data_summary(current_user_id):
 
 @administrative_bp.route('/stats/department-breakdown', methods=['GET'])
 @token_required
+@cached('employees')
 def get_department_breakdown(current_user_id):
     """Department-wise breakdown with gender and employee type."""
     conn = None
@@ -616,13 +626,14 @@ def get_department_breakdown(current_user_id):
         where_clause, params = _append_active_default(where_clause, params, filters.get('empstatus'))
         where_clause, params = _append_emp_type(where_clause, params, employee_type)
 
+        src = aggregates.source(conn, aggregates.EMPLOYEE_CUBE)
         query = f"""
             SELECT
                 COALESCE(department, 'Unknown') AS department,
                 gender,
                 COALESCE(emp_type, 'Unknown') AS employee_type,
-                COUNT(*) AS count
-            FROM employees
+                {src.count} AS count
+            FROM {src.relation}
             {where_clause}
             GROUP BY department, gender, emp_type
             ORDER BY department, gender, emp_type;
@@ -674,6 +685,7 @@ def get_department_breakdown(current_user_id):
 
 @administrative_bp.route('/stats/yearwise-strength', methods=['GET'])
 @token_required
+@cached('employees')
 def get_yearwise_strength(current_user_id):
     """
     Active employee headcount for each calendar year.
@@ -747,26 +759,36 @@ def get_yearwise_strength(current_user_id):
         # num_years appears first in the query; filter_params follow
         query_params = [num_years] + filter_params
 
+        if aggregates.headcount_covers(conn, date.today().year):
+            # Year-end headcounts kept per year by triggers: an indexed SUM, no range join.
+            headcount = 'SUM(e.year_end_count)'
+            first_year = 'SELECT MIN(year) FROM employee_headcount'
+            join = 'employee_headcount e ON e.year = y.yr'
+        else:
+            headcount = 'COUNT(e.id)'
+            first_year = 'SELECT EXTRACT(YEAR FROM MIN(doj))::int FROM employees WHERE doj IS NOT NULL'
+            join = (
+                'employees e ON e.doj <= make_date(y.yr::int, 12, 31) '
+                'AND (e.dor IS NULL OR e.dor >= make_date(y.yr::int, 12, 31))'
+            )
+
         query = f"""
             SELECT
                 y.yr                                                    AS year,
-                COUNT(e.id)                                             AS total,
-                COUNT(e.id) FILTER (WHERE e.gender = 'Male')            AS male,
-                COUNT(e.id) FILTER (WHERE e.gender = 'Female')          AS female,
-                COUNT(e.id) FILTER (WHERE e.gender NOT IN ('Male','Female') AND e.gender IS NOT NULL) AS other
+                {headcount}                                             AS total,
+                {headcount} FILTER (WHERE e.gender = 'Male')            AS male,
+                {headcount} FILTER (WHERE e.gender = 'Female')          AS female,
+                {headcount} FILTER (WHERE e.gender NOT IN ('Male','Female') AND e.gender IS NOT NULL) AS other
             FROM (
                 SELECT generate_series(
                     GREATEST(
-                        (SELECT EXTRACT(YEAR FROM MIN(doj))::int
-                         FROM employees WHERE doj IS NOT NULL),
+                        ({first_year}),
                         EXTRACT(YEAR FROM CURRENT_DATE)::int - %s + 1
                     ),
                     EXTRACT(YEAR FROM CURRENT_DATE)::int
                 ) AS yr
             ) y
-            LEFT JOIN employees e
-                ON  e.doj <= make_date(y.yr::int, 12, 31)
-                AND (e.dor IS NULL OR e.dor >= make_date(y.yr::int, 12, 31))
+            LEFT JOIN {join}
                 AND {full_filter}
             GROUP BY y.yr
             ORDER BY y.yr;
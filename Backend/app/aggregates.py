@@ -0,0 +1,208 @@
+"""
+Materialized aggregate cubes behind the most-hit stats endpoints.
+
+Each cube (see Database_Schema/migrations/002_aggregate_cubes.sql) is a
+materialized view grouping one source table by every column its dashboards
+filter or group on, with a row count. An endpoint asks source() for the
+relation to read and the matching count expression: the cube while it is
+fresh, otherwise the live table, so results never lag behind the data.
+
+Freshness lives in the aggregate_status table. A statement-level trigger on
+each source table bumps ``source_version``; refresh() records the version it
+saw before rebuilding the cube as ``refreshed_version``. The upload endpoint
+refreshes the cubes of every table it committed to, and init_app() rebuilds
+any cube found stale (or never populated) at startup.
+
+placement_cube (migration 006) differs in two ways: it joins two source
+tables (placement_summary and placement_packages) and holds their rows as
+they are rather than a count, so its live fallback is the same join
+(PLACEMENT_FACTS) instead of the bare source table.
+
+The per-year employee headcount (migration 003) needs no refresh: triggers
+keep it in step with ``employees``. headcount_covers() only has to move its
+year horizon forward once the calendar passes it.
+"""
+from datetime import date
+from typing import Iterable, List, NamedTuple, Tuple
+
+from . import schema
+from .db import get_db_connection
+
+
+class Cube(NamedTuple):
+    name: str
+    source: str
+    count_column: str               # '' for a cube that holds rows, not counts
+    also_from: Tuple[str, ...] = ()  # other tables the cube is built from
+    live: str = ''                  # relation to read while stale (default: source)
+
+
+class Source(NamedTuple):
+    """What to put in FROM, and the expression counting source rows there."""
+    relation: str
+    count: str
+    from_cube: bool
+
+
+STUDENT_CUBE = Cube('student_cube', 'student_table', 'student_count')
+EMPLOYEE_CUBE = Cube('employee_cube', 'employees', 'employee_count')
+PUBLICATION_CUBE = Cube('publication_cube', 'research_publications', 'publication_count')
+
+# The SELECT of placement_cube (keep in step with migration 006).
+PLACEMENT_FACTS = """
+    SELECT COALESCE(s.placement_year::text, p.placement_year) AS placement_year,
+           COALESCE(s.program, p.program) AS program,
+           s.gender, s.registered, s.placed,
+           p.highest_package, p.lowest_package, p.average_package,
+           (p.placement_year IS NOT NULL
+            AND row_number() OVER (PARTITION BY p.placement_year, p.program ORDER BY s.gender) = 1) AS package_row
+    FROM placement_summary s
+    FULL JOIN placement_packages p
+      ON p.placement_year = s.placement_year::text AND p.program = s.program
+"""
+PLACEMENT_CUBE = Cube('placement_cube', 'placement_summary', '',
+                      also_from=('placement_packages',), live=f'({PLACEMENT_FACTS}) AS placement_facts')
+
+CUBES = (STUDENT_CUBE, EMPLOYEE_CUBE, PUBLICATION_CUBE, PLACEMENT_CUBE)
+
+HEADCOUNT_TABLES = ('employee_headcount', 'employee_headcount_horizon')
+
+# Last year materialised in employee_headcount, as of the last check.
+_headcount_through = None
+
+_FRESHNESS_QUERY = """
+    SELECT s.refreshed_version >= s.source_version AND m.ispopulated AS fresh
+    FROM aggregate_status s
+    JOIN pg_matviews m ON m.schemaname = 'public' AND m.matviewname = s.cube_name
+    WHERE s.cube_name = %s;
+"""
+
+
+def _live(cube: Cube) -> Source:
+    return Source(cube.live or cube.source, 'COUNT(*)', False)
+
+
+def source(conn, cube: Cube) -> Source:
+    """The cube if it reflects every committed write to its source, else the live table."""
+    if not schema.tables_available(cube.name, 'aggregate_status'):
+        return _live(cube)
+    cur = conn.cursor()
+    try:
+        cur.execute(_FRESHNESS_QUERY, (cube.name,))
+        row = cur.fetchone()
+    except Exception as e:
+        print(f"Aggregates: freshness check for {cube.name} failed: {e}")
+        conn.rollback()
+        return _live(cube)
+    finally:
+        cur.close()
+    if row and row['fresh']:
+        count = f'COALESCE(SUM({cube.count_column}), 0)::bigint' if cube.count_column else 'COUNT(*)'
+        return Source(cube.name, count, True)
+    return _live(cube)
+
+
+def _refresh_cube(conn, cube: Cube):
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "INSERT INTO aggregate_status (cube_name, source_table) VALUES (%s, %s) "
+            "ON CONFLICT (cube_name) DO NOTHING;",
+            (cube.name, cube.source)
+        )
+        # Read the version first: the rebuild below sees at least these writes.
+        cur.execute(
+            "SELECT s.source_version, m.ispopulated FROM aggregate_status s "
+            "JOIN pg_matviews m ON m.schemaname = 'public' AND m.matviewname = s.cube_name "
+            "WHERE s.cube_name = %s;",
+            (cube.name,)
+        )
+        row = cur.fetchone()
+        # CONCURRENTLY keeps the cube readable during the rebuild but needs existing data.
+        concurrently = 'CONCURRENTLY ' if row['ispopulated'] else ''
+        cur.execute(f"REFRESH MATERIALIZED VIEW {concurrently}public.{cube.name};")
+        cur.execute(
+            "UPDATE aggregate_status SET refreshed_version = %s, refreshed_at = now() "
+            "WHERE cube_name = %s;",
+            (row['source_version'], cube.name)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def refresh(conn, tables: Iterable[str]) -> List[str]:
+    """
+    Rebuilds the cubes of the given source tables (call after committing to
+    them). Each cube is refreshed in its own transaction; one that fails stays
+    stale and its endpoints keep reading the live table. Returns the cubes
+    refreshed.
+    """
+    tables = {t.lower() for t in tables if t}
+    refreshed = []
+    for cube in CUBES:
+        if tables.isdisjoint((cube.source,) + cube.also_from) or not schema.tables_available(cube.name, 'aggregate_status'):
+            continue
+        try:
+            _refresh_cube(conn, cube)
+            refreshed.append(cube.name)
+        except Exception as e:
+            print(f"Aggregates: refreshing {cube.name} failed, serving live queries: {e}")
+    return refreshed
+
+
+def refresh_stale(conn=None) -> List[str]:
+    """Rebuilds every cube that is behind its source table or was never populated."""
+    own = conn is None
+    if own:
+        conn = get_db_connection()
+        if not conn:
+            return []
+    try:
+        stale = [cube.source for cube in CUBES if not source(conn, cube).from_cube]
+        conn.commit()
+        return refresh(conn, stale)
+    finally:
+        if own:
+            conn.close()
+
+
+def headcount_covers(conn, last_year: int) -> bool:
+    """
+    True if employee_headcount can answer for every year up to ``last_year``.
+    Extends the table through the current year first if needed (once per
+    process and year); later years are never materialised.
+    """
+    global _headcount_through
+    if not schema.tables_available(*HEADCOUNT_TABLES):
+        return False
+    current_year = date.today().year
+    if _headcount_through is None or _headcount_through < current_year:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT public.employee_headcount_extend(%s) AS through_year;", (current_year,))
+            _headcount_through = cur.fetchone()['through_year']
+            conn.commit()
+        except Exception as e:
+            print(f"Aggregates: extending employee_headcount failed: {e}")
+            conn.rollback()
+            return False
+        finally:
+            cur.close()
+    return last_year <= _headcount_through
+
+
+def init_app(app):
+    """Brings stale cubes up to date at startup (e.g. right after restoring the schema)."""
+    refreshed = refresh_stale()
+    if refreshed:
+        print(f"Aggregates: refreshed {', '.join(refreshed)}.")
+    conn = get_db_connection()
+    if conn:
+        try:
+            headcount_covers(conn, date.today().year)
+        finally:
+            conn.close()
@@ -0,0 +1,151 @@
+"""
+Concurrent queries for endpoints that run several independent statements.
+
+fetch_all() takes a list of ``(query, params)`` and returns each query's
+rows, in order. With the optional ``psycopg`` (3) and ``psycopg-pool``
+packages installed, the queries are sent at the same time, each on its own
+connection from an asyncio pool, so the endpoint waits for the slowest query
+instead of the sum of all of them. Without them (or with ASYNC_DB_ENABLED=0)
+they run one after the other on the request's connection, as before.
+
+The pool lives on an event loop of its own, in a background thread started
+on first use: the Flask views stay synchronous (under ``asgi.py`` as under
+``run.py``) and hand their coroutines to that loop. Queries use the same
+``%s`` placeholders and get the same dict rows as with psycopg2. Concurrent
+queries do not share a transaction, so only use this for reads that need
+not see one snapshot.
+
+Settings (environment variables):
+    ASYNC_DB_ENABLED    '0' disables the async pool           (default on)
+    ASYNC_DB_POOL_MAX   connections in the async pool         (default DB_POOL_MAX)
+    DB_POOL_TIMEOUT     seconds to wait for a connection      (shared with db.py)
+"""
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .db import DATABASE_URL, DB_POOL_MAX, DB_POOL_TIMEOUT, get_db_connection
+
+ASYNC_DB_ENABLED = os.environ.get('ASYNC_DB_ENABLED', '1') != '0'
+ASYNC_DB_POOL_MAX = int(os.environ.get('ASYNC_DB_POOL_MAX', DB_POOL_MAX))
+
+Statement = Tuple[str, Sequence[Any]]
+
+
+class ConnectionFailed(RuntimeError):
+    """No database connection could be obtained for the queries."""
+
+_loop = None
+_pool = None
+_pool_errors = ()
+_unavailable = not ASYNC_DB_ENABLED
+_lock = threading.Lock()
+
+
+def _driver():
+    """
+    (psycopg.rows.dict_row, psycopg_pool.AsyncConnectionPool, the errors
+    meaning no connection could be had), or None when not installed.
+    """
+    try:
+        from psycopg import OperationalError
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool, PoolTimeout
+    except ImportError:
+        return None
+    return dict_row, AsyncConnectionPool, (PoolTimeout, OperationalError)
+
+
+def _start():
+    """Starts the background loop and opens the pool on it; returns the loop, or None."""
+    global _loop, _pool, _pool_errors, _unavailable
+    if _loop is not None or _unavailable:
+        return _loop
+    with _lock:
+        if _loop is not None or _unavailable:
+            return _loop
+        driver = _driver()
+        if driver is None:
+            print("⚠️  'psycopg' / 'psycopg-pool' are not installed; independent queries run sequentially.")
+            _unavailable = True
+            return None
+        dict_row, AsyncConnectionPool, _pool_errors = driver
+
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name='async-db', daemon=True).start()
+
+        async def open_pool():
+            pool = AsyncConnectionPool(
+                DATABASE_URL, min_size=1, max_size=ASYNC_DB_POOL_MAX, timeout=DB_POOL_TIMEOUT,
+                kwargs={'row_factory': dict_row, 'autocommit': True}, open=False,
+            )
+            # Wait for the first connection, so an unreachable database fails here.
+            try:
+                await pool.open(wait=True, timeout=DB_POOL_TIMEOUT)
+            except Exception:
+                await pool.close()
+                raise
+            return pool
+
+        try:
+            _pool = asyncio.run_coroutine_threadsafe(open_pool(), loop).result()
+        except Exception as e:
+            # Not marked unavailable: the next call tries again (e.g. once the database is back).
+            print(f"Async DB pool could not be opened, running queries sequentially: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            return None
+        _loop = loop
+        atexit.register(_close)
+    return _loop
+
+
+def _close():
+    """Closes the pool and stops its loop (at interpreter exit)."""
+    try:
+        asyncio.run_coroutine_threadsafe(_pool.close(), _loop).result(DB_POOL_TIMEOUT)
+    except Exception as e:
+        print(f"Async DB pool close error: {e}")
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+async def _fetch(query: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+    async with _pool.connection() as conn:
+        cur = await conn.execute(query, list(params))
+        return await cur.fetchall() if cur.description else []
+
+
+async def _fetch_all(statements: Sequence[Statement]) -> List[List[Dict[str, Any]]]:
+    return list(await asyncio.gather(*(_fetch(query, params) for query, params in statements)))
+
+
+def _fetch_sequentially(statements: Sequence[Statement]) -> List[List[Dict[str, Any]]]:
+    conn = get_db_connection()
+    if conn is None:
+        raise ConnectionFailed('Database connection failed.')
+    cur = conn.cursor()
+    try:
+        results = []
+        for query, params in statements:
+            cur.execute(query, list(params))
+            results.append(cur.fetchall() if cur.description else [])
+        return results
+    finally:
+        cur.close()
+        conn.close()
+
+
+def fetch_all(statements: Sequence[Statement]) -> List[List[Dict[str, Any]]]:
+    """
+    Rows of each ``(query, params)`` statement, in order, running them
+    concurrently when the async pool is available. Raises ConnectionFailed
+    when no connection could be had, else the first failing query's error.
+    """
+    loop = _start() if len(statements) > 1 else None
+    if loop is None:
+        return _fetch_sequentially(statements)
+    try:
+        return asyncio.run_coroutine_threadsafe(_fetch_all(statements), loop).result()
+    except _pool_errors as e:
+        raise ConnectionFailed(f'Database connection failed: {e}') from e
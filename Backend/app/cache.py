@@ -0,0 +1,284 @@
+"""
+Server-side response cache for the read-only stats endpoints.
+
+Endpoints opt in with ``@cached('table', ...)`` (placed under
+``@token_required``), declaring the tables they read. Entries are keyed by
+endpoint + normalised query string + the current version of every declared
+table, and live in an in-process TTL/LRU store. A successful upload calls
+``invalidate(table)``, which bumps that table's version and evicts only the
+entries that depend on it — an ``employees`` upload clears the
+``/api/administrative/*`` responses and leaves everything else warm.
+
+``memoize()`` applies the same table-version scheme to arbitrary Python
+values (filter options, latest periods, ...): they stay cached until the
+next upload of a table they were derived from, or for RESPONSE_CACHE_TTL.
+
+If RESPONSE_CACHE_REDIS_URL is set (and the ``redis`` package is installed)
+responses and table versions are also shared through Redis, so an upload
+handled by one worker invalidates the cache of every worker. Without it,
+invalidation only reaches the worker that handled the upload: the others
+keep serving their entries (responses and memoized values alike) until
+they expire, so run multi-worker deployments with Redis or a short TTL.
+
+Settings (environment variables):
+    RESPONSE_CACHE_ENABLED      '0' disables caching          (default on)
+    RESPONSE_CACHE_TTL          seconds an entry stays valid  (default 300)
+    RESPONSE_CACHE_MAX_ENTRIES  LRU capacity per process      (default 1024)
+    RESPONSE_CACHE_REDIS_URL    optional shared Redis store
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import make_response, request
+
+CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', '1') != '0'
+CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL')
+
+_REDIS_PREFIX = 'iitpkd:cache:'
+
+
+class LocalStore:
+    """Thread-safe LRU store with per-entry expiry and a table → keys index."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, tables, value)
+        self._by_table = {}             # table -> set(keys)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _tables, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, tables, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, tuple(tables), value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def evict_tables(self, tables):
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys |= self._by_table.pop(table, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry[1]:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+
+_local = LocalStore(CACHE_MAX_ENTRIES)
+_memo = LocalStore(CACHE_MAX_ENTRIES)
+_local_versions = {}
+_versions_lock = threading.Lock()
+_redis = None
+
+
+def _get_redis():
+    """Returns a Redis client when a shared store is configured, else None."""
+    global _redis
+    if _redis is None and CACHE_REDIS_URL:
+        try:
+            import redis
+            _redis = redis.Redis.from_url(CACHE_REDIS_URL, socket_timeout=0.5)
+        except ImportError:
+            print("⚠️  RESPONSE_CACHE_REDIS_URL is set but the 'redis' package is not installed; "
+                  "using the in-process cache only.")
+            _redis = False
+    return _redis or None
+
+
+def table_versions(tables):
+    """Current version counter of each table (shared via Redis when available)."""
+    tables = list(tables)
+    client = _get_redis()
+    if client is not None:
+        try:
+            values = client.hmget(_REDIS_PREFIX + 'versions', tables)
+            return tuple(int(v or 0) for v in values)
+        except Exception as e:
+            print(f"Response cache: Redis unavailable ({e}); falling back to local versions.")
+    with _versions_lock:
+        return tuple(_local_versions.get(t, 0) for t in tables)
+
+
+def invalidate(*tables):
+    """
+    Marks the given tables as changed. Call after an upload has committed.
+    Returns the number of locally evicted entries.
+    """
+    tables = [t for t in tables if t]
+    if not tables:
+        return 0
+    with _versions_lock:
+        for table in tables:
+            _local_versions[table] = _local_versions.get(table, 0) + 1
+    client = _get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            for table in tables:
+                pipe.hincrby(_REDIS_PREFIX + 'versions', table, 1)
+            pipe.execute()
+        except Exception as e:
+            print(f"Response cache: could not publish invalidation to Redis: {e}")
+    _memo.evict_tables(tables)
+    return _local.evict_tables(tables)
+
+
+def clear():
+    """Drops every locally cached entry."""
+    _local.clear()
+    _memo.clear()
+
+
+def memoize(key, tables, compute):
+    """
+    Returns the cached value for ``key`` or stores ``compute()``. The value is
+    kept (LRU permitting) until one of ``tables`` is invalidated or
+    CACHE_TTL has passed.
+    """
+    if not CACHE_ENABLED:
+        return compute()
+    tables = tuple(tables)
+    full_key = (key, tables, table_versions(tables))
+    value = _memo.get(full_key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            _memo.set(full_key, value, tables, CACHE_TTL)
+    return value
+
+
+def memoized(key, tables, versions=None):
+    """
+    The value memoize() holds for ``key`` and ``tables``, or None; never
+    computes. ``versions`` (from table_versions()) pins the lookup to the
+    table versions seen before the caller's own query.
+    """
+    if not CACHE_ENABLED:
+        return None
+    tables = tuple(tables)
+    return _memo.get((key, tables, versions or table_versions(tables)))
+
+
+def remember(key, tables, versions, value):
+    """
+    Stores a value computed by the caller for memoize() / memoized().
+    ``versions`` must be read before the value was computed, so a value
+    racing an upload is filed under the versions it reflects.
+    """
+    if CACHE_ENABLED and value is not None:
+        tables = tuple(tables)
+        _memo.set((key, tables, tuple(versions)), value, tables, CACHE_TTL)
+
+
+def _request_key(tables):
+    """endpoint + path + sorted non-blank query args + table versions."""
+    args = sorted(
+        (k, v.strip()) for k, v in request.args.items(multi=True) if v is not None and v.strip() != ''
+    )
+    raw = repr((request.endpoint, request.path, args, tuple(tables), table_versions(tables)))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _shared_get(key):
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        payload = client.hgetall(_REDIS_PREFIX + key)
+    except Exception:
+        return None
+    if not payload:
+        return None
+    return int(payload[b'status']), payload[b'body'], payload[b'mimetype'].decode()
+
+
+def _shared_set(key, value, ttl):
+    client = _get_redis()
+    if client is None:
+        return
+    status, body, mimetype = value
+    try:
+        pipe = client.pipeline()
+        pipe.hset(_REDIS_PREFIX + key, mapping={'status': status, 'body': body, 'mimetype': mimetype})
+        pipe.expire(_REDIS_PREFIX + key, ttl)
+        pipe.execute()
+    except Exception as e:
+        print(f"Response cache: could not write to Redis: {e}")
+
+
+def cached(*tables, ttl=None):
+    """
+    Caches successful JSON responses of a read-only GET endpoint.
+
+    ``tables`` lists every table the endpoint reads; an upload to any of them
+    evicts the entry. Non-200 and streamed responses are never cached.
+    """
+    ttl = ttl or CACHE_TTL
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = _request_key(tables)
+            hit = _local.get(key)
+            if hit is None:
+                hit = _shared_get(key)
+                if hit is not None:
+                    _local.set(key, hit, tables, ttl)
+            if hit is not None:
+                status, body, mimetype = hit
+                response = make_response(body, status)
+                response.mimetype = mimetype
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed and response.is_json:
+                value = (response.status_code, response.get_data(), response.mimetype)
+                _local.set(key, value, tables, ttl)
+                _shared_set(key, value, ttl)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,21 +1,193 @@
-"""Database connection helper."""
+"""
+Database connection helper: a process-wide PostgreSQL connection pool.
+
+Inside a Flask request every call to get_db_connection() hands back the same
+pooled connection (stored on ``g``), so helpers such as get_latest_year() no
+longer pay for a second TCP + auth handshake. The connection goes back to the
+pool (rolling back anything left uncommitted) when the app context tears
+down; closing it earlier is a no-op.
+
+Pool sizing (environment variables):
+    DB_POOL_MIN         connections opened eagerly        (default 1)
+    DB_POOL_MAX         hard upper bound per process      (default 10)
+    DB_POOL_TIMEOUT     seconds to wait for a free slot   (default 10)
+    DB_POOL_PING_AFTER  idle seconds before a checkout is
+                        health-checked with SELECT 1      (default 30)
+"""
 import os
+import threading
+import time
+
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 from dotenv import load_dotenv
+from flask import g, has_app_context
 
 load_dotenv()
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', 30))
+
+_pool = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+_last_used = {}
+
+
+class PooledConnection:
+    """
+    Thin proxy around a pooled psycopg2 connection.
+
+    Existing call sites keep calling ``conn.close()``. For a request-bound
+    connection that does nothing: the request's transaction belongs to
+    whoever started it, so a helper that borrows the connection mid-way
+    (e.g. the schema cache revalidating during an upload) must not end it.
+    Uncommitted work is rolled back when the app context tears down. For
+    the same reason a helper that catches a query error and carries on must
+    run its queries in a SAVEPOINT (see schema.SchemaCache._with_conn), or
+    the failed statement aborts the rest of the request.
+    """
+
+    def __init__(self, raw, request_bound):
+        self._raw = raw
+        self._request_bound = request_bound
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if not self._request_bound:
+            _release(self._raw)
+
+
+def _get_pool():
+    """Creates the pool on first use (after any fork done by the server)."""
+    global _pool, _pool_slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_POOL_MIN, DB_POOL_MAX, DATABASE_URL,
+                    cursor_factory=psycopg2.extras.RealDictCursor,
+                )
+                _pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+    return _pool
+
+
+def _is_healthy(raw):
+    """Cheap liveness probe, only issued once a connection has sat idle."""
+    if raw.closed:
+        return False
+    if time.monotonic() - _last_used.get(id(raw), 0) < DB_POOL_PING_AFTER:
+        return True
+    try:
+        cur = raw.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+        raw.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _checkout():
+    """Takes a healthy connection from the pool, replacing dead ones."""
+    pool = _get_pool()
+    if not _pool_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise psycopg2.pool.PoolError(
+            f"No free database connection after {DB_POOL_TIMEOUT}s (DB_POOL_MAX={DB_POOL_MAX})."
+        )
+    try:
+        for _ in range(DB_POOL_MAX + 1):
+            raw = pool.getconn()
+            if _is_healthy(raw):
+                return raw
+            _last_used.pop(id(raw), None)
+            pool.putconn(raw, close=True)
+        raise psycopg2.OperationalError('Could not obtain a healthy database connection.')
+    except Exception:
+        _pool_slots.release()
+        raise
+
+
+def _reset(raw):
+    """Discards any open transaction and restores default session settings."""
+    if raw.closed:
+        return
+    try:
+        if raw.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            raw.rollback()
+        if raw.autocommit:
+            raw.autocommit = False
+    except psycopg2.Error:
+        pass
+
+
+def _release(raw):
+    """Returns a connection to the pool (closing it if it is broken)."""
+    _reset(raw)
+    broken = bool(raw.closed) or (
+        raw.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+    )
+    if broken:
+        _last_used.pop(id(raw), None)
+    else:
+        _last_used[id(raw)] = time.monotonic()
+    try:
+        _get_pool().putconn(raw, close=broken)
+    finally:
+        _pool_slots.release()
+
 
 def get_db_connection():
     """
-    Opens a new PostgreSQL connection. Returns a RealDictCursor-backed connection,
-    or None if the connection fails. Caller is responsible for closing it.
+    Returns a pooled RealDictCursor-backed connection, or None if no connection
+    could be obtained. Callers may (and should) still call close() on it.
+
+    Within a request all callers share one connection; outside a request
+    (scripts, CLI) each call checks out its own and close() returns it.
     """
     try:
-        return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
+        if has_app_context():
+            conn = g.get('db_conn')
+            if conn is None or conn.closed:
+                if conn is not None:
+                    _release(conn)
+                conn = g.db_conn = _checkout()
+            return PooledConnection(conn, request_bound=True)
+        return PooledConnection(_checkout(), request_bound=False)
     except Exception as e:
         print(f"DB connection error: {e}")
         return None
+
+
+def detach_db_connection():
+    """
+    Hands the request's connection over to the caller, for a response that
+    keeps reading from it after the view has returned (a streamed list):
+    teardown no longer releases it, close() on the returned connection does.
+    None if the request holds no connection.
+    """
+    conn = g.pop('db_conn', None) if has_app_context() else None
+    return PooledConnection(conn, request_bound=False) if conn is not None else None
+
+
+def close_db(exc=None):
+    """Teardown hook: hands the request's connection back to the pool."""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        _release(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
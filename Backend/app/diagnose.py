@@ -0,0 +1,276 @@
+"""
+Failure diagnosis for CSV uploads.
+
+When the set-based merge out of the staging table fails, PostgreSQL only
+reports the first violation it hits. find_invalid_rows() instead checks the
+whole staged file against the target table's rules in one statement:
+
+- every value must be valid input for its column type (enums, dates,
+  numerics, varchar lengths), via ``pg_input_is_valid`` (PostgreSQL 16+);
+- NOT NULL columns must have a value;
+- foreign keys must resolve (anti-join against the referenced table);
+- unique keys must not repeat within the file or clash with existing rows;
+- CHECK constraints must not evaluate to false.
+
+If none of those explain the failure (triggers, exotic constraints, older
+servers) bisect_failing_row() narrows it down to the first failing CSV row in
+O(log n) trial inserts instead of one savepoint per row.
+"""
+from . import schema
+from .ingest import ROW_COLUMN, _quote, build_insert, build_source_select
+
+MAX_REPORTED_ROWS = 200
+
+_PROBLEMS = {
+    'not_null': "'{columns}' cannot be empty.",
+    'invalid_value': '{detail}',
+    'foreign_key': "({columns})=({value}) is not present in '{detail}'.",
+    'duplicate_in_file': "({columns})=({value}) repeats an earlier row ({constraint}).",
+    'duplicate_existing': "({columns})=({value}) already exists ({constraint}).",
+    'check': "Violates check constraint '{constraint}'.",
+}
+
+# SQLSTATE of the merge error → problem kinds that explain it.
+_KINDS_BY_SQLSTATE = {
+    '23502': {'not_null'},
+    '23503': {'foreign_key'},
+    '23505': {'duplicate_in_file', 'duplicate_existing'},
+    '23514': {'check'},
+}
+
+
+def _constraints(cur, table_name):
+    """Unique keys (from indexes), foreign keys and CHECK constraints of the table."""
+    cur.execute(
+        """
+        SELECT i.indexrelid::regclass::text AS name, 'u' AS kind,
+               ARRAY(SELECT a.attname FROM unnest(i.indkey) WITH ORDINALITY k(attnum, n)
+                     JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                     ORDER BY k.n)::text[] AS columns,
+               NULL::text AS ref_table, NULL::text[] AS ref_columns, NULL::text AS expr
+        FROM pg_index i
+        WHERE i.indrelid = %(rel)s::regclass AND i.indisunique
+          AND i.indpred IS NULL AND i.indexprs IS NULL
+        UNION ALL
+        SELECT c.conname, c.contype::text,
+               ARRAY(SELECT a.attname FROM unnest(c.conkey) WITH ORDINALITY k(attnum, n)
+                     JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+                     ORDER BY k.n)::text[],
+               c.confrelid::regclass::text,
+               ARRAY(SELECT a.attname FROM unnest(c.confkey) WITH ORDINALITY k(attnum, n)
+                     JOIN pg_attribute a ON a.attrelid = c.confrelid AND a.attnum = k.attnum
+                     ORDER BY k.n)::text[],
+               pg_get_expr(c.conbin, c.conrelid)
+        FROM pg_constraint c
+        WHERE c.conrelid = %(rel)s::regclass AND c.contype IN ('f', 'c');
+        """,
+        {'rel': f'public.{_quote(table_name)}'}
+    )
+    return cur.fetchall()
+
+
+def _row_tuple(alias, columns):
+    return ', '.join(f'{alias}.{_quote(c)}' for c in columns)
+
+
+def _value_text(alias, columns):
+    return "concat_ws(', ', " + ', '.join(f'{alias}.{_quote(c)}::text' for c in columns) + ')'
+
+
+def _all_not_null(alias, columns):
+    return ' AND '.join(f'{alias}.{_quote(c)} IS NOT NULL' for c in columns)
+
+
+def _check(kind, name, columns, value_sql, detail_sql, from_where):
+    """One branch of the UNION: (row_number, kind, constraint, columns, value, detail)."""
+    return (
+        f"SELECT src.{ROW_COLUMN} AS row_number, '{kind}' AS kind, %s AS constraint_name, "
+        f"%s AS columns, {value_sql} AS value, {detail_sql} AS detail "
+        f"FROM {from_where}",
+        [name, ', '.join(columns)],
+    )
+
+
+def _build_diagnosis(cur, stage, table_name, columns, conflict_keys, dedupe_keys):
+    meta = {c.name: c for c in schema.get_table(table_name).columns}
+    inserted = set(columns)
+    parts, params = [], []
+    typed = cur.connection.server_version >= 160000
+
+    # 1. Per-value checks on the raw text, in one pass over the stage.
+    lateral, lateral_params = [], []
+    for c in columns:
+        col = _quote(c)
+        full_type = meta[c].full_type
+        null_problem = "'not_null'" if not meta[c].nullable else 'NULL'
+        invalid = f"WHEN NOT pg_input_is_valid({col}, %s) THEN 'invalid_value' " if typed else ''
+        lateral.append(
+            f"(%s, %s, {col}, CASE WHEN {col} IS NULL THEN {null_problem} {invalid}END)"
+        )
+        lateral_params += [c, full_type] + ([full_type] if typed else [])
+    detail = "(pg_input_error_info(v.value, v.type_name)).message" if typed else 'NULL'
+    parts.append(
+        f"SELECT s.{ROW_COLUMN} AS row_number, v.problem AS kind, NULL::text AS constraint_name, "
+        f"v.column_name AS columns, v.value AS value, "
+        f"CASE WHEN v.problem = 'invalid_value' THEN {detail} END AS detail "
+        f"FROM {stage} s, LATERAL (VALUES {', '.join(lateral)}) "
+        f"v(column_name, type_name, value, problem) WHERE v.problem IS NOT NULL"
+    )
+    params += lateral_params
+
+    # 2. Constraint checks on the rows whose values all cast cleanly.
+    if typed:
+        valid_where = 'WHERE ' + ' AND '.join(
+            f"({_quote(c)} IS NULL OR pg_input_is_valid({_quote(c)}, %s))" for c in columns
+        )
+        valid_params = [meta[c].full_type for c in columns]
+    else:
+        valid_where, valid_params = '', []
+    base_types = {c: meta[c].base_type for c in columns}
+    source = build_source_select(
+        stage, columns, base_types, dedupe_keys or conflict_keys,
+        where=valid_where, with_row_number=True,
+    )
+
+    for con in _constraints(cur, table_name):
+        cols = list(con['columns'])
+        if not cols or not set(cols) <= inserted:
+            continue
+        value_sql = _value_text('src', cols)
+        if con['kind'] == 'u':
+            sql, p = _check(
+                'duplicate_in_file', con['name'], cols, value_sql, 'NULL',
+                f"(SELECT *, row_number() OVER (PARTITION BY {_row_tuple('d', cols)} "
+                f"ORDER BY d.{ROW_COLUMN}) AS seen FROM src d WHERE {_all_not_null('d', cols)}) src "
+                f"WHERE src.seen > 1"
+            )
+            parts.append(sql)
+            params += p
+            if conflict_keys and set(cols) == set(conflict_keys):
+                continue   # clashes on the conflict key become updates
+            same_key = ' AND '.join(f't.{_quote(c)} = src.{_quote(c)}' for c in cols)
+            other_row = (
+                f" AND ({_row_tuple('t', conflict_keys)}) IS DISTINCT FROM ({_row_tuple('src', conflict_keys)})"
+                if conflict_keys else ''
+            )
+            sql, p = _check(
+                'duplicate_existing', con['name'], cols, value_sql, 'NULL',
+                f"src WHERE EXISTS (SELECT 1 FROM {_quote(table_name)} t WHERE {same_key}{other_row})"
+            )
+        elif con['kind'] == 'f':
+            ref_cols = list(con['ref_columns'])
+            ref_match = ' AND '.join(
+                f'r.{_quote(rc)} = src.{_quote(c)}' for c, rc in zip(cols, ref_cols)
+            )
+            ref_table = con['ref_table']
+            exists = f"EXISTS (SELECT 1 FROM {ref_table} r WHERE {ref_match})"
+            if ref_table.replace('"', '') == table_name and set(ref_cols) <= inserted:
+                # Self-reference: the parent may be another row of this file.
+                exists += f" OR EXISTS (SELECT 1 FROM src r WHERE {ref_match})"
+            sql, p = _check(
+                'foreign_key', con['name'], cols, value_sql, '%s',
+                f"src WHERE {_all_not_null('src', cols)} AND NOT ({exists})"
+            )
+            p.append(ref_table)
+        else:
+            sql, p = _check(
+                'check', con['name'], cols, value_sql, 'NULL',
+                f"src WHERE ({con['expr'].replace('%', '%%')}) IS FALSE"
+            )
+        parts.append(sql)
+        params += p
+
+    query = (
+        f"WITH src AS MATERIALIZED ({source}), "
+        f"problems AS ({' UNION ALL '.join(parts)}) "
+        f"SELECT *, COUNT(*) OVER () AS total FROM problems "
+        f"ORDER BY row_number, columns LIMIT {MAX_REPORTED_ROWS}"
+    )
+    # Placeholders appear in order: source (valid rows), value checks, constraints.
+    return query, valid_params + params
+
+
+def find_invalid_rows(cur, stage, table_name, columns, conflict_keys=None, dedupe_keys=None):
+    """
+    Lists every staged row that cannot be merged into ``table_name``.
+
+    Returns ``(problems, total)``: up to MAX_REPORTED_ROWS dicts with
+    ``row_number``, ``column``, ``value`` and a readable ``problem``, ordered by
+    CSV row, plus the total number of problems found. Runs inside its own
+    savepoint; returns ``([], 0)`` if the checks themselves cannot run.
+    """
+    cur.execute("SAVEPOINT _diagnose")
+    try:
+        query, params = _build_diagnosis(cur, stage, table_name, columns, conflict_keys, dedupe_keys)
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        cur.execute("RELEASE SAVEPOINT _diagnose")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT _diagnose")
+        print(f"Upload diagnosis: set-based checks failed ({e}); falling back to bisection.")
+        return [], 0
+
+    problems = [
+        {
+            'row_number': r['row_number'],
+            'kind': r['kind'],
+            'column': r['columns'],
+            'value': r['value'],
+            'problem': _PROBLEMS[r['kind']].format(
+                columns=r['columns'], value=r['value'], detail=r['detail'],
+                constraint=r['constraint_name'],
+            ),
+        }
+        for r in rows
+    ]
+    return problems, (rows[0]['total'] if rows else 0)
+
+
+def bisect_failing_row(cur, stage, table_name, columns, column_types,
+                       conflict_keys=None, update_cols=None, dedupe_keys=None):
+    """
+    Finds the first CSV row whose merge fails by trial-inserting ever smaller
+    prefixes of the staged file, each inside a savepoint that is rolled back.
+    Returns (1-based CSV data row number, exception) or (None, None).
+    """
+    insert, on_conflict = build_insert(table_name, columns, conflict_keys, update_cols)
+
+    def attempt(last_row):
+        source = build_source_select(
+            stage, columns, column_types, dedupe_keys or conflict_keys,
+            where=f'WHERE {ROW_COLUMN} <= {int(last_row)}',
+        )
+        cur.execute("SAVEPOINT _bisect")
+        try:
+            cur.execute(f"{insert} {source} {on_conflict};")
+            return None
+        except Exception as e:
+            return e
+        finally:
+            cur.execute("ROLLBACK TO SAVEPOINT _bisect")
+
+    cur.execute(f"SELECT MIN({ROW_COLUMN}) AS lo, MAX({ROW_COLUMN}) AS hi FROM {stage};")
+    bounds = cur.fetchone()
+    lo, hi = bounds['lo'], bounds['hi']
+    if lo is None:
+        return None, None
+    err = attempt(hi)
+    if err is None:
+        return None, None
+    # Invariant: the prefix ending at ``hi`` fails, the one ending before ``lo`` passes.
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_err = attempt(mid)
+        if mid_err is None:
+            lo = mid + 1
+        else:
+            hi, err = mid, mid_err
+    return hi, err
+
+
+def first_failing_row(problems, error):
+    """CSV row of the first problem matching the merge error, else of the first problem."""
+    code = getattr(error, 'pgcode', None) or ''
+    kinds = {'invalid_value'} if code.startswith('22') else _KINDS_BY_SQLSTATE.get(code, set())
+    matching = (p['row_number'] for p in problems if p['kind'] in kinds)
+    return next(matching, problems[0]['row_number'] if problems else None)
@@ -3,8 +3,10 @@ from datetime import date
 from flask import Blueprint, jsonify, request
 from psycopg2.errors import UndefinedTable
 
+from . import schema
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 education_bp = Blueprint('education', __name__)
 
@@ -74,34 +76,9 @@ def fetch_rows(where_clause, params, extra_columns=''):
         if conn:
             conn.close()
 def faculty_engagement_table_exists():
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            return False
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND table_name = %s
-            ) AS exists_flag;
-            """,
-            (ENGAGEMENT_TABLE_NAME,)
-        )
-        row = cur.fetchone()
-        return bool(row and row['exists_flag'])
-    except Exception as exc:
-        print(f"Education table existence check failed: {exc}")
-        return False
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    return schema.tables_available(ENGAGEMENT_TABLE_NAME)
+
+
 def compute_summary(rows):
     today = date.today()
     summary_map = {eng_type: {'total': 0, 'active': 0} for eng_type in ENGAGEMENT_TYPES}
@@ -125,6 +102,7 @@ def compute_summary(rows):
 
 @education_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_filter_options(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
@@ -177,6 +155,7 @@ def get_filter_options(current_user_id):
 
 @education_bp.route('/summary', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_summary(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
@@ -219,6 +198,7 @@ def get_summary(current_user_id):
 
 @education_bp.route('/department-breakdown', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_department_breakdown(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
@@ -309,6 +289,7 @@ def get_department_breakdown(current_user_id):
 
 @education_bp.route('/year-trend', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_year_trend(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
@@ -377,6 +358,7 @@ def get_year_trend(current_user_id):
 
 @education_bp.route('/type-distribution', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_type_distribution(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
@@ -433,6 +415,7 @@ def get_type_distribution(current_user_id):
 
 @education_bp.route('/list', methods=['GET'])
 @token_required
+@cached(ENGAGEMENT_TABLE_NAME)
 def get_faculty_engagement_list(current_user_id):
     if not faculty_engagement_table_exists():
         return jsonify({
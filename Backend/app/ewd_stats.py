@@ -4,6 +4,7 @@ from flask import Blueprint, jsonify
 
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 ewd_bp = Blueprint('ewd', __name__)
 
@@ -53,6 +54,7 @@ def _convert_decimal(row):
 
 @ewd_bp.route('/yearly', methods=['GET'])
 @token_required
+@cached('ewd_yearwise')
 def get_ewd_yearly(current_user_id):
     rows, error = _fetch_all_rows()
     if error:
@@ -64,6 +66,7 @@ def get_ewd_yearly(current_user_id):
 
 @ewd_bp.route('/summary', methods=['GET'])
 @token_required
+@cached('ewd_yearwise')
 def get_ewd_summary(current_user_id):
     rows, error = _fetch_all_rows()
     if error:
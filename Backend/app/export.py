@@ -0,0 +1,304 @@
+"""
+Bulk export of the dashboard tables for offline analysis.
+
+GET /api/export/<table> (admins only) streams the rows of any uploadable
+table (upload.UPDATABLE_TABLES) matching the query-string filters:
+
+    format  csv (default) | ndjson | parquet
+    fields  comma-separated columns to include (default: all but the
+            PRIVATE_COLUMNS of the table, which are never exported)
+    ...     the filters of the table's dashboard endpoints, applied by the
+            same builder (e.g. ?department=CSE&gender=Female on employees);
+            other tables take ``<column>=<value>``
+
+Rows are read through a server-side cursor (see streaming.batches()) and
+written out one batch at a time, so memory stays flat however large the
+table. Parquet needs the optional ``pyarrow`` package; each batch becomes a
+row group.
+"""
+import csv
+import io
+import json
+import re
+from datetime import date, datetime
+from typing import Any, Callable, List, Mapping, NamedTuple, Tuple
+
+from flask import Blueprint, jsonify, request
+
+from . import (
+    academic_module, academic_stats, administrative_stats, education_stats, iar_stats,
+    industry_connect_module, innovation_module, placement_stats, research_module, schema, streaming,
+)
+from .auth import _require_admin, token_required
+from .db import get_db_connection
+from .upload import UPDATABLE_TABLES
+
+export_bp = Blueprint('export', __name__)
+
+
+class Filters(NamedTuple):
+    """How an export reads its filters: ``build(args) -> (where_clause, params)``."""
+    build: Callable[[Mapping[str, str]], Tuple[str, List[Any]]]
+    alias: str = ''     # table alias the builder's columns are qualified with
+
+
+# Tables whose dashboard module has a filter builder; the others use _column_filters().
+TABLE_FILTERS = {
+    'student_table': Filters(lambda args: academic_stats.build_filter_query(args.to_dict())),
+    'employees': Filters(lambda args: administrative_stats.build_filter_query(args.to_dict())),
+    'faculty_engagement': Filters(education_stats.build_filter_query),
+    'alumni': Filters(iar_stats.build_filter_query, alias='a'),
+    'courses_table': Filters(lambda args: academic_module.build_where_clause(args, {
+        'category': 'course_category',
+        'programme': 'target_programme',
+        'status': 'industry_course_status_currentay',
+        'proposal_type': 'proposal_type',
+    })),
+    'placement_summary': Filters(lambda args: placement_stats.build_where_clause(
+        {'year': 'placement_year', 'program': 'program', 'gender': 'gender'}, args)),
+    'placement_packages': Filters(lambda args: placement_stats.build_where_clause(
+        {'year': 'placement_year', 'program': 'program'}, args)),
+    'placement_companies': Filters(lambda args: placement_stats.build_where_clause(
+        {'year': 'placement_year', 'sector': 'sector'}, args)),
+    'icsr_sponsered_projects': Filters(lambda args: research_module._build_project_filters(
+        args.get('department'), args.get('project_year'), args.get('status'),
+        dept_column='principal_investigator_department')),
+    'icsr_consultancy_projects': Filters(lambda args: research_module._build_project_filters(
+        args.get('department'), args.get('project_year'), args.get('status'))),
+    'research_mous': Filters(lambda args: research_module._build_year_filter('date_signed', args.get('mou_year'))),
+    'research_patents': Filters(lambda args: research_module._build_patent_filters(
+        args.get('patent_year'), args.get('patent_status'))),
+    'research_publications': Filters(lambda args: research_module._build_publication_filters(
+        args.get('department'), args.get('publication_year'), args.get('publication_type'))),
+    'industry_events': Filters(lambda args: industry_connect_module._build_events_where_clause(args.to_dict())),
+    'iptif_projects_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.IPTIF_PROJECT_FILTERS, args)),
+    'iptif_program_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.IPTIF_PROGRAM_FILTERS, args)),
+    'iptif_startup_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.IPTIF_STARTUP_FILTERS, args)),
+    'iptif_facilities_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.IPTIF_FACILITY_FILTERS, args)),
+    'techin_program_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.TECHIN_PROGRAM_FILTERS, args)),
+    'techin_skill_development_program': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.TECHIN_SKILL_DEV_FILTERS, args)),
+    'techin_startup_table': Filters(lambda args: innovation_module.build_where_clause(
+        innovation_module.TECHIN_STARTUP_FILTERS, args)),
+}
+
+# Personal data that is never exported (nor taken as a <column>=<value>
+# filter): identity numbers, contact details, addresses, dates of birth,
+# health and pay.
+PRIVATE_COLUMNS = {
+    'employees': (
+        'phonenumber', 'email', 'personalmail', 'address', 'ltchometown', 'dob',
+        'bloodgroup', 'marital_status', 'pwd', 'basicpay',
+    ),
+    'student_table': (
+        'aadhar_number', 'apaar_id', 'date_of_birth', 'residential_address', 'blood_group',
+        'disability_type', 'pwd_status', 'student_contact_no', 'institute_email', 'personal_email',
+        'parent_name', 'parent_contact_no', 'parent_email',
+    ),
+}
+
+# Query arguments that are not filters.
+CONTROL_ARGS = ('format', 'fields')
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _column_filters(table: str, args: Mapping[str, str]) -> Tuple[str, List[Any]]:
+    """``<column>=<value>`` equality filters, for tables without a dashboard filter builder."""
+    meta = schema.get_table(table)
+    private = PRIVATE_COLUMNS.get(table, ())
+    columns = {c.name.lower(): c.name for c in meta.columns if c.name not in private} if meta else {}
+    conditions, params = [], []
+    for key, value in args.items():
+        column = columns.get(key.lower())
+        if column is None or key in CONTROL_ARGS or value in ('', 'All'):
+            continue
+        conditions.append(f"{column} = %s")
+        params.append(value)
+    clause = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+    return clause, params
+
+
+# ---------------------------------------------------------------------------
+# Writers: each turns the batches of rows into chunks of the output file.
+# ---------------------------------------------------------------------------
+
+def _csv_chunks(rows, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in rows:
+        writer.writerows([row[column] for column in columns] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _json_value(value):
+    # Dates as ISO strings; Decimals (and anything else) as exact strings.
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_chunks(rows, columns):
+    for batch in rows:
+        yield ''.join(
+            json.dumps({column: row[column] for column in columns}, default=_json_value, ensure_ascii=False) + '\n'
+            for row in batch
+        )
+
+
+def _pyarrow():
+    """The pyarrow module (with pyarrow.parquet loaded), or None when it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+class _Sink:
+    """Write-only file for pyarrow that hands back what was written since the last take()."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _arrow_column(pa, column: schema.ColumnMeta):
+    """Arrow type of a column and the conversion its Python values need (or None)."""
+    simple = {
+        'smallint': pa.int16(), 'integer': pa.int32(), 'bigint': pa.int64(),
+        'real': pa.float32(), 'double precision': pa.float64(), 'boolean': pa.bool_(),
+        'date': pa.date32(),
+        'timestamp without time zone': pa.timestamp('us'),
+        'timestamp with time zone': pa.timestamp('us', tz='UTC'),
+    }
+    if column.base_type in simple:
+        return simple[column.base_type], None
+    if column.base_type == 'numeric':
+        match = re.fullmatch(r'numeric\((\d+),(\d+)\)', column.full_type)
+        if match and int(match.group(1)) <= 38:
+            return pa.decimal128(int(match.group(1)), int(match.group(2))), None
+        return pa.float64(), float
+    if column.base_type in ('text', 'character varying', 'character'):
+        return pa.string(), None
+    # Enums and anything else are exported as text.
+    return pa.string(), str
+
+
+def _parquet_chunks(pa, rows, table, columns):
+    meta = schema.get_table(table)
+    arrow = [_arrow_column(pa, meta.column(column)) for column in columns]
+    arrow_schema = pa.schema([(column, arrow_type) for column, (arrow_type, _) in zip(columns, arrow)])
+
+    sink = _Sink()
+    writer = pa.parquet.ParquetWriter(pa.PythonFile(sink, mode='w'), arrow_schema)
+    try:
+        for batch in rows:
+            data = {}
+            for column, (_, convert) in zip(columns, arrow):
+                values = [row[column] for row in batch]
+                if convert is not None:
+                    values = [None if v is None else convert(v) for v in values]
+                data[column] = values
+            writer.write_table(pa.Table.from_pydict(data, schema=arrow_schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+@export_bp.route('/export/<table>', methods=['GET'])
+@token_required
+def export_table(current_user_id, table):
+    """Streams the filtered rows of an uploadable table as CSV, NDJSON or Parquet. Admin only."""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'message': 'Database connection failed.'}), 500
+    cur = conn.cursor()
+    try:
+        if not _require_admin(cur, current_user_id):
+            return jsonify({'message': 'Admin access required'}), 403
+    finally:
+        cur.close()
+        conn.close()
+
+    table_name = next((t for t in UPDATABLE_TABLES if t.lower() == table.lower()), None)
+    if not table_name:
+        return jsonify({'message': f"Exporting table '{table}' is not allowed."}), 403
+    if not schema.tables_available(table_name):
+        return jsonify({'message': f"Table '{table_name}' is missing."}), 500
+
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in FORMATS:
+        return jsonify({'message': f"Unsupported format '{export_format}'. Use one of: {', '.join(FORMATS)}."}), 400
+    pa = None
+    if export_format == 'parquet':
+        pa = _pyarrow()
+        if pa is None:
+            return jsonify({'message': "Parquet export needs the 'pyarrow' package on the server."}), 501
+
+    try:
+        columns = streaming.fields(table_name, request.args.get('fields'), PRIVATE_COLUMNS.get(table_name, ()))
+        filters = TABLE_FILTERS.get(table_name)
+        if filters:
+            where_clause, params = filters.build(request.args)
+            alias = filters.alias
+        else:
+            where_clause, params = _column_filters(table_name, request.args)
+            alias = ''
+        order_by = ', '.join(UPDATABLE_TABLES[table_name])
+        query = f"SELECT {', '.join(columns)} FROM {table_name} {alias} {where_clause} ORDER BY {order_by}"
+
+        rows = streaming.batches(query, params)
+        _, all_rows = streaming.primed(rows)
+    except streaming.InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        print(f"Export error ({table_name}): {e}")
+        return jsonify({'message': f'Failed to export {table_name}.'}), 500
+
+    if export_format == 'csv':
+        chunks = _csv_chunks(all_rows, columns)
+    elif export_format == 'ndjson':
+        chunks = _ndjson_chunks(all_rows, columns)
+    else:
+        chunks = _parquet_chunks(pa, all_rows, table_name, columns)
+
+    mimetype, extension = FORMATS[export_format]
+    headers = {'Content-Disposition': f'attachment; filename="{table_name}.{extension}"'}
+    return streaming.stream(chunks, rows, mimetype, 'Export', headers)
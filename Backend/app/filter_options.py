@@ -0,0 +1,74 @@
+"""
+Shared filter-options engine.
+
+The stats modules' /filter-options endpoints used to run one
+``SELECT DISTINCT ... ORDER BY`` per dropdown. distinct_values() collects
+every dimension of a table in a single scan using GROUPING SETS, keeps each
+dimension's SQL ordering, and memoizes the result until the next upload of
+that table (see cache.memoize / cache.invalidate).
+"""
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+from .cache import memoize
+
+
+class Dimension(NamedTuple):
+    """One dropdown: response key, SQL expression, sort order, keep NULLs."""
+    key: str
+    expr: str
+    order: str = 'ASC'
+    include_null: bool = False
+
+
+def _build_query(table: str, dimensions: Sequence[Dimension]) -> str:
+    exprs = [d.expr for d in dimensions]
+    selects = ', '.join(f"{expr} AS d{i}" for i, expr in enumerate(exprs))
+    sets = ', '.join(f"({expr})" for expr in exprs)
+    order = ', '.join(f"d{i} {d.order}" for i, d in enumerate(dimensions))
+    return (
+        f"SELECT GROUPING({', '.join(exprs)}) AS grouping_id, {selects} "
+        f"FROM {table} "
+        f"GROUP BY GROUPING SETS ({sets}) "
+        f"ORDER BY grouping_id, {order}"
+    )
+
+
+def _fetch(conn, table: str, dimensions: Sequence[Dimension]) -> Dict[str, List[Any]]:
+    n = len(dimensions)
+    full_mask = (1 << n) - 1
+    # GROUPING() sets the bit of every argument that is *not* grouped in a row.
+    by_mask = {full_mask ^ (1 << (n - 1 - i)): i for i in range(n)}
+
+    result: Dict[str, List[Any]] = {d.key: [] for d in dimensions}
+    cur = conn.cursor()
+    try:
+        cur.execute(_build_query(table, dimensions))
+        for row in cur.fetchall():
+            idx = by_mask.get(row['grouping_id'])
+            if idx is None:
+                continue
+            dim = dimensions[idx]
+            value = row[f'd{idx}']
+            if value is None and not dim.include_null:
+                continue
+            result[dim.key].append(value)
+    finally:
+        cur.close()
+    return result
+
+
+def distinct_values(conn, table: str, dimensions: Sequence[Dimension]) -> Dict[str, List[Any]]:
+    """
+    Returns ``{dimension.key: [distinct values...]}`` for ``table``, ordered as
+    ``SELECT DISTINCT expr ... ORDER BY expr <order>`` would.
+
+    The returned lists are shared with the memo; copy before mutating.
+    """
+    dimensions = tuple(dimensions)
+    if not dimensions:
+        return {}
+    return memoize(
+        ('filter-options', table, dimensions),
+        [table],
+        lambda: _fetch(conn, table, dimensions),
+    )
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify
 
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 grievance_bp = Blueprint('grievance', __name__)
 
@@ -52,6 +53,7 @@ def _fetch_summary(query):
 
 @grievance_bp.route('/igrc/yearly', methods=['GET'])
 @token_required
+@cached('igrs_yearwise')
 def get_igrc_yearly(current_user_id):
     """
     Returns the year-wise grievance statistics for IGRC.
@@ -74,6 +76,7 @@ def get_igrc_yearly(current_user_id):
 
 @grievance_bp.route('/igrc/summary', methods=['GET'])
 @token_required
+@cached('igrs_yearwise')
 def get_igrc_summary(current_user_id):
     """
     Returns aggregated IGRC grievance statistics.
@@ -94,6 +97,7 @@ def get_igrc_summary(current_user_id):
 
 @grievance_bp.route('/icc/yearly', methods=['GET'])
 @token_required
+@cached('icc_yearwise')
 def get_icc_yearly(current_user_id):
     """
     Returns the year-wise complaint statistics for ICC.
@@ -116,6 +120,7 @@ def get_icc_yearly(current_user_id):
 
 @grievance_bp.route('/icc/summary', methods=['GET'])
 @token_required
+@cached('icc_yearwise')
 def get_icc_summary(current_user_id):
     """
     Returns aggregated ICC complaint statistics.
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 iar_bp = Blueprint('iar', __name__)
 
@@ -15,8 +16,20 @@ iar_bp = Blueprint('iar', __name__)
 # Removed columns (no longer available):
 #   name, alumniidno, gender, category, outcome, homestate, jobstate,
 #   jobplace, employer_or_institution, updated_at
+#
+# `outcome` is back as a generated column (HigherStudies / Corporate,
+# classified from current_job when the row is written), so every view below
+# is an aggregate computed by fetch_alumni_counts() in a single scan.
 # ---------------------------------------------------------------------------
 
+# Grouping dimensions of the alumni views; blank values count as 'Unknown'.
+DIMENSIONS = {
+    'year': 'a.year_of_graduation',
+    'state': "COALESCE(NULLIF(a.place_of_settlement_state, ''), 'Unknown')",
+    'country': "COALESCE(NULLIF(a.country_of_settlement, ''), 'Unknown')",
+    'department': "COALESCE(NULLIF(a.department, ''), 'Unknown')",
+}
+
 
 def build_filter_query(filters):
     """Build a WHERE clause from the filter dict."""
@@ -42,9 +55,29 @@ def build_filter_query(filters):
     return where_clause, params
 
 
-def apply_filters_and_fetch(where_clause, params,
-                            order_clause='ORDER BY a.year_of_graduation ASC'):
-    """Run a SELECT on the alumni table with the given filters."""
+def fetch_alumni_counts(where_clause, params, dimensions):
+    """
+    Total and higher-studies counts of the filtered alumni, overall and per
+    value of each of ``dimensions``, from one GROUPING SETS pass.
+    Returns ({'total': row, <dimension>: [rows]}, error).
+    """
+    selects = ', '.join(f"{DIMENSIONS[d]} AS {d}" for d in dimensions)
+    groupings = ', '.join(f"GROUPING({d}) AS grouped_{d}" for d in dimensions)
+    sets = ', '.join(['()'] + [f'({d})' for d in dimensions])
+    query = f"""
+        SELECT
+            {groupings},
+            {', '.join(dimensions)},
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE outcome = 'HigherStudies') AS higher
+        FROM (
+            SELECT {selects}, a.outcome
+            FROM alumni a
+            {where_clause}
+        ) a
+        GROUP BY GROUPING SETS ({sets})
+    """
+
     conn = None
     cur = None
     try:
@@ -53,26 +86,16 @@ def apply_filters_and_fetch(where_clause, params,
             return None, 'Database connection failed.'
 
         cur = conn.cursor()
-        query = f"""
-            SELECT
-                a.sl_no,
-                a.roll_number,
-                a.year_of_admission,
-                a.year_of_graduation,
-                a.course_type,
-                a.course_name,
-                a.department,
-                a.current_job,
-                a.country_of_settlement,
-                a.place_of_settlement_state,
-                a.alumni_contribution
-            FROM alumni a
-            {where_clause}
-            {order_clause}
-        """
         cur.execute(query, params)
-        rows = cur.fetchall()
-        return rows, None
+        counts = {d: [] for d in dimensions}
+        for row in cur.fetchall():
+            # Exactly one dimension is grouped on (0), except in the grand total.
+            dim = next((d for d in dimensions if row[f'grouped_{d}'] == 0), None)
+            if dim is None:
+                counts['total'] = row
+            else:
+                counts[dim].append(row)
+        return counts, None
     except Exception as exc:
         print(f"IAR stats error: {exc}")
         return None, 'Failed to fetch alumni data.'
@@ -83,24 +106,55 @@ def apply_filters_and_fetch(where_clause, params,
             conn.close()
 
 
-def classify_outcome(row):
-    """
-    Attempt to classify an alumnus's outcome from the `current_job` field.
-    If the job title hints at academia/research → HigherStudies, else Corporate.
-    """
-    job = (row.get('current_job') or '').lower()
-    academic_keywords = (
-        'research', 'phd', 'ms ', 'msc', 'fellow', 'scholar',
-        'professor', 'lecturer', 'postdoc', 'university', 'institute',
-        'college', 'academia', 'doctoral',
-    )
-    if any(kw in job for kw in academic_keywords):
-        return 'HigherStudies'
-    return 'Corporate'
+def summary_view(counts):
+    totals = counts['total']
+    trend = [
+        {'year': r['year'], 'total': r['total'], 'higher': r['higher'],
+         'corporate': r['total'] - r['higher']}
+        for r in sorted((r for r in counts['year'] if r['year'] is not None),
+                        key=lambda r: r['year'])
+    ]
+    return {
+        'total_alumni': totals['total'],
+        'higher_studies': totals['higher'],
+        'corporate': totals['total'] - totals['higher'],
+        'trend': trend,
+    }
+
+
+def state_distribution_view(counts):
+    return [
+        {'state': r['state'], 'count': r['total']}
+        for r in sorted(counts['state'], key=lambda r: r['state'])
+    ]
+
+
+def country_distribution_view(counts):
+    return [
+        {'country': r['country'], 'count': r['total']}
+        for r in sorted(counts['country'], key=lambda r: (-r['total'], r['country']))
+    ]
+
+
+def outcome_breakdown_view(counts):
+    return [
+        {'department': r['department'], 'higher': r['higher'],
+         'corporate': r['total'] - r['higher'], 'total': r['total']}
+        for r in sorted(counts['department'], key=lambda r: r['department'])
+    ]
+
+
+def request_filters():
+    return {
+        'year': request.args.get('year'),
+        'department': request.args.get('department'),
+        'course_type': request.args.get('course_type'),
+    }
 
 
 @iar_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached('alumni')
 def get_filter_options(current_user_id):
     conn = None
     cur = None
@@ -140,127 +194,67 @@ def get_filter_options(current_user_id):
 
 @iar_bp.route('/summary', methods=['GET'])
 @token_required
+@cached('alumni')
 def get_summary(current_user_id):
-    filters = {
-        'year': request.args.get('year'),
-        'department': request.args.get('department'),
-        'course_type': request.args.get('course_type'),
-    }
-
-    where_clause, params = build_filter_query(filters)
-    rows, error = apply_filters_and_fetch(where_clause, params)
+    where_clause, params = build_filter_query(request_filters())
+    counts, error = fetch_alumni_counts(where_clause, params, ['year'])
     if error:
         return jsonify({'message': error}), 500
-
-    total_alumni = len(rows)
-    higher_studies = sum(1 for r in rows if classify_outcome(r) == 'HigherStudies')
-    corporate = total_alumni - higher_studies
-
-    by_year = {}
-    for row in rows:
-        year = row.get('year_of_graduation')
-        if year is None:
-            continue
-        if year not in by_year:
-            by_year[year] = {'total': 0, 'higher': 0, 'corporate': 0}
-        by_year[year]['total'] += 1
-        if classify_outcome(row) == 'HigherStudies':
-            by_year[year]['higher'] += 1
-        else:
-            by_year[year]['corporate'] += 1
-
-    trend = [
-        {'year': year, **counts}
-        for year, counts in sorted(by_year.items())
-    ]
-
-    return jsonify({
-        'data': {
-            'total_alumni': total_alumni,
-            'higher_studies': higher_studies,
-            'corporate': corporate,
-            'trend': trend,
-        }
-    }), 200
+    return jsonify({'data': summary_view(counts)}), 200
 
 
 @iar_bp.route('/state-distribution', methods=['GET'])
 @token_required
+@cached('alumni')
 def get_state_distribution(current_user_id):
-    filters = {
-        'year': request.args.get('year'),
-        'department': request.args.get('department'),
-        'course_type': request.args.get('course_type'),
-    }
-
-    where_clause, params = build_filter_query(filters)
-    rows, error = apply_filters_and_fetch(where_clause, params)
+    where_clause, params = build_filter_query(request_filters())
+    counts, error = fetch_alumni_counts(where_clause, params, ['state'])
     if error:
         return jsonify({'message': error}), 500
-
-    distribution = {}
-    for row in rows:
-        state = row.get('place_of_settlement_state') or 'Unknown'
-        distribution[state] = distribution.get(state, 0) + 1
-
-    formatted = [
-        {'state': s, 'count': c}
-        for s, c in sorted(distribution.items())
-    ]
-    return jsonify({'data': formatted}), 200
+    return jsonify({'data': state_distribution_view(counts)}), 200
 
 
 @iar_bp.route('/country-distribution', methods=['GET'])
 @token_required
+@cached('alumni')
 def get_country_distribution(current_user_id):
-    filters = {
-        'year': request.args.get('year'),
-        'department': request.args.get('department'),
-        'course_type': request.args.get('course_type'),
-    }
-
-    where_clause, params = build_filter_query(filters)
-    rows, error = apply_filters_and_fetch(where_clause, params)
+    where_clause, params = build_filter_query(request_filters())
+    counts, error = fetch_alumni_counts(where_clause, params, ['country'])
     if error:
         return jsonify({'message': error}), 500
-
-    distribution = {}
-    for row in rows:
-        country = row.get('country_of_settlement') or 'Unknown'
-        distribution[country] = distribution.get(country, 0) + 1
-
-    formatted = [
-        {'country': c, 'count': n}
-        for c, n in sorted(distribution.items(), key=lambda x: (-x[1], x[0]))
-    ]
-    return jsonify({'data': formatted}), 200
+    return jsonify({'data': country_distribution_view(counts)}), 200
 
 
 @iar_bp.route('/outcome-breakdown', methods=['GET'])
 @token_required
+@cached('alumni')
 def get_outcome_breakdown(current_user_id):
-    """Per-department counts for higher studies vs corporate (inferred from current_job)."""
-    filters = {
-        'year': request.args.get('year'),
-        'department': request.args.get('department'),
-        'course_type': request.args.get('course_type'),
-    }
-
-    where_clause, params = build_filter_query(filters)
-    rows, error = apply_filters_and_fetch(where_clause, params)
+    """Per-department counts for higher studies vs corporate (classified from current_job)."""
+    where_clause, params = build_filter_query(request_filters())
+    counts, error = fetch_alumni_counts(where_clause, params, ['department'])
     if error:
         return jsonify({'message': error}), 500
+    return jsonify({'data': outcome_breakdown_view(counts)}), 200
+
 
-    breakdown = {}
-    for row in rows:
-        dept = row.get('department') or 'Unknown'
-        if dept not in breakdown:
-            breakdown[dept] = {'department': dept, 'higher': 0, 'corporate': 0, 'total': 0}
-        breakdown[dept]['total'] += 1
-        if classify_outcome(row) == 'HigherStudies':
-            breakdown[dept]['higher'] += 1
-        else:
-            breakdown[dept]['corporate'] += 1
-
-    formatted = sorted(breakdown.values(), key=lambda x: x['department'])
-    return jsonify({'data': formatted}), 200
+@iar_bp.route('/dashboard', methods=['GET'])
+@token_required
+@cached('alumni')
+def get_dashboard(current_user_id):
+    """
+    Everything the IAR section shows for one set of filters (summary with
+    year trend, state, country and department outcome views) from a single
+    scan of the alumni table.
+    """
+    where_clause, params = build_filter_query(request_filters())
+    counts, error = fetch_alumni_counts(where_clause, params, list(DIMENSIONS))
+    if error:
+        return jsonify({'message': error}), 500
+    return jsonify({
+        'data': {
+            'summary': summary_view(counts),
+            'state_distribution': state_distribution_view(counts),
+            'country_distribution': country_distribution_view(counts),
+            'outcome_breakdown': outcome_breakdown_view(counts),
+        }
+    }), 200
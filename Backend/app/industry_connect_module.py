@@ -6,53 +6,32 @@ Blueprint providing analytics for the Industry Connect module:
 from flask import Blueprint, jsonify, request
 from psycopg2 import extras
 
+from . import pagination, schema, search
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 
 industry_connect_bp = Blueprint('industry_connect', __name__)
 
 INDUSTRY_EVENTS_TABLE = 'industry_events'
 INDUSTRY_CONCLAVE_TABLE = 'industry_conclave'
+EVENT_SEARCH_COLUMNS = ('event_name', 'hosted_by', 'target_audience')
+EVENT_ORDER = [
+    pagination.Key('date_of_event', descending=True, nulls_last=True),
+    pagination.Key('event_name'),
+    pagination.Key('project_id'),
+]
 
 
 def _table_exists(conn, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND LOWER(table_name) = LOWER(%s)
-            )
-            """,
-            (table_name,),
-        )
-        result = cur.fetchone()
-        if isinstance(result, dict):
-            return bool(result.get('exists', False))
-        return bool(result[0] if result else False)
-    except Exception:
-        return False
-    finally:
-        cur.close()
+    """Check if a table exists in the database (served from the schema cache)."""
+    return schema.tables_available(table_name)
 
 
 def _data_available() -> bool:
     """Check if industry connect tables exist."""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        return (
-            _table_exists(conn, INDUSTRY_EVENTS_TABLE)
-            and _table_exists(conn, INDUSTRY_CONCLAVE_TABLE)
-        )
-    finally:
-        conn.close()
+    return schema.tables_available(INDUSTRY_EVENTS_TABLE, INDUSTRY_CONCLAVE_TABLE)
 
 
 def _build_events_where_clause(filters: dict) -> tuple[str, list]:
@@ -68,12 +47,10 @@ def _build_events_where_clause(filters: dict) -> tuple[str, list]:
         conditions.append("COALESCE(year, EXTRACT(YEAR FROM date_of_event)::INT) = %s")
         params.append(int(filters['year']))
 
-    if filters.get('search'):
-        conditions.append(
-            "(event_name ILIKE %s OR hosted_by ILIKE %s OR target_audience ILIKE %s)"
-        )
-        search_pattern = f"%{filters['search']}%"
-        params.extend([search_pattern, search_pattern, search_pattern])
+    search_cond, search_params = search.condition(filters.get('search'), EVENT_SEARCH_COLUMNS)
+    if search_cond:
+        conditions.append(search_cond)
+        params.extend(search_params)
 
     where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
     return where_clause, params
@@ -83,6 +60,7 @@ def _build_events_where_clause(filters: dict) -> tuple[str, list]:
 
 @industry_connect_bp.route('/icsr/summary', methods=['GET'])
 @token_required
+@cached(INDUSTRY_EVENTS_TABLE)
 def get_icsr_summary(current_user_id):
     """Get summary statistics for ICSR industry events."""
     if not _data_available():
@@ -129,6 +107,7 @@ def get_icsr_summary(current_user_id):
 
 @industry_connect_bp.route('/icsr/yearly-distribution', methods=['GET'])
 @token_required
+@cached(INDUSTRY_EVENTS_TABLE)
 def get_icsr_yearly_distribution(current_user_id):
     """Get year-wise distribution of industry events."""
     if not _data_available():
@@ -181,6 +160,7 @@ def get_icsr_yearly_distribution(current_user_id):
 
 @industry_connect_bp.route('/icsr/event-types', methods=['GET'])
 @token_required
+@cached(INDUSTRY_EVENTS_TABLE)
 def get_icsr_event_types(current_user_id):
     """Get event types distribution (frequency by type)."""
     if not _data_available():
@@ -230,6 +210,7 @@ def get_icsr_event_types(current_user_id):
 
 @industry_connect_bp.route('/icsr/events', methods=['GET'])
 @token_required
+@cached(INDUSTRY_EVENTS_TABLE)
 def get_icsr_events(current_user_id):
     """Get list of industry events with filtering and pagination."""
     if not _data_available():
@@ -241,11 +222,7 @@ def get_icsr_events(current_user_id):
         'search': request.args.get('search', '').strip()
     }
 
-    # Pagination
-    page = request.args.get('page', default=1, type=int)
-    per_page = request.args.get('per_page', default=50, type=int)
-    per_page = max(1, min(per_page, 100))
-    offset = (page - 1) * per_page
+    page_request = pagination.from_request(default_per_page=50, max_per_page=100)
 
     conn = None
     cur = None
@@ -258,13 +235,8 @@ def get_icsr_events(current_user_id):
 
         # Build WHERE clause
         where_clause, params = _build_events_where_clause(filters)
+        rank, rank_params, rank_keys = search.rank_column(conn, filters['search'], EVENT_SEARCH_COLUMNS)
 
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM {INDUSTRY_EVENTS_TABLE} {where_clause};"
-        cur.execute(count_query, params)
-        total = cur.fetchone()['total'] or 0
-
-        # Get events
         query = f"""
             SELECT
                 project_id,
@@ -276,13 +248,13 @@ def get_icsr_events(current_user_id):
                 funding_by,
                 amount,
                 year
+                {rank}
             FROM {INDUSTRY_EVENTS_TABLE}
             {where_clause}
-            ORDER BY date_of_event DESC NULLS LAST, event_name ASC
-            LIMIT %s OFFSET %s;
         """
-        cur.execute(query, params + [per_page, offset])
-        events = cur.fetchall()
+        events, page_info = pagination.fetch(
+            cur, query, rank_params + params, rank_keys + EVENT_ORDER, [INDUSTRY_EVENTS_TABLE], page_request
+        )
 
         result = []
         for row in events:
@@ -298,16 +270,10 @@ def get_icsr_events(current_user_id):
                 'year': row['year']
             })
 
-        return jsonify({
-            'data': result,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': (total + per_page - 1) // per_page
-            }
-        }), 200
+        return jsonify({'data': result, 'pagination': page_info}), 200
 
+    except pagination.InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"ICSR events list error: {e}")
         return jsonify({'message': 'Failed to fetch events list.'}), 500
@@ -320,6 +286,7 @@ def get_icsr_events(current_user_id):
 
 @industry_connect_bp.route('/icsr/filter-options', methods=['GET'])
 @token_required
+@cached(INDUSTRY_EVENTS_TABLE)
 def get_icsr_filter_options(current_user_id):
     """Get filter options for ICSR events."""
     if not _data_available():
@@ -366,6 +333,7 @@ def get_icsr_filter_options(current_user_id):
 
 @industry_connect_bp.route('/conclave/summary', methods=['GET'])
 @token_required
+@cached(INDUSTRY_CONCLAVE_TABLE)
 def get_conclave_summary(current_user_id):
     """Get summary statistics for Industry-Academia Conclave."""
     if not _data_available():
@@ -405,6 +373,7 @@ def get_conclave_summary(current_user_id):
 
 @industry_connect_bp.route('/conclave/list', methods=['GET'])
 @token_required
+@cached(INDUSTRY_CONCLAVE_TABLE)
 def get_conclave_list(current_user_id):
     """Get list of all Industry-Academia Conclaves."""
     if not _data_available():
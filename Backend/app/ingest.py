@@ -0,0 +1,156 @@
+"""
+Streaming bulk-ingestion helpers for the CSV upload endpoint.
+
+Rows are never collected in memory: the upload handler yields validated,
+normalised chunks which are encoded as CSV on the fly and streamed into
+``COPY ... FROM STDIN`` on a temporary staging table. The staging table is
+then merged into the target with a single ``INSERT ... SELECT ... ON
+CONFLICT`` (de-duplicated on the conflict key in SQL), so memory use stays
+flat regardless of the uploaded file's size.
+"""
+import io
+
+STAGE_TABLE = '_upload_stage'
+ROW_COLUMN = '_csv_row'
+
+
+class RowValidationError(Exception):
+    """Raised while streaming when a CSV row fails validation."""
+
+    def __init__(self, payload):
+        super().__init__(payload.get('message'))
+        self.payload = payload
+
+
+class CopyStream(io.RawIOBase):
+    """
+    File-like adapter feeding ``cursor.copy_expert`` from an iterator of
+    DataFrame chunks (see normalise.iter_normalised_frames) whose last column
+    is the CSV data-row number, so failures can be traced back to the file.
+
+    psycopg2 turns exceptions raised inside read() into a cancelled COPY, so a
+    RowValidationError from the source iterator is kept on ``self.error`` for
+    the caller to re-raise.
+    """
+
+    def __init__(self, frames):
+        super().__init__()
+        self._frames = iter(frames)
+        self._buf = io.StringIO()
+        self._pending = b''
+        self.rows_copied = 0
+        self.error = None
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        size = 65536 if size is None or size < 0 else size
+        while len(self._pending) < size:
+            try:
+                frame = next(self._frames)
+            except StopIteration:
+                break
+            except RowValidationError as e:
+                self.error = e
+                raise
+            # NULLs are written as unquoted empty fields, which COPY reads as NULL.
+            frame.to_csv(self._buf, header=False, index=False, lineterminator='\n')
+            self.rows_copied += len(frame)
+            self._pending += self._buf.getvalue().encode('utf-8')
+            self._buf.seek(0)
+            self._buf.truncate()
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def create_staging_table(cur, columns):
+    """
+    Creates an all-text temp table for one upload; dropped on commit.
+
+    Casting happens in the merge, never in COPY, so one bad value cannot hide
+    the rest of the file from diagnosis.
+    """
+    cols_sql = ', '.join(f'{_quote(c)} text' for c in columns)
+    cur.execute(f'DROP TABLE IF EXISTS {STAGE_TABLE};')
+    cur.execute(
+        f'CREATE TEMP TABLE {STAGE_TABLE} ({cols_sql}, {ROW_COLUMN} bigint) ON COMMIT DROP;'
+    )
+    return STAGE_TABLE
+
+
+def copy_rows(cur, stage, columns, frames):
+    """
+    Streams normalised DataFrame chunks into the staging table.
+    Returns the number of rows copied; re-raises any RowValidationError.
+    """
+    cols_sql = ', '.join(_quote(c) for c in columns)
+    stream = CopyStream(frames)
+    try:
+        cur.copy_expert(
+            f'COPY {stage} ({cols_sql}, {ROW_COLUMN}) FROM STDIN WITH (FORMAT csv)',
+            stream,
+        )
+    except Exception:
+        if stream.error is not None:
+            raise stream.error
+        raise
+    return stream.rows_copied
+
+
+def _cast(column, column_types):
+    return f'{_quote(column)}::{column_types[column]}'
+
+
+def build_source_select(stage, columns, column_types, dedupe_keys=None, where='', with_row_number=False):
+    """
+    SELECT over the staging table casting every column to its target type.
+    ``with_row_number`` also selects the CSV row number as its last column.
+    """
+    select_list = ', '.join(f'{_cast(c, column_types)} AS {_quote(c)}' for c in columns)
+    if with_row_number:
+        select_list += f', {ROW_COLUMN}'
+    if dedupe_keys:
+        key_exprs = ', '.join(_cast(k, column_types) for k in dedupe_keys)
+        # First occurrence of each key wins, as in the CSV.
+        return (
+            f'SELECT DISTINCT ON ({key_exprs}) {select_list} FROM {stage} {where} '
+            f'ORDER BY {key_exprs}, {ROW_COLUMN}'
+        )
+    return f'SELECT {select_list} FROM {stage} {where} ORDER BY {ROW_COLUMN}'
+
+
+def build_insert(table_name, columns, conflict_keys=None, update_cols=None):
+    """INSERT prefix plus ON CONFLICT clause for the target table."""
+    cols_sql = ', '.join(_quote(c) for c in columns)
+    insert = f'INSERT INTO {_quote(table_name)} ({cols_sql})'
+    if not conflict_keys:
+        return insert, ''
+    conflict_sql = ', '.join(_quote(c) for c in conflict_keys)
+    if update_cols:
+        updates = ', '.join(f'{_quote(c)} = EXCLUDED.{_quote(c)}' for c in update_cols)
+        return insert, f'ON CONFLICT ({conflict_sql}) DO UPDATE SET {updates}'
+    return insert, f'ON CONFLICT ({conflict_sql}) DO NOTHING'
+
+
+def merge_staging(cur, stage, table_name, columns, column_types,
+                  conflict_keys=None, update_cols=None, dedupe_keys=None):
+    """
+    Moves the staged rows into the target table with one INSERT ... SELECT.
+    Returns the number of unique rows after de-duplication on ``dedupe_keys``
+    (defaults to the conflict keys).
+    """
+    source = build_source_select(stage, columns, column_types, dedupe_keys or conflict_keys)
+    insert, on_conflict = build_insert(table_name, columns, conflict_keys, update_cols)
+    cur.execute(
+        f"""
+        WITH src AS MATERIALIZED ({source}),
+             written AS ({insert} SELECT * FROM src {on_conflict})
+        SELECT COUNT(*) AS unique_rows FROM src;
+        """
+    )
+    return int(cur.fetchone()['unique_rows'])
@@ -10,13 +10,21 @@ from typing import Any, Dict, List, Optional, Tuple
 from flask import Blueprint, jsonify, request
 from psycopg2 import extras
 
+from . import async_db, pagination, schema, search, streaming
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 
 innovation_bp = Blueprint('innovation', __name__)
 
 STARTUPS_TABLE = 'startups'
+STARTUP_SEARCH_COLUMNS = ('startup_name', 'founder_name', 'innovation_focus_area')
+STARTUP_ORDER = [
+    pagination.Key('year_of_incubation', descending=True),
+    pagination.Key('startup_name'),
+    pagination.Key('startup_id'),
+]
 INNOVATION_PROJECTS_TABLE = 'innovation_projects'
 
 # IPTIF Tables
@@ -30,75 +38,55 @@ TECHIN_PROGRAM_TABLE = 'techin_program_table'
 TECHIN_SKILL_DEV_TABLE = 'techin_skill_development_program'
 TECHIN_STARTUP_TABLE = 'techin_startup_table'
 
+# Order of the IPTIF / TechIn lists: the dashboard's order, then the primary key.
+# 'list_date' is computed (see LIST_DATE).
+IPTIF_PROJECT_ORDER = [pagination.Key('start_date', descending=True), pagination.Key('project_id')]
+IPTIF_PROGRAM_ORDER = [pagination.Key('list_date', descending=True), pagination.Key('id')]
+IPTIF_STARTUP_ORDER = [pagination.Key('incubated_date', descending=True), pagination.Key('id')]
+IPTIF_FACILITY_ORDER = [
+    pagination.Key('financial_year', descending=True),
+    pagination.Key('facility_name'),
+    pagination.Key('facility_id'),
+]
+TECHIN_PROGRAM_ORDER = [pagination.Key('list_date', descending=True), pagination.Key('id')]
+TECHIN_SKILL_DEV_ORDER = TECHIN_PROGRAM_ORDER
+TECHIN_STARTUP_ORDER = [pagination.Key('incubated_date', descending=True), pagination.Key('id')]
+LIST_DATE = {
+    IPTIF_PROGRAM_TABLE: 'COALESCE(start_end, date)',
+    TECHIN_PROGRAM_TABLE: 'COALESCE(start_end, event_date)',
+    TECHIN_SKILL_DEV_TABLE: 'COALESCE(start_end, event_date)',
+}
+
+# Query arguments → columns filtered on by the IPTIF / TechIn endpoints (see build_where_clause).
+IPTIF_PROJECT_FILTERS = {'scheme': 'scheme', 'status': 'status', 'year': 'EXTRACT(YEAR FROM start_date)::INT'}
+IPTIF_PROGRAM_FILTERS = {'type': 'type', 'association': 'association'}
+IPTIF_STARTUP_FILTERS = {'domain': 'domain', 'status': 'status'}
+IPTIF_FACILITY_FILTERS = {'facility_type': 'facility_type'}
+TECHIN_PROGRAM_FILTERS = {'type': 'type', 'association': 'association'}
+TECHIN_SKILL_DEV_FILTERS = {'category': 'category', 'association': 'association'}
+TECHIN_STARTUP_FILTERS = {'domain': 'domain', 'status': 'status'}
+
 
 def _table_exists(conn, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND LOWER(table_name) = LOWER(%s)
-            )
-            """,
-            (table_name,),
-        )
-        result = cur.fetchone()
-        if isinstance(result, dict):
-            return bool(result.get('exists', False))
-        return bool(result[0] if result else False)
-    except Exception:
-        return False
-    finally:
-        cur.close()
+    """Check if a table exists in the database (served from the schema cache)."""
+    return schema.tables_available(table_name)
 
 
 def _data_available() -> bool:
     """Check if innovation tables exist."""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        return (
-            _table_exists(conn, STARTUPS_TABLE) and 
-            _table_exists(conn, INNOVATION_PROJECTS_TABLE)
-        )
-    finally:
-        conn.close()
+    return schema.tables_available(STARTUPS_TABLE, INNOVATION_PROJECTS_TABLE)
 
 
 def _iptif_data_available() -> bool:
     """Check if IPTIF tables exist."""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        return (
-            _table_exists(conn, IPTIF_PROJECTS_TABLE) and 
-            _table_exists(conn, IPTIF_PROGRAM_TABLE) and 
-            _table_exists(conn, IPTIF_STARTUP_TABLE) and 
-            _table_exists(conn, IPTIF_FACILITIES_TABLE)
-        )
-    finally:
-        conn.close()
+    return schema.tables_available(
+        IPTIF_PROJECTS_TABLE, IPTIF_PROGRAM_TABLE, IPTIF_STARTUP_TABLE, IPTIF_FACILITIES_TABLE
+    )
 
 
 def _techin_data_available() -> bool:
     """Check if TechIn tables exist."""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        return (
-            _table_exists(conn, TECHIN_PROGRAM_TABLE) and 
-            _table_exists(conn, TECHIN_SKILL_DEV_TABLE) and 
-            _table_exists(conn, TECHIN_STARTUP_TABLE)
-        )
-    finally:
-        conn.close()
+    return schema.tables_available(TECHIN_PROGRAM_TABLE, TECHIN_SKILL_DEV_TABLE, TECHIN_STARTUP_TABLE)
 
 
 def build_where_clause(filter_mapping: Dict[str, str], filters: Dict[str, Any]) -> Tuple[str, List]:
@@ -116,38 +104,55 @@ def build_where_clause(filter_mapping: Dict[str, str], filters: Dict[str, Any])
     return where_clause, params
 
 
+def _trend_list_response(cur, table: str, where_clause: str, params: List, trend: List[Dict[str, Any]],
+                         keys: List[pagination.Key]):
+    """
+    ``{'trend': trend, 'data': [...]}`` for an IPTIF / TechIn list: the rows
+    of ``table`` matching the filters, ordered by ``keys``. ``fields`` picks
+    the columns returned. With ``page`` / ``cursor`` / ``per_page`` the list
+    is paged (see pagination.py, adds ``pagination``); without them it is
+    returned whole, streamed when long (see streaming.py).
+    """
+    columns = streaming.fields(table, request.args.get('fields'))
+    # Sort columns the client did not ask for are selected for ordering and dropped.
+    hidden = [key.column for key in keys if key.column not in columns]
+    select = columns + [f"{LIST_DATE[table]} AS list_date" if c == 'list_date' else c for c in hidden]
+    query = f"SELECT {', '.join(select)} FROM {table} {where_clause}"
+
+    page_request = pagination.from_request(optional=True)
+    if page_request is None:
+        return streaming.json_list(pagination.ordered(query, keys), params, {'trend': trend}, hidden)
+
+    rows, page_info = pagination.fetch(cur, query, params, keys, [table], page_request)
+    data = [{k: v for k, v in row.items() if k not in hidden} for row in rows]
+    return jsonify({'trend': trend, 'data': data, 'pagination': page_info}), 200
+
+
 @innovation_bp.route('/summary', methods=['GET'])
 @token_required
+@cached(INNOVATION_PROJECTS_TABLE, STARTUPS_TABLE)
 def get_summary(current_user_id):
     """Get summary statistics for innovation and entrepreneurship."""
     if not _data_available():
         return jsonify({'message': 'Innovation tables are missing.'}), 500
 
-    conn = None
-    cur = None
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': 'Database connection failed.'}), 500
-        
-        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-        
-        # Total incubatees (all startups)
-        cur.execute(f"SELECT COUNT(*) as total FROM {STARTUPS_TABLE};")
-        total_incubatees = cur.fetchone()['total'] or 0
+        # Independent counts, run concurrently (see async_db).
+        incubatees, projects, from_iitpkd = async_db.fetch_all([
+            # Total incubatees (all startups)
+            (f"SELECT COUNT(*) as total FROM {STARTUPS_TABLE};", ()),
+            # Total innovation projects
+            (f"SELECT COUNT(*) as total FROM {INNOVATION_PROJECTS_TABLE};", ()),
+            # Startups from IIT Palakkad
+            (f"SELECT COUNT(*) as total FROM {STARTUPS_TABLE} WHERE is_from_iitpkd = TRUE;", ()),
+        ])
+        total_incubatees = incubatees[0]['total'] or 0
         
         # Total startups (same as incubatees, but for clarity)
         total_startups = total_incubatees
         
-        # Total innovation projects
-        cur.execute(f"SELECT COUNT(*) as total FROM {INNOVATION_PROJECTS_TABLE};")
-        total_innovation_projects = cur.fetchone()['total'] or 0
-        
-        # Startups from IIT Palakkad
-        cur.execute(
-            f"SELECT COUNT(*) as total FROM {STARTUPS_TABLE} WHERE is_from_iitpkd = TRUE;"
-        )
-        startups_from_iitpkd = cur.fetchone()['total'] or 0
+        total_innovation_projects = projects[0]['total'] or 0
+        startups_from_iitpkd = from_iitpkd[0]['total'] or 0
         
         return jsonify({
             'total_incubatees': total_incubatees,
@@ -156,55 +161,44 @@ def get_summary(current_user_id):
             'startups_from_iitpkd': startups_from_iitpkd
         }), 200
         
+    except async_db.ConnectionFailed:
+        return jsonify({'message': 'Database connection failed.'}), 500
     except Exception as e:
         print(f"Innovation summary error: {e}")
         return jsonify({'message': 'Failed to fetch summary statistics.'}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @innovation_bp.route('/yearly-growth', methods=['GET'])
 @token_required
+@cached(INNOVATION_PROJECTS_TABLE, STARTUPS_TABLE)
 def get_yearly_growth(current_user_id):
     """Get year-wise growth of incubatees and startups."""
     if not _data_available():
         return jsonify({'message': 'Innovation tables are missing.'}), 500
 
-    conn = None
-    cur = None
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': 'Database connection failed.'}), 500
-        
-        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-        
-        # Get year-wise counts for startups/incubatees
-        cur.execute(f"""
-            SELECT 
-                year_of_incubation as year,
-                COUNT(*) as incubatees,
-                COUNT(CASE WHEN status = 'Active' THEN 1 END) as active_startups,
-                COUNT(CASE WHEN is_from_iitpkd = TRUE THEN 1 END) as iitpkd_startups
-            FROM {STARTUPS_TABLE}
-            GROUP BY year_of_incubation
-            ORDER BY year_of_incubation ASC;
-        """)
-        startup_data = cur.fetchall()
-        
-        # Get year-wise counts for innovation projects
-        cur.execute(f"""
-            SELECT 
-                year_started as year,
-                COUNT(*) as projects
-            FROM {INNOVATION_PROJECTS_TABLE}
-            GROUP BY year_started
-            ORDER BY year_started ASC;
-        """)
-        project_data = cur.fetchall()
+        startup_data, project_data = async_db.fetch_all([
+            # Year-wise counts for startups/incubatees
+            (f"""
+                SELECT 
+                    year_of_incubation as year,
+                    COUNT(*) as incubatees,
+                    COUNT(CASE WHEN status = 'Active' THEN 1 END) as active_startups,
+                    COUNT(CASE WHEN is_from_iitpkd = TRUE THEN 1 END) as iitpkd_startups
+                FROM {STARTUPS_TABLE}
+                GROUP BY year_of_incubation
+                ORDER BY year_of_incubation ASC;
+            """, ()),
+            # Year-wise counts for innovation projects
+            (f"""
+                SELECT 
+                    year_started as year,
+                    COUNT(*) as projects
+                FROM {INNOVATION_PROJECTS_TABLE}
+                GROUP BY year_started
+                ORDER BY year_started ASC;
+            """, ()),
+        ])
         
         # Combine data by year
         year_data = {}
@@ -238,18 +232,16 @@ def get_yearly_growth(current_user_id):
         
         return jsonify({'data': result}), 200
         
+    except async_db.ConnectionFailed:
+        return jsonify({'message': 'Database connection failed.'}), 500
     except Exception as e:
         print(f"Innovation yearly growth error: {e}")
         return jsonify({'message': 'Failed to fetch yearly growth data.'}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @innovation_bp.route('/sector-distribution', methods=['GET'])
 @token_required
+@cached(INNOVATION_PROJECTS_TABLE, STARTUPS_TABLE)
 def get_sector_distribution(current_user_id):
     """Get sector-wise innovation distribution."""
     if not _data_available():
@@ -326,6 +318,7 @@ def get_sector_distribution(current_user_id):
 
 @innovation_bp.route('/startups', methods=['GET'])
 @token_required
+@cached(STARTUPS_TABLE)
 def get_startups(current_user_id):
     """Get list of startups with search and filter capabilities."""
     if not _data_available():
@@ -339,11 +332,7 @@ def get_startups(current_user_id):
         'search': request.args.get('search', '').strip()
     }
     
-    # Pagination
-    page = request.args.get('page', default=1, type=int)
-    per_page = request.args.get('per_page', default=50, type=int)
-    per_page = max(1, min(per_page, 100))
-    offset = (page - 1) * per_page
+    page_request = pagination.from_request(default_per_page=50, max_per_page=100)
 
     conn = None
     cur = None
@@ -373,21 +362,14 @@ def get_startups(current_user_id):
         if filters['iitpkd_only']:
             conditions.append("is_from_iitpkd = TRUE")
         
-        if filters['search']:
-            conditions.append(
-                "(startup_name ILIKE %s OR founder_name ILIKE %s OR innovation_focus_area ILIKE %s)"
-            )
-            search_pattern = f"%{filters['search']}%"
-            params.extend([search_pattern, search_pattern, search_pattern])
+        search_cond, search_params = search.condition(filters['search'], STARTUP_SEARCH_COLUMNS)
+        if search_cond:
+            conditions.append(search_cond)
+            params.extend(search_params)
+        rank, rank_params, rank_keys = search.rank_column(conn, filters['search'], STARTUP_SEARCH_COLUMNS)
         
         where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM {STARTUPS_TABLE} {where_clause};"
-        cur.execute(count_query, params)
-        total = cur.fetchone()['total'] or 0
-        
-        # Get startups
         query = f"""
             SELECT 
                 startup_id,
@@ -398,13 +380,13 @@ def get_startups(current_user_id):
                 status,
                 sector,
                 is_from_iitpkd
+                {rank}
             FROM {STARTUPS_TABLE}
             {where_clause}
-            ORDER BY year_of_incubation DESC, startup_name ASC
-            LIMIT %s OFFSET %s;
         """
-        cur.execute(query, params + [per_page, offset])
-        startups = cur.fetchall()
+        startups, page_info = pagination.fetch(
+            cur, query, rank_params + params, rank_keys + STARTUP_ORDER, [STARTUPS_TABLE], page_request
+        )
         
         result = []
         for row in startups:
@@ -419,16 +401,10 @@ def get_startups(current_user_id):
                 'is_from_iitpkd': bool(row['is_from_iitpkd'])
             })
         
-        return jsonify({
-            'data': result,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': (total + per_page - 1) // per_page
-            }
-        }), 200
+        return jsonify({'data': result, 'pagination': page_info}), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"Innovation startups list error: {e}")
         return jsonify({'message': 'Failed to fetch startups list.'}), 500
@@ -441,6 +417,7 @@ def get_startups(current_user_id):
 
 @innovation_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached(STARTUPS_TABLE)
 def get_filter_options(current_user_id):
     """Get filter options for startups and projects."""
     if not _data_available():
@@ -498,28 +475,21 @@ def get_filter_options(current_user_id):
 
 @innovation_bp.route('/iptif/summary', methods=['GET'])
 @token_required
+@cached(IPTIF_PROGRAM_TABLE, IPTIF_PROJECTS_TABLE, IPTIF_STARTUP_TABLE)
 def get_iptif_summary(current_user_id):
     """Get overall summary for IPTIF."""
     if not _iptif_data_available():
         return jsonify({'message': 'IPTIF tables are missing.'}), 500
 
-    conn = None
-    cur = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'message': 'Database connection failed.'}), 500
-        
-        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {IPTIF_PROJECTS_TABLE};")
-        total_projects = cur.fetchone()['total'] or 0
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {IPTIF_PROGRAM_TABLE};")
-        total_programs = cur.fetchone()['total'] or 0
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {IPTIF_STARTUP_TABLE};")
-        total_startups = cur.fetchone()['total'] or 0
+        projects, programs, startups = async_db.fetch_all([
+            (f"SELECT COUNT(*) as total FROM {IPTIF_PROJECTS_TABLE};", ()),
+            (f"SELECT COUNT(*) as total FROM {IPTIF_PROGRAM_TABLE};", ()),
+            (f"SELECT COUNT(*) as total FROM {IPTIF_STARTUP_TABLE};", ()),
+        ])
+        total_projects = projects[0]['total'] or 0
+        total_programs = programs[0]['total'] or 0
+        total_startups = startups[0]['total'] or 0
         
         return jsonify({
             'total_projects': total_projects,
@@ -527,29 +497,21 @@ def get_iptif_summary(current_user_id):
             'total_startups': total_startups
         }), 200
         
+    except async_db.ConnectionFailed:
+        return jsonify({'message': 'Database connection failed.'}), 500
     except Exception as e:
         print(f"IPTIF summary error: {e}")
         return jsonify({'message': 'Failed to fetch IPTIF summary statistics.'}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @innovation_bp.route('/iptif/trends/projects', methods=['GET'])
 @token_required
+@cached(IPTIF_PROJECTS_TABLE)
 def get_iptif_projects(current_user_id):
     """Get IPTIF projects trend and list."""
     if not _iptif_data_available():
         return jsonify({'message': 'IPTIF tables are missing.'}), 500
 
-    filters = {
-        'scheme': request.args.get('scheme'),
-        'status': request.args.get('status'),
-        'year': request.args.get('year')
-    }
-
     conn = None
     cur = None
     try:
@@ -559,19 +521,7 @@ def get_iptif_projects(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['scheme'] and filters['scheme'] != 'All':
-            conditions.append("scheme = %s")
-            params.append(filters['scheme'])
-        if filters['status'] and filters['status'] != 'All':
-            conditions.append("status = %s")
-            params.append(filters['status'])
-        if filters['year'] and filters['year'] != 'All':
-            conditions.append("EXTRACT(YEAR FROM start_date)::INT = %s")
-            params.append(int(filters['year']))
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(IPTIF_PROJECT_FILTERS, request.args)
         
         # Trend Data
         trend_query = f"""
@@ -584,17 +534,10 @@ def get_iptif_projects(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        # List Data
-        list_query = f"""
-            SELECT * FROM {IPTIF_PROJECTS_TABLE}
-            {where_clause}
-            ORDER BY start_date DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, IPTIF_PROJECTS_TABLE, where_clause, params, trend, IPTIF_PROJECT_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"IPTIF projects error: {e}")
         return jsonify({'message': 'Failed to fetch IPTIF projects data.'}), 500
@@ -607,16 +550,12 @@ def get_iptif_projects(current_user_id):
 
 @innovation_bp.route('/iptif/trends/programs', methods=['GET'])
 @token_required
+@cached(IPTIF_PROGRAM_TABLE)
 def get_iptif_programs(current_user_id):
     """Get IPTIF programs trend and list."""
     if not _iptif_data_available():
         return jsonify({'message': 'IPTIF tables are missing.'}), 500
 
-    filters = {
-        'type': request.args.get('type'),
-        'association': request.args.get('association')
-    }
-
     conn = None
     cur = None
     try:
@@ -626,16 +565,7 @@ def get_iptif_programs(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['type'] and filters['type'] != 'All':
-            conditions.append("type = %s")
-            params.append(filters['type'])
-        if filters['association'] and filters['association'] != 'All':
-            conditions.append("association = %s")
-            params.append(filters['association'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(IPTIF_PROGRAM_FILTERS, request.args)
         
         trend_query = f"""
             SELECT EXTRACT(YEAR FROM COALESCE(start_end, date))::INT as year, COUNT(*) as count
@@ -647,16 +577,10 @@ def get_iptif_programs(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        list_query = f"""
-            SELECT * FROM {IPTIF_PROGRAM_TABLE}
-            {where_clause}
-            ORDER BY COALESCE(start_end, date) DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, IPTIF_PROGRAM_TABLE, where_clause, params, trend, IPTIF_PROGRAM_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"IPTIF programs error: {e}")
         return jsonify({'message': 'Failed to fetch IPTIF programs data.'}), 500
@@ -669,16 +593,12 @@ def get_iptif_programs(current_user_id):
 
 @innovation_bp.route('/iptif/trends/startups', methods=['GET'])
 @token_required
+@cached(IPTIF_STARTUP_TABLE, STARTUPS_TABLE)
 def get_iptif_startups(current_user_id):
     """Get IPTIF startups trend and list."""
     if not _iptif_data_available():
         return jsonify({'message': 'IPTIF tables are missing.'}), 500
 
-    filters = {
-        'domain': request.args.get('domain'),
-        'status': request.args.get('status')
-    }
-
     conn = None
     cur = None
     try:
@@ -688,16 +608,7 @@ def get_iptif_startups(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['domain'] and filters['domain'] != 'All':
-            conditions.append("domain = %s")
-            params.append(filters['domain'])
-        if filters['status'] and filters['status'] != 'All':
-            conditions.append("status = %s")
-            params.append(filters['status'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(IPTIF_STARTUP_FILTERS, request.args)
         
         trend_query = f"""
             SELECT EXTRACT(YEAR FROM incubated_date)::INT as year, COUNT(*) as count
@@ -709,16 +620,10 @@ def get_iptif_startups(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        list_query = f"""
-            SELECT * FROM {IPTIF_STARTUP_TABLE}
-            {where_clause}
-            ORDER BY incubated_date DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, IPTIF_STARTUP_TABLE, where_clause, params, trend, IPTIF_STARTUP_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"IPTIF startups error: {e}")
         return jsonify({'message': 'Failed to fetch IPTIF startups data.'}), 500
@@ -731,15 +636,12 @@ def get_iptif_startups(current_user_id):
 
 @innovation_bp.route('/iptif/trends/facilities', methods=['GET'])
 @token_required
+@cached(IPTIF_FACILITIES_TABLE)
 def get_iptif_facilities_revenue(current_user_id):
     """Get IPTIF facilities revenue trend and list."""
     if not _iptif_data_available():
         return jsonify({'message': 'IPTIF tables are missing.'}), 500
 
-    filters = {
-        'facility_type': request.args.get('facility_type')
-    }
-
     conn = None
     cur = None
     try:
@@ -749,13 +651,7 @@ def get_iptif_facilities_revenue(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['facility_type'] and filters['facility_type'] != 'All':
-            conditions.append("facility_type = %s")
-            params.append(filters['facility_type'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(IPTIF_FACILITY_FILTERS, request.args)
         
         trend_query = f"""
             SELECT financial_year as year, SUM(revenue_made) as count
@@ -767,16 +663,10 @@ def get_iptif_facilities_revenue(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year'] is not None]
         
-        list_query = f"""
-            SELECT * FROM {IPTIF_FACILITIES_TABLE}
-            {where_clause}
-            ORDER BY financial_year DESC, facility_name ASC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, IPTIF_FACILITIES_TABLE, where_clause, params, trend, IPTIF_FACILITY_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"IPTIF facilities error: {e}")
         return jsonify({'message': 'Failed to fetch IPTIF facilities data.'}), 500
@@ -789,6 +679,7 @@ def get_iptif_facilities_revenue(current_user_id):
 
 @innovation_bp.route('/iptif/filter-options', methods=['GET'])
 @token_required
+@cached(IPTIF_FACILITIES_TABLE, IPTIF_PROGRAM_TABLE, IPTIF_PROJECTS_TABLE, IPTIF_STARTUP_TABLE, STARTUPS_TABLE)
 def get_iptif_filter_options(current_user_id):
     """Get filter options for all IPTIF tables."""
     if not _iptif_data_available():
@@ -862,40 +753,32 @@ def get_iptif_filter_options(current_user_id):
 
 @innovation_bp.route('/techin/summary', methods=['GET'])
 @token_required
+@cached(TECHIN_PROGRAM_TABLE, TECHIN_SKILL_DEV_TABLE, TECHIN_STARTUP_TABLE)
 def get_techin_summary(current_user_id):
     """Get overall summary for TechIn."""
     if not _techin_data_available():
         return jsonify({'message': 'TechIn tables are missing.'}), 500
 
-    conn = None
-    cur = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'message': 'Database connection failed.'}), 500
-        
-        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {TECHIN_PROGRAM_TABLE};")
-        total_programs = cur.fetchone()['total'] or 0
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {TECHIN_SKILL_DEV_TABLE};")
-        total_skill_dev_programs = cur.fetchone()['total'] or 0
-        
-        cur.execute(f"SELECT COUNT(*) as total FROM {TECHIN_STARTUP_TABLE};")
-        total_startups = cur.fetchone()['total'] or 0
-
-        # Revenue statistics from the techin_startup_table
-        cur.execute(f"""
-            SELECT 
-                COALESCE(SUM(revenue), 0) as total_revenue,
-                COALESCE(MAX(revenue), 0) as max_revenue,
-                COALESCE(MIN(revenue), 0) as min_revenue,
-                COALESCE(AVG(revenue), 0) as avg_revenue
-            FROM {TECHIN_STARTUP_TABLE} 
-            WHERE revenue IS NOT NULL;
-        """)
-        rev_stats = cur.fetchone()
+        programs, skill_dev, startups, revenue = async_db.fetch_all([
+            (f"SELECT COUNT(*) as total FROM {TECHIN_PROGRAM_TABLE};", ()),
+            (f"SELECT COUNT(*) as total FROM {TECHIN_SKILL_DEV_TABLE};", ()),
+            (f"SELECT COUNT(*) as total FROM {TECHIN_STARTUP_TABLE};", ()),
+            # Revenue statistics from the techin_startup_table
+            (f"""
+                SELECT 
+                    COALESCE(SUM(revenue), 0) as total_revenue,
+                    COALESCE(MAX(revenue), 0) as max_revenue,
+                    COALESCE(MIN(revenue), 0) as min_revenue,
+                    COALESCE(AVG(revenue), 0) as avg_revenue
+                FROM {TECHIN_STARTUP_TABLE} 
+                WHERE revenue IS NOT NULL;
+            """, ()),
+        ])
+        total_programs = programs[0]['total'] or 0
+        total_skill_dev_programs = skill_dev[0]['total'] or 0
+        total_startups = startups[0]['total'] or 0
+        rev_stats = revenue[0]
         
         return jsonify({
             'total_programs': total_programs,
@@ -907,28 +790,21 @@ def get_techin_summary(current_user_id):
             'average_revenue': float(rev_stats['avg_revenue'])
         }), 200
         
+    except async_db.ConnectionFailed:
+        return jsonify({'message': 'Database connection failed.'}), 500
     except Exception as e:
         print(f"TechIn summary error: {e}")
         return jsonify({'message': 'Failed to fetch TechIn summary statistics.'}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @innovation_bp.route('/techin/trends/programs', methods=['GET'])
 @token_required
+@cached(TECHIN_PROGRAM_TABLE)
 def get_techin_programs(current_user_id):
     """Get TechIn programs trend and list."""
     if not _techin_data_available():
         return jsonify({'message': 'TechIn tables are missing.'}), 500
 
-    filters = {
-        'type': request.args.get('type'),
-        'association': request.args.get('association')
-    }
-
     conn = None
     cur = None
     try:
@@ -938,16 +814,7 @@ def get_techin_programs(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['type'] and filters['type'] != 'All':
-            conditions.append("type = %s")
-            params.append(filters['type'])
-        if filters['association'] and filters['association'] != 'All':
-            conditions.append("association = %s")
-            params.append(filters['association'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(TECHIN_PROGRAM_FILTERS, request.args)
         
         trend_query = f"""
             SELECT EXTRACT(YEAR FROM COALESCE(start_end, event_date))::INT as year, COUNT(*) as count
@@ -959,16 +826,10 @@ def get_techin_programs(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        list_query = f"""
-            SELECT * FROM {TECHIN_PROGRAM_TABLE}
-            {where_clause}
-            ORDER BY COALESCE(start_end, event_date) DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, TECHIN_PROGRAM_TABLE, where_clause, params, trend, TECHIN_PROGRAM_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"TechIn programs error: {e}")
         return jsonify({'message': 'Failed to fetch TechIn programs data.'}), 500
@@ -981,16 +842,12 @@ def get_techin_programs(current_user_id):
 
 @innovation_bp.route('/techin/trends/skill-dev', methods=['GET'])
 @token_required
+@cached(TECHIN_SKILL_DEV_TABLE)
 def get_techin_skill_dev(current_user_id):
     """Get TechIn skill development trend and list."""
     if not _techin_data_available():
         return jsonify({'message': 'TechIn tables are missing.'}), 500
 
-    filters = {
-        'category': request.args.get('category'),
-        'association': request.args.get('association')
-    }
-
     conn = None
     cur = None
     try:
@@ -1000,16 +857,7 @@ def get_techin_skill_dev(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['category'] and filters['category'] != 'All':
-            conditions.append("category = %s")
-            params.append(filters['category'])
-        if filters['association'] and filters['association'] != 'All':
-            conditions.append("association = %s")
-            params.append(filters['association'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(TECHIN_SKILL_DEV_FILTERS, request.args)
         
         trend_query = f"""
             SELECT EXTRACT(YEAR FROM COALESCE(start_end, event_date))::INT as year, COUNT(*) as count
@@ -1021,16 +869,10 @@ def get_techin_skill_dev(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        list_query = f"""
-            SELECT * FROM {TECHIN_SKILL_DEV_TABLE}
-            {where_clause}
-            ORDER BY COALESCE(start_end, event_date) DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, TECHIN_SKILL_DEV_TABLE, where_clause, params, trend, TECHIN_SKILL_DEV_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"TechIn skill-dev error: {e}")
         return jsonify({'message': 'Failed to fetch TechIn skill development data.'}), 500
@@ -1043,16 +885,12 @@ def get_techin_skill_dev(current_user_id):
 
 @innovation_bp.route('/techin/trends/startups', methods=['GET'])
 @token_required
+@cached(TECHIN_STARTUP_TABLE, STARTUPS_TABLE)
 def get_techin_startups(current_user_id):
     """Get TechIn startups trend and list."""
     if not _techin_data_available():
         return jsonify({'message': 'TechIn tables are missing.'}), 500
 
-    filters = {
-        'domain': request.args.get('domain'),
-        'status': request.args.get('status')
-    }
-
     conn = None
     cur = None
     try:
@@ -1062,16 +900,7 @@ def get_techin_startups(current_user_id):
         
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
-        conditions = []
-        params = []
-        if filters['domain'] and filters['domain'] != 'All':
-            conditions.append("domain = %s")
-            params.append(filters['domain'])
-        if filters['status'] and filters['status'] != 'All':
-            conditions.append("status = %s")
-            params.append(filters['status'])
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        where_clause, params = build_where_clause(TECHIN_STARTUP_FILTERS, request.args)
         
         trend_query = f"""
             SELECT EXTRACT(YEAR FROM incubated_date)::INT as year, COUNT(*) as count
@@ -1083,16 +912,10 @@ def get_techin_startups(current_user_id):
         cur.execute(trend_query, params)
         trend = [dict(row) for row in cur.fetchall() if row['year']]
         
-        list_query = f"""
-            SELECT * FROM {TECHIN_STARTUP_TABLE}
-            {where_clause}
-            ORDER BY incubated_date DESC;
-        """
-        cur.execute(list_query, params)
-        data_list = [dict(row) for row in cur.fetchall()]
-        
-        return jsonify({'trend': trend, 'data': data_list}), 200
+        return _trend_list_response(cur, TECHIN_STARTUP_TABLE, where_clause, params, trend, TECHIN_STARTUP_ORDER)
         
+    except (pagination.InvalidCursor, streaming.InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"TechIn startups error: {e}")
         return jsonify({'message': 'Failed to fetch TechIn startups data.'}), 500
@@ -1105,6 +928,7 @@ def get_techin_startups(current_user_id):
 
 @innovation_bp.route('/techin/filter-options', methods=['GET'])
 @token_required
+@cached(TECHIN_PROGRAM_TABLE, TECHIN_SKILL_DEV_TABLE, TECHIN_STARTUP_TABLE, STARTUPS_TABLE)
 def get_techin_filter_options(current_user_id):
     """Get filter options for TechIn tables."""
     if not _techin_data_available():
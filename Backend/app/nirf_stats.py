@@ -1,9 +1,11 @@
 from flask import Blueprint, jsonify
 from .db import get_db_connection
+from .cache import cached
 
 nirf_bp = Blueprint('nirf', __name__)
 
 @nirf_bp.route('/nirf_metrics', methods=['GET'])
+@cached('nirf_ranking')
 def get_nirf_metrics():
     """Fetch NIRF ranking data for all years."""
     conn = None
@@ -0,0 +1,180 @@
+"""
+Column-oriented normalisation of uploaded CSV rows.
+
+Rows arrive as plain lists (see transforms.apply_transforms), are taken in
+chunks of CHUNK_ROWS and normalised one column at a time:
+
+- the CSV header → table column mapping is resolved once per upload;
+- blank cells become NULL;
+- yes/no style booleans, 'General' categories and the student_table
+  program/status spellings are rewritten once per distinct value
+  (pandas.factorize) and broadcast back to the column;
+- required columns and varchar lengths are validated per chunk, reporting the
+  first offending row exactly as the row-by-row loop did.
+
+Each chunk is yielded as a DataFrame of the insert columns plus the CSV data
+row number, ready for ingest.copy_rows().
+"""
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from .ingest import ROW_COLUMN, RowValidationError
+
+CHUNK_ROWS = 10000
+
+BOOL_COLS = {'pwd', 'is_active', 'is_from_iitpkd', 'pwd_exs',
+             'certification_earned', 'is_top_recruiter', 'isactive'}
+TRUE_VALUES = {'yes', 'y', 'true', '1'}
+FALSE_VALUES = {'no', 'n', 'false', '0'}
+
+
+def resolve_columns(csv_headers, columns):
+    """
+    Position of each table column in the CSV rows: the first header matching
+    case-insensitively (the last occurrence of that exact header, as the
+    former DictReader-based loop would have read it). None if absent.
+    """
+    positions = []
+    for col in columns:
+        header = next((h for h in csv_headers if h.lower() == col.lower()), None)
+        if header is None:
+            positions.append(None)
+        else:
+            positions.append(len(csv_headers) - 1 - csv_headers[::-1].index(header))
+    return positions
+
+
+def _value_rule(col, table_name):
+    """Normalisation of one non-blank value of ``col``, or None if it is kept as is."""
+    name = col.lower()
+    rules = []
+    if name in BOOL_COLS:
+        rules.append(lambda v, vs: 'TRUE' if vs.lower() in TRUE_VALUES else (
+                                   'FALSE' if vs.lower() in FALSE_VALUES else v))
+    if table_name == 'student_table' and name == 'program':
+        rules.append(lambda v, vs: vs.replace('.', ''))
+    if name == 'category':
+        rules.append(lambda v, vs: 'Gen' if vs.lower() == 'general' else v)
+    if table_name == 'student_table' and name == 'status':
+        rules.append(lambda v, vs: 'Ongoing' if vs.lower() == 'active' else v)
+    if not rules:
+        return None
+
+    def apply(v):
+        vs = v.strip()
+        for rule in rules:
+            v = rule(v, vs)
+        return v
+    return apply
+
+
+def _normalise_column(values, rule):
+    """
+    Blank → NULL plus the column's value rule, evaluated once per distinct
+    value (factorize is hash-based C code) and broadcast back to every row.
+    Returns (values, null mask, value lengths).
+    """
+    codes, uniques = pd.factorize(values)
+    n = len(uniques)
+    normalised = np.empty(n + 1, dtype=object)      # last slot (code -1): NULL
+    normalised[:n] = uniques if rule is None else [rule(u) for u in uniques]
+    blank = np.ones(n + 1, dtype=bool)
+    blank[:n] = np.fromiter((not u.strip() for u in uniques), dtype=bool, count=n)
+    normalised[blank] = None
+    lengths = np.zeros(n + 1, dtype=np.int64)
+    lengths[:n] = np.fromiter((len(str(v)) if v is not None else 0 for v in normalised[:n]),
+                              dtype=np.int64, count=n)
+    return normalised[codes], blank[codes], lengths[codes]
+
+
+def _first_row(masks, row_numbers):
+    """(row number, column) of the earliest True cell, columns in insert order."""
+    best = None
+    for col, mask in masks:
+        hits = np.flatnonzero(mask)
+        if len(hits) and (best is None or hits[0] < best[0]):
+            best = (hits[0], col)
+    return None if best is None else (int(row_numbers[best[0]]), best[1])
+
+
+def _length_error(frame, columns, table_name, row, col, max_len):
+    val = frame[col][row]
+    error_details = f"Value '{val}' (length {len(str(val))}) exceeds maximum length {max_len} for column '{col}' at row {row}."
+    print(f"\n{'='*80}")
+    print("VALIDATION ERROR - String Too Long")
+    print(f"{'='*80}")
+    print(f"Table: {table_name}")
+    print(f"Column: {col} (Max: {max_len})")
+    print(f"Value: '{val}' (Length: {len(str(val))})")
+    print(f"Row: {row}")
+    print(f"Full Row: {tuple(frame[c][row] for c in columns)}")
+    print(f"{'='*80}\n")
+    return RowValidationError({
+        'message': 'Data Truncation Error',
+        'details': error_details
+    })
+
+
+def _normalise_chunk(rows, first_row, positions, rules, columns, required_cols, col_max_lengths, table_name):
+    # Pad short rows (DictReader fills them with None), then transpose in C.
+    width = max((p for p in positions if p is not None), default=-1) + 1
+    if min(map(len, rows)) < width:
+        for row in rows:
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+    transposed = list(zip(*rows))
+    row_numbers = np.arange(first_row, first_row + len(rows))
+    no_values = np.full(len(rows), None, dtype=object)
+
+    values, nulls, lengths = {}, {}, {}
+    for col, pos, rule in zip(columns, positions, rules):
+        raw = np.array(transposed[pos], dtype=object) if pos is not None else no_values
+        values[col], nulls[col], lengths[col] = _normalise_column(raw, rule)
+
+    # Required values are checked on every row, length limits on non-empty rows.
+    non_empty = ~np.logical_and.reduce([nulls[c] for c in columns])
+    required = _first_row(
+        ((col, nulls[col]) for col in columns if col.lower() in required_cols), row_numbers
+    )
+    too_long = _first_row(
+        ((col, non_empty & (lengths[col] > col_max_lengths[col.lower()]))
+         for col in columns if col_max_lengths.get(col.lower()) is not None),
+        row_numbers,
+    )
+    if required is not None and (too_long is None or required[0] <= too_long[0]):
+        row, col = required
+        raise RowValidationError({'message': f"Row {row}: '{col}' cannot be empty."})
+    if too_long is not None:
+        row, col = too_long
+        frame = {c: dict(zip(row_numbers.tolist(), values[c])) for c in columns}
+        raise _length_error(frame, columns, table_name, row, col, col_max_lengths[col.lower()])
+
+    frame = pd.DataFrame({col: values[col][non_empty] for col in columns}, dtype=object)
+    frame[ROW_COLUMN] = row_numbers[non_empty]
+    return frame
+
+
+def iter_normalised_frames(rows, csv_headers, columns, required_cols, col_max_lengths,
+                           table_name, chunk_rows=CHUNK_ROWS):
+    """
+    Lazily yields normalised DataFrames of ``columns`` + the CSV data row
+    number from an iterator of row lists (blank lines already skipped),
+    skipping rows with no values. Raises RowValidationError on the first
+    missing required value or over-long string.
+    """
+    positions = resolve_columns(csv_headers, columns)
+    rules = [_value_rule(col, table_name) for col in columns]
+    rows = iter(rows)
+    first_row = 1
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        frame = _normalise_chunk(
+            chunk, first_row, positions, rules, columns, required_cols, col_max_lengths, table_name
+        )
+        first_row += len(chunk)
+        if len(frame):
+            yield frame
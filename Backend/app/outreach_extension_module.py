@@ -2,8 +2,10 @@
 from flask import Blueprint, jsonify, request
 from psycopg2 import extras
 
+from . import pagination, schema, search
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 
 outreach_extension_bp = Blueprint('outreach_extension', __name__)
@@ -11,43 +13,28 @@ outreach_extension_bp = Blueprint('outreach_extension', __name__)
 OPEN_HOUSE_TABLE = 'open_house'
 UBA_PROJECTS_TABLE = 'uba_projects'
 UBA_EVENTS_TABLE = 'uba_events'
+OPEN_HOUSE_SEARCH_COLUMNS = ('theme', 'target_audience', 'departments_participated')
+OUTREACH_SEARCH_COLUMNS = ('program_name',)
+OPEN_HOUSE_ORDER = [
+    pagination.Key('event_year', descending=True),
+    pagination.Key('event_date', descending=True),
+    pagination.Key('event_id'),
+]
 
 
 def _table_exists(conn, table_name: str) -> bool:
-    """Returns True if the given table exists in the public schema."""
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND LOWER(table_name) = LOWER(%s));",
-            (table_name,),
-        )
-        result = cur.fetchone()
-        return bool(result.get('exists', False) if isinstance(result, dict) else (result[0] if result else False))
-    except Exception:
-        return False
-    finally:
-        cur.close()
+    """Returns True if the given table exists in the public schema (served from the schema cache)."""
+    return schema.tables_available(table_name)
 
 
 def _data_available() -> bool:
     """Check if outreach extension tables exist."""
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        return (
-            _table_exists(conn, OPEN_HOUSE_TABLE) and
-            _table_exists(conn, UBA_PROJECTS_TABLE) and
-            _table_exists(conn, UBA_EVENTS_TABLE)
-        )
-    finally:
-        conn.close()
-
+    return schema.tables_available(OPEN_HOUSE_TABLE, UBA_PROJECTS_TABLE, UBA_EVENTS_TABLE)
 
 
 @outreach_extension_bp.route('/open-house/summary', methods=['GET'])
 @token_required
+@cached(OPEN_HOUSE_TABLE)
 def get_open_house_summary(current_user_id):
     """Get summary statistics for Open House events."""
     if not _data_available():
@@ -120,6 +107,7 @@ def get_open_house_summary(current_user_id):
 
 @outreach_extension_bp.route('/open-house/list', methods=['GET'])
 @token_required
+@cached(OPEN_HOUSE_TABLE)
 def get_open_house_list(current_user_id):
     """Get paginated list of Open House events with search and filter."""
     if not _data_available():
@@ -135,19 +123,19 @@ def get_open_house_list(current_user_id):
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        search = request.args.get('search', '', type=str).strip()
+        page_request = pagination.from_request(default_per_page=10, max_per_page=100)
+        search_term = request.args.get('search', '', type=str).strip()
         year_filter = request.args.get('year', type=int)
         
         # Build WHERE clause
         where_conditions = []
         params = []
         
-        if search:
-            where_conditions.append("(theme ILIKE %s OR target_audience ILIKE %s OR departments_participated ILIKE %s)")
-            search_pattern = f'%{search}%'
-            params.extend([search_pattern, search_pattern, search_pattern])
+        search_cond, search_params = search.condition(search_term, OPEN_HOUSE_SEARCH_COLUMNS)
+        if search_cond:
+            where_conditions.append(search_cond)
+            params.extend(search_params)
+        rank, rank_params, rank_keys = search.rank_column(conn, search_term, OPEN_HOUSE_SEARCH_COLUMNS)
         
         if year_filter:
             where_conditions.append("event_year = %s")
@@ -155,13 +143,6 @@ def get_open_house_list(current_user_id):
         
         where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM {OPEN_HOUSE_TABLE} {where_clause};"
-        cur.execute(count_query, params)
-        total = cur.fetchone()['total'] or 0
-        
-        # Get paginated data
-        offset = (page - 1) * per_page
         query = f"""
             SELECT 
                 event_id,
@@ -176,25 +157,23 @@ def get_open_house_list(current_user_id):
                 photos_url,
                 poster_url,
                 brochure_url
+                {rank}
             FROM {OPEN_HOUSE_TABLE}
             {where_clause}
-            ORDER BY event_year DESC, event_date DESC
-            LIMIT %s OFFSET %s;
         """
-        params.extend([per_page, offset])
-        cur.execute(query, params)
-        events = cur.fetchall()
+        events, page_info = pagination.fetch(
+            cur, query, rank_params + params, rank_keys + OPEN_HOUSE_ORDER, [OPEN_HOUSE_TABLE], page_request
+        )
+        events = [dict(event) for event in events]
+        for event in events:
+            event.pop('search_rank', None)
+        if 'total_pages' in page_info:
+            page_info['pages'] = page_info.pop('total_pages')
         
-        return jsonify({
-            'events': [dict(event) for event in events],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'pages': (total + per_page - 1) // per_page
-            }
-        }), 200
+        return jsonify({'events': events, 'pagination': page_info}), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"Open House list error: {e}")
         return jsonify({'message': 'Failed to fetch Open House events.'}), 500
@@ -207,6 +186,7 @@ def get_open_house_list(current_user_id):
 
 @outreach_extension_bp.route('/open-house/timeline', methods=['GET'])
 @token_required
+@cached(OPEN_HOUSE_TABLE)
 def get_open_house_timeline(current_user_id):
     """Get year-wise timeline data for Open House events."""
     if not _data_available():
@@ -250,6 +230,7 @@ def get_open_house_timeline(current_user_id):
 
 @outreach_extension_bp.route('/nptel/summary', methods=['GET'])
 @token_required
+@cached('nptel_courses')
 def get_nptel_summary(current_user_id):
     conn = None
     cur = None
@@ -275,6 +256,7 @@ def get_nptel_summary(current_user_id):
 
 @outreach_extension_bp.route('/nptel/trend', methods=['GET'])
 @token_required
+@cached('nptel_courses')
 def get_nptel_trend(current_user_id):
     conn = None
     cur = None
@@ -308,6 +290,7 @@ def get_nptel_trend(current_user_id):
 
 @outreach_extension_bp.route('/nptel/list', methods=['GET'])
 @token_required
+@cached('nptel_courses')
 def get_nptel_list(current_user_id):
     conn = None
     cur = None
@@ -344,6 +327,7 @@ def get_nptel_list(current_user_id):
 
 @outreach_extension_bp.route('/uba/summary', methods=['GET'])
 @token_required
+@cached(UBA_EVENTS_TABLE, UBA_PROJECTS_TABLE)
 def get_uba_summary(current_user_id):
     """Get summary statistics for UBA."""
     if not _data_available():
@@ -383,6 +367,7 @@ def get_uba_summary(current_user_id):
 
 @outreach_extension_bp.route('/uba/projects', methods=['GET'])
 @token_required
+@cached(UBA_EVENTS_TABLE, UBA_PROJECTS_TABLE)
 def get_uba_projects(current_user_id):
     """Get list of UBA projects with events."""
     if not _data_available():
@@ -431,6 +416,7 @@ def get_uba_projects(current_user_id):
 
 @outreach_extension_bp.route('/outreach/list', methods=['GET'])
 @token_required
+@cached('outreach')
 def get_outreach_list(current_user_id):
     """Get list of records from the outreach table, optionally filtered by program_name."""
     conn = None
@@ -446,11 +432,9 @@ def get_outreach_list(current_user_id):
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
 
         program_filter = request.args.get('program_name', '', type=str).strip()
-        where_clause = ''
-        params = []
-        if program_filter:
-            where_clause = 'WHERE program_name ILIKE %s'
-            params.append(f'%{program_filter}%')
+        search_cond, params = search.condition(program_filter, OUTREACH_SEARCH_COLUMNS)
+        where_clause = f'WHERE {search_cond}' if search_cond else ''
+        rank, rank_params = search.rank_order(conn, program_filter, OUTREACH_SEARCH_COLUMNS)
 
         cur.execute(f"""
             SELECT
@@ -466,8 +450,8 @@ def get_outreach_list(current_user_id):
                 extra_data
             FROM outreach
             {where_clause}
-            ORDER BY academic_year DESC, id ASC;
-        """, params)
+            ORDER BY {rank}academic_year DESC, id ASC;
+        """, params + rank_params)
 
         records = cur.fetchall()
         return jsonify({'records': [dict(r) for r in records]}), 200
@@ -484,6 +468,7 @@ def get_outreach_list(current_user_id):
 
 @outreach_extension_bp.route('/uba/events/<int:project_id>', methods=['GET'])
 @token_required
+@cached(UBA_EVENTS_TABLE)
 def get_uba_project_events(current_user_id, project_id):
     """Get events for a specific UBA project."""
     if not _data_available():
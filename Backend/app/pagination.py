@@ -0,0 +1,256 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+A list endpoint writes its query without ORDER BY / LIMIT, selecting every
+column it sorts on, and describes its order as a sequence of Key()s ending in
+a unique column. fetch() wraps the query, orders it and returns one page
+together with opaque ``next_cursor`` / ``prev_cursor`` tokens. A token holds
+the sort-key values of the last (first) row of the page, so the following
+page is read with ``WHERE <keys> after <values>`` and costs the same however
+deep it is, where ``OFFSET n`` reads and throws away n rows first. Tokens are
+bound to the query and filters they were issued for.
+
+Request arguments (see from_request()):
+    cursor    token from a previous response; takes precedence over ``page``
+    page      1-based page number, read with OFFSET (the dashboard's
+              numbered pages)
+    per_page  rows per page
+    count     'exact'     rows matching the filters, counted by the page query
+                          itself (no separate COUNT round trip) and then
+                          cached until the next upload to the tables read
+              'estimate'  the memoized exact count if there is one, else
+                          the planner's row estimate (no scan)
+              'none'      no total
+              Default: 'exact' for numbered pages, 'estimate' with a cursor.
+"""
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import request
+
+from . import cache
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+# Column carrying the exact total next to the page rows (dropped from them).
+TOTAL_COLUMN = 'pagination_total'
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that is malformed or was issued for other filters."""
+
+
+class Key(NamedTuple):
+    """A sort column of the list query; ``nulls_last`` None keeps PostgreSQL's default."""
+    column: str
+    descending: bool = False
+    nulls_last: Optional[bool] = None
+
+
+class PageRequest(NamedTuple):
+    per_page: int
+    page: int
+    cursor: Optional[str]
+    count: str
+
+
+def from_request(default_per_page: int = 50, max_per_page: int = 100,
+                 optional: bool = False) -> Optional[PageRequest]:
+    """
+    Reads the pagination arguments of the current request. With ``optional``
+    (lists that historically returned every row) None is returned unless
+    one of ``cursor``, ``page`` or ``per_page`` was given.
+    """
+    args = request.args
+    cursor = args.get('cursor', '').strip() or None
+    if optional and cursor is None and 'page' not in args and 'per_page' not in args:
+        return None
+    page = max(1, args.get('page', default=1, type=int))
+    per_page = max(1, min(args.get('per_page', default=default_per_page, type=int), max_per_page))
+    count = args.get('count', 'estimate' if cursor else 'exact')
+    if count not in COUNT_MODES:
+        count = 'estimate' if cursor else 'exact'
+    return PageRequest(per_page, page, cursor, count)
+
+
+def _nulls_last(key: Key, reverse: bool) -> bool:
+    nulls_last = not key.descending if key.nulls_last is None else key.nulls_last
+    return nulls_last != reverse
+
+
+def _order_by(keys: Sequence[Key], reverse: bool = False) -> str:
+    return ', '.join(
+        f"{key.column} {'DESC' if key.descending != reverse else 'ASC'} "
+        f"NULLS {'LAST' if _nulls_last(key, reverse) else 'FIRST'}"
+        for key in keys
+    )
+
+
+def _after(keys: Sequence[Key], values: Sequence[Any], reverse: bool) -> Tuple[str, List[Any]]:
+    """Condition selecting the rows that sort strictly after ``values``."""
+    branches: List[str] = []
+    params: List[Any] = []
+    equal: List[str] = []
+    equal_params: List[Any] = []
+    for key, value in zip(keys, values):
+        nulls_last = _nulls_last(key, reverse)
+        beyond, beyond_params = None, []
+        if value is None:
+            if not nulls_last:
+                beyond = f"{key.column} IS NOT NULL"
+        else:
+            op = '<' if key.descending != reverse else '>'
+            beyond = f"{key.column} {op} %s"
+            beyond_params = [value]
+            if nulls_last:
+                beyond = f"({beyond} OR {key.column} IS NULL)"
+        if beyond:
+            branches.append(' AND '.join(equal + [beyond]))
+            params.extend(equal_params + beyond_params)
+        if value is None:
+            equal.append(f"{key.column} IS NULL")
+        else:
+            equal.append(f"{key.column} = %s")
+            equal_params.append(value)
+    if not branches:
+        return 'FALSE', []
+    return '(' + ' OR '.join(f'({branch})' for branch in branches) + ')', params
+
+
+def ordered(query: str, keys: Sequence[Key]) -> str:
+    """``query`` ordered by ``keys``, unpaged (for lists streamed whole)."""
+    return f"SELECT * FROM ({query}) AS listed ORDER BY {_order_by(keys)}"
+
+
+def _signature(query: str, params: Sequence[Any], keys: Sequence[Key] = ()) -> str:
+    return hashlib.sha1(repr((query, list(params), list(keys))).encode('utf-8')).hexdigest()[:16]
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _encode(direction: str, row: Dict[str, Any], keys: Sequence[Key], signature: str) -> str:
+    values = [_json_value(row[key.column]) for key in keys]
+    raw = json.dumps([direction, values, signature], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode(token: str, keys: Sequence[Key], signature: str) -> Tuple[str, List[Any]]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, values, token_signature = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor.')
+    if token_signature != signature:
+        raise InvalidCursor('Cursor was issued for a different query or filters.')
+    if (direction not in ('next', 'prev') or not isinstance(values, list) or len(values) != len(keys)
+            or not all(v is None or isinstance(v, (str, int, float)) for v in values)):
+        raise InvalidCursor('Malformed cursor.')
+    return direction, values
+
+
+def _estimate(cur, query: str, params: List[Any]) -> int:
+    """The planner's row estimate for ``query`` (planned, not run)."""
+    cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM ({query}) AS listed", params)
+    plan = next(iter(cur.fetchone().values()))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def fetch(cur, query: str, params: Sequence[Any], keys: Sequence[Key], tables: Sequence[str],
+          page_request: Optional[PageRequest]) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Runs ``query`` ordered by ``keys`` and returns ``(rows, pagination)``.
+    ``tables`` are the tables the query reads (exact totals are memoized
+    against them). Without a page_request every row is returned and
+    pagination is None. Raises InvalidCursor for a bad ``cursor`` argument.
+    """
+    params = list(params)
+    if page_request is None:
+        cur.execute(ordered(query, keys), params)
+        return cur.fetchall(), None
+
+    per_page = page_request.per_page
+    signature = _signature(query, params, keys)
+    reverse = False
+    condition, condition_params = 'TRUE', []
+    offset = 0
+    if page_request.cursor:
+        direction, values = _decode(page_request.cursor, keys, signature)
+        reverse = direction == 'prev'
+        condition, condition_params = _after(keys, values, reverse)
+    else:
+        offset = (page_request.page - 1) * per_page
+
+    # Totals are cached per filter signature until the next upload to ``tables``.
+    total_key = ('pagination-total', _signature(query, params))
+    versions = cache.table_versions(tables)
+    total, estimated = None, False
+    if page_request.count != 'none':
+        total = cache.memoized(total_key, tables, versions)
+
+    # A total that is not cached yet comes back with the page itself:
+    # COUNT(*) OVER () on a numbered page, whose WHERE keeps every filtered
+    # row; a scalar COUNT(*) subquery on a cursor page, whose WHERE only
+    # keeps the rows after the cursor.
+    count_sql, count_params = '', []
+    if total is None and page_request.count == 'exact':
+        if page_request.cursor:
+            count_sql = f", (SELECT COUNT(*) FROM ({query}) AS counted) AS {TOTAL_COLUMN}"
+            count_params = params
+        else:
+            count_sql = f", COUNT(*) OVER () AS {TOTAL_COLUMN}"
+
+    # One row beyond the page tells whether there is another one.
+    cur.execute(
+        f"""
+        SELECT listed.*{count_sql} FROM ({query}) AS listed
+        WHERE {condition}
+        ORDER BY {_order_by(keys, reverse)}
+        LIMIT %s OFFSET %s
+        """,
+        count_params + params + condition_params + [per_page + 1, offset]
+    )
+    rows = cur.fetchall()
+    if count_sql:
+        if rows:
+            total = rows[0][TOTAL_COLUMN]
+            for row in rows:
+                del row[TOTAL_COLUMN]
+        elif offset == 0 and not page_request.cursor:
+            total = 0
+        else:
+            # Past the last row, so no row carried the total.
+            cur.execute(f"SELECT COUNT(*) AS total FROM ({query}) AS listed", params)
+            total = cur.fetchone()['total']
+        cache.remember(total_key, tables, versions, total)
+    elif total is None and page_request.count == 'estimate':
+        total, estimated = _estimate(cur, query, params), True
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+        has_next, has_prev = True, more
+    else:
+        has_next, has_prev = more, bool(page_request.cursor) or offset > 0
+
+    pagination = {
+        'per_page': per_page,
+        'total': total,
+        'total_is_estimate': estimated,
+        'next_cursor': _encode('next', rows[-1], keys, signature) if rows and has_next else None,
+        'prev_cursor': _encode('prev', rows[0], keys, signature) if rows and has_prev else None,
+    }
+    if not page_request.cursor:
+        pagination['page'] = page_request.page
+        pagination['total_pages'] = (total + per_page - 1) // per_page if total is not None else None
+    return rows, pagination
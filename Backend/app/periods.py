@@ -0,0 +1,46 @@
+"""
+Latest reporting period of a dashboard ("the latest admission year", ...).
+
+Dashboards default their year filter to the newest period in the data.
+latest() answers from a memo kept until the next upload of the period's
+table (see cache.memoize / cache.invalidate), instead of running MAX() on
+every request.
+"""
+from typing import Any, NamedTuple, Optional, Sequence
+
+from .cache import memoize
+
+
+class Period(NamedTuple):
+    """Table and column a dashboard's reporting period is read from."""
+    table: str
+    column: str
+
+
+ADMISSION_YEAR = Period('student_table', 'admission_year')
+PLACEMENT_YEAR = Period('placement_summary', 'placement_year')
+PUBLICATION_YEAR = Period('research_publications', 'publication_year')
+
+
+def _fetch(conn, period: Period, where_clause: str, params: Sequence[Any]):
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT MAX({period.column}) AS latest FROM {period.table} {where_clause}", list(params))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    # Wrapped in a tuple: memoize() does not keep None, and "no data" is an answer too.
+    return (row['latest'] if row else None,)
+
+
+def latest(conn, period: Period, where_clause: str = '', params: Sequence[Any] = ()) -> Optional[Any]:
+    """
+    Newest value of ``period.column``, among the rows matching
+    ``where_clause`` if given; None when there are none.
+    """
+    params = tuple(params)
+    return memoize(
+        ('latest-period', period, where_clause, params),
+        [period.table],
+        lambda: _fetch(conn, period, where_clause, params),
+    )[0]
@@ -7,8 +7,10 @@ from typing import Any, Dict, Iterable, List, Sequence, Tuple
 from flask import Blueprint, jsonify, request
 from psycopg2.errors import UndefinedTable
 
+from . import aggregates, periods, schema
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
 
 placement_bp = Blueprint('placement', __name__)
 
@@ -16,6 +18,13 @@ PLACEMENT_SUMMARY_TABLE = 'placement_summary'
 PLACEMENT_COMPANY_TABLE = 'placement_companies'
 PLACEMENT_PACKAGES_TABLE = 'placement_packages'
 
+# The summary, trends and breakdowns read placement_cube (see aggregates.py):
+# placement_summary rows joined with the package figures of their year and
+# program. Counts come from the summary rows (registered IS NOT NULL),
+# package statistics from one row per placement_packages row (package_row).
+SUMMARY_ROWS = 'registered IS NOT NULL'
+PACKAGE_ROWS = 'package_row'
+
 PROGRAM_CATEGORY_MAP = {
     'BTech': 'UG',
     'MTech': 'PG',
@@ -30,41 +39,14 @@ def map_program_to_category(program: str) -> str:
 
 
 def table_exists(table_name: str) -> bool:
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            return False
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND table_name = %s
-            ) AS exists_flag;
-            """,
-            (table_name,)
-        )
-        row = cur.fetchone()
-        return bool(row and row.get('exists_flag'))
-    except Exception as exc:  # pragma: no cover - defensive logging
-        print(f"Placement stats table check failed for {table_name}: {exc}")
-        return False
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    return schema.tables_available(table_name)
 
 
 def placement_data_available() -> bool:
     return table_exists(PLACEMENT_SUMMARY_TABLE)
 
 
-def build_where_clause(mapping: Dict[str, str], filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+def build_conditions(mapping: Dict[str, str], filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
     conditions: List[str] = []
     params: List[Any] = []
 
@@ -81,7 +63,15 @@ def build_where_clause(mapping: Dict[str, str], filters: Dict[str, Any]) -> Tupl
         else:
             conditions.append(f"{column} = %s")
             params.append(value)
+    return conditions, params
+
 
+def build_where_clause(
+    mapping: Dict[str, str], filters: Dict[str, Any], required: Sequence[str] = ()
+) -> Tuple[str, List[Any]]:
+    """WHERE clause for the filters in ``mapping``, ANDed with the ``required`` conditions."""
+    conditions, params = build_conditions(mapping, filters)
+    conditions = list(required) + conditions
     clause = ''
     if conditions:
         clause = 'WHERE ' + ' AND '.join(conditions)
@@ -96,6 +86,7 @@ def safe_percentage(numerator: float, denominator: float) -> float:
 
 @placement_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached(PLACEMENT_COMPANY_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_filter_options(current_user_id):
     if not placement_data_available():
         return jsonify({
@@ -129,7 +120,8 @@ def get_filter_options(current_user_id):
             'years': row.get('years') or [],
             'programs': row.get('programs') or [],
             'genders': row.get('genders') or [],
-            'sectors': row.get('sectors') or []
+            'sectors': row.get('sectors') or [],
+            'latest_year': periods.latest(conn, periods.PLACEMENT_YEAR)
         }), 200
     except UndefinedTable:
         return jsonify({
@@ -149,6 +141,7 @@ def get_filter_options(current_user_id):
 
 @placement_bp.route('/summary', methods=['GET'])
 @token_required
+@cached(PLACEMENT_PACKAGES_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_placement_summary(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -160,9 +153,12 @@ def get_placement_summary(current_user_id):
     }
 
     where_clause, params = build_where_clause(
-        {'year': 'placement_year', 'program': 'program', 'gender': 'gender'},
+        {'year': 'placement_year', 'program': 'program'},
         filters
     )
+    # Packages are not recorded per gender: the gender filter narrows the counts only.
+    gender_conditions, gender_params = build_conditions({'gender': 'gender'}, filters)
+    counted = ' AND '.join([SUMMARY_ROWS] + gender_conditions)
 
     conn = None
     cur = None
@@ -170,38 +166,31 @@ def get_placement_summary(current_user_id):
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed.'}), 500
+        src = aggregates.source(conn, aggregates.PLACEMENT_CUBE)
         cur = conn.cursor()
         cur.execute(
             f"""
-            SELECT SUM(registered) AS registered, SUM(placed) AS placed
-            FROM {PLACEMENT_SUMMARY_TABLE}
+            SELECT
+                SUM(registered) FILTER (WHERE {counted}) AS registered,
+                SUM(placed) FILTER (WHERE {counted}) AS placed,
+                MAX(highest_package) FILTER (WHERE {PACKAGE_ROWS}) AS highest_package,
+                MIN(lowest_package) FILTER (WHERE {PACKAGE_ROWS}) AS lowest_package,
+                AVG(average_package) FILTER (WHERE {PACKAGE_ROWS}) AS average_package
+            FROM {src.relation}
             {where_clause}
             """,
-            params
+            gender_params * 2 + params
         )
-        row = cur.fetchone() or {'registered': 0, 'placed': 0}
+        row = cur.fetchone() or {}
         total_registered = row.get('registered') or 0
         total_placed = row.get('placed') or 0
-
-        cur.execute(
-            f"""
-            SELECT
-                MAX(highest_package) AS highest_package,
-                MIN(lowest_package) AS lowest_package,
-                AVG(average_package) AS average_package
-            FROM {PLACEMENT_PACKAGES_TABLE}
-            {where_clause}
-            """,
-            params
-        )
-        package_row = cur.fetchone() or {}
         summary = {
             'registered': int(total_registered),
             'placed': int(total_placed),
             'placement_percentage': safe_percentage(total_placed, total_registered),
-            'highest_package': package_row.get('highest_package'),
-            'lowest_package': package_row.get('lowest_package'),
-            'average_package': package_row.get('average_package'),
+            'highest_package': row.get('highest_package'),
+            'lowest_package': row.get('lowest_package'),
+            'average_package': row.get('average_package'),
         }
         return jsonify({'data': summary}), 200
     except UndefinedTable:
@@ -218,6 +207,7 @@ def get_placement_summary(current_user_id):
 
 @placement_bp.route('/percentage-trend', methods=['GET'])
 @token_required
+@cached(PLACEMENT_PACKAGES_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_percentage_trend(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -228,7 +218,8 @@ def get_percentage_trend(current_user_id):
     }
     where_clause, params = build_where_clause(
         {'program': 'program', 'gender': 'gender'},
-        filters
+        filters,
+        required=[SUMMARY_ROWS]
     )
 
     conn = None
@@ -237,14 +228,17 @@ def get_percentage_trend(current_user_id):
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed.'}), 500
+        src = aggregates.source(conn, aggregates.PLACEMENT_CUBE)
         cur = conn.cursor()
+        # Summary years are integers; the cube keeps them as text.
         cur.execute(
             f"""
-            SELECT placement_year, SUM(registered) AS registered, SUM(placed) AS placed
-            FROM {PLACEMENT_SUMMARY_TABLE}
+            SELECT placement_year::integer AS placement_year,
+                   SUM(registered) AS registered, SUM(placed) AS placed
+            FROM {src.relation}
             {where_clause}
             GROUP BY placement_year
-            ORDER BY placement_year
+            ORDER BY placement_year::integer
             """,
             params
         )
@@ -274,6 +268,7 @@ def get_percentage_trend(current_user_id):
 
 @placement_bp.route('/gender-breakdown', methods=['GET'])
 @token_required
+@cached(PLACEMENT_PACKAGES_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_gender_breakdown(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -284,7 +279,8 @@ def get_gender_breakdown(current_user_id):
     }
     where_clause, params = build_where_clause(
         {'year': 'placement_year', 'program': 'program'},
-        filters
+        filters,
+        required=[SUMMARY_ROWS]
     )
 
     conn = None
@@ -293,11 +289,12 @@ def get_gender_breakdown(current_user_id):
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed.'}), 500
+        src = aggregates.source(conn, aggregates.PLACEMENT_CUBE)
         cur = conn.cursor()
         cur.execute(
             f"""
             SELECT gender, SUM(registered) AS registered, SUM(placed) AS placed
-            FROM {PLACEMENT_SUMMARY_TABLE}
+            FROM {src.relation}
             {where_clause}
             GROUP BY gender
             ORDER BY gender
@@ -330,6 +327,7 @@ def get_gender_breakdown(current_user_id):
 
 @placement_bp.route('/program-status', methods=['GET'])
 @token_required
+@cached(PLACEMENT_PACKAGES_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_program_status(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -340,7 +338,8 @@ def get_program_status(current_user_id):
     }
     where_clause, params = build_where_clause(
         {'year': 'placement_year', 'gender': 'gender'},
-        filters
+        filters,
+        required=[SUMMARY_ROWS]
     )
 
     conn = None
@@ -349,11 +348,12 @@ def get_program_status(current_user_id):
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed.'}), 500
+        src = aggregates.source(conn, aggregates.PLACEMENT_CUBE)
         cur = conn.cursor()
         cur.execute(
             f"""
             SELECT program, SUM(registered) AS registered, SUM(placed) AS placed
-            FROM {PLACEMENT_SUMMARY_TABLE}
+            FROM {src.relation}
             {where_clause}
             GROUP BY program
             ORDER BY program
@@ -361,15 +361,15 @@ def get_program_status(current_user_id):
             params
         )
         rows = cur.fetchall() or []
-        aggregates: Dict[str, Dict[str, float]] = defaultdict(lambda: {'registered': 0, 'placed': 0})
+        by_category: Dict[str, Dict[str, float]] = defaultdict(lambda: {'registered': 0, 'placed': 0})
         for row in rows:
             program = row.get('program')
             category = map_program_to_category(program)
-            aggregates[category]['registered'] += row.get('registered') or 0
-            aggregates[category]['placed'] += row.get('placed') or 0
+            by_category[category]['registered'] += row.get('registered') or 0
+            by_category[category]['placed'] += row.get('placed') or 0
 
         data = []
-        for category, values in aggregates.items():
+        for category, values in by_category.items():
             registered = values['registered']
             placed = values['placed']
             data.append({
@@ -397,6 +397,7 @@ def get_program_status(current_user_id):
 
 @placement_bp.route('/recruiters', methods=['GET'])
 @token_required
+@cached(PLACEMENT_COMPANY_TABLE)
 def get_recruiter_counts(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -450,6 +451,7 @@ def get_recruiter_counts(current_user_id):
 
 @placement_bp.route('/sector-distribution', methods=['GET'])
 @token_required
+@cached(PLACEMENT_COMPANY_TABLE)
 def get_sector_distribution(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -504,6 +506,7 @@ def get_sector_distribution(current_user_id):
 
 @placement_bp.route('/package-trend', methods=['GET'])
 @token_required
+@cached(PLACEMENT_PACKAGES_TABLE, PLACEMENT_SUMMARY_TABLE)
 def get_package_trend(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -513,7 +516,8 @@ def get_package_trend(current_user_id):
     }
     where_clause, params = build_where_clause(
         {'program': 'program'},
-        filters
+        filters,
+        required=[PACKAGE_ROWS]
     )
 
     conn = None
@@ -522,6 +526,7 @@ def get_package_trend(current_user_id):
         conn = get_db_connection()
         if conn is None:
             return jsonify({'message': 'Database connection failed.'}), 500
+        src = aggregates.source(conn, aggregates.PLACEMENT_CUBE)
         cur = conn.cursor()
         cur.execute(
             f"""
@@ -529,7 +534,7 @@ def get_package_trend(current_user_id):
                    MAX(highest_package) AS highest_package,
                    MIN(lowest_package) AS lowest_package,
                    AVG(average_package) AS average_package
-            FROM {PLACEMENT_PACKAGES_TABLE}
+            FROM {src.relation}
             {where_clause}
             GROUP BY placement_year
             ORDER BY placement_year
@@ -560,6 +565,7 @@ def get_package_trend(current_user_id):
 
 @placement_bp.route('/top-recruiters', methods=['GET'])
 @token_required
+@cached(PLACEMENT_COMPANY_TABLE)
 def get_top_recruiters(current_user_id):
     if not placement_data_available():
         return jsonify({'message': 'Placement tables are missing.'}), 500
@@ -11,37 +11,49 @@ from typing import Any, Dict, List, Optional, Tuple
 from flask import Blueprint, jsonify, request
 from psycopg2 import extras
 
+from . import aggregates, pagination, periods, schema, search
 from .auth import token_required
 from .db import get_db_connection
+from .cache import cached
+from .filter_options import Dimension, distinct_values
 
 
 research_bp = Blueprint('research_module', __name__)
 
+# Year a funded/consultancy project is reported under.
+PROJECT_YEAR_EXPR = 'EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT'
+
+PATENT_SEARCH_COLUMNS = ('patent_title', 'inventor1', 'inventor2', 'inventor3', 'inventor4')
+PUBLICATION_SEARCH_COLUMNS = ('publication_title', 'journal_name', 'faculty_name')
+
+# Sort keys of the list endpoints (the last one is unique). The lists return
+# every row unless the client asks for a page (see pagination.from_request).
+PROJECT_ORDER = [
+    pagination.Key('sort_date', descending=True, nulls_last=True),
+    pagination.Key('project_title', descending=True, nulls_last=True),
+    pagination.Key('project_type'),
+    pagination.Key('project_id'),
+]
+PATENT_ORDER = [
+    pagination.Key('sort_date', descending=True, nulls_last=True),
+    pagination.Key('patent_title'),
+    pagination.Key('patent_id'),
+]
+PUBLICATION_ORDER = [
+    pagination.Key('publication_year', descending=True),
+    pagination.Key('publication_title'),
+]
+
 
 def _table_exists(conn, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND LOWER(table_name) = LOWER(%s)
-            )
-            """,
-            (table_name,),
-        )
-        result = cur.fetchone()
-        # Handle both tuple and dict cursors
-        if isinstance(result, dict):
-            return bool(result.get('exists', False))
-        return bool(result[0] if result else False)
-    except Exception:
-        return False
-    finally:
-        cur.close()
+    """Check if a table exists in the database (served from the schema cache)."""
+    return schema.tables_available(table_name)
+
+
+def _list_response(rows: List[Dict[str, Any]], page_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if page_info is None:
+        return {'data': rows}
+    return {'data': rows, 'pagination': page_info}
 
 
 def _decimal_to_float(value):
@@ -167,9 +179,9 @@ def _build_publication_filters(
 
 @research_bp.route('/filter-options', methods=['GET'])
 @token_required
+@cached('externship_info', 'icsr_consultancy_projects', 'icsr_sponsered_projects', 'research_mous', 'research_patents', 'research_publications')
 def get_filter_options(current_user_id):
     conn = None
-    cur = None
     try:
         conn = get_db_connection()
         filters: Dict[str, List[Any]] = {
@@ -187,36 +199,25 @@ def get_filter_options(current_user_id):
             'externship_years': [],
         }
 
-        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-
         # Collect project departments from both icsr tables
         depts = set()
         years = set()
         statuses = set()
 
-        if _table_exists(conn, 'icsr_sponsered_projects'):
-            cur.execute(
-                "SELECT DISTINCT principal_investigator_department AS dept FROM icsr_sponsered_projects WHERE principal_investigator_department IS NOT NULL"
-            )
-            depts.update(row['dept'] for row in cur.fetchall())
-            cur.execute(
-                "SELECT DISTINCT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year FROM icsr_sponsered_projects WHERE start_date IS NOT NULL OR end_date IS NOT NULL"
-            )
-            years.update(int(row['year']) for row in cur.fetchall() if row['year'] is not None)
-            cur.execute("SELECT DISTINCT status FROM icsr_sponsered_projects WHERE status IS NOT NULL")
-            statuses.update(row['status'] for row in cur.fetchall())
-
-        if _table_exists(conn, 'icsr_consultancy_projects'):
-            cur.execute(
-                "SELECT DISTINCT department AS dept FROM icsr_consultancy_projects WHERE department IS NOT NULL"
-            )
-            depts.update(row['dept'] for row in cur.fetchall())
-            cur.execute(
-                "SELECT DISTINCT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year FROM icsr_consultancy_projects WHERE start_date IS NOT NULL OR end_date IS NOT NULL"
-            )
-            years.update(int(row['year']) for row in cur.fetchall() if row['year'] is not None)
-            cur.execute("SELECT DISTINCT status FROM icsr_consultancy_projects WHERE status IS NOT NULL")
-            statuses.update(row['status'] for row in cur.fetchall())
+        for table, dept_column in (
+            ('icsr_sponsered_projects', 'principal_investigator_department'),
+            ('icsr_consultancy_projects', 'department'),
+        ):
+            if not _table_exists(conn, table):
+                continue
+            options = distinct_values(conn, table, (
+                Dimension('departments', dept_column),
+                Dimension('years', PROJECT_YEAR_EXPR),
+                Dimension('statuses', 'status'),
+            ))
+            depts.update(options['departments'])
+            years.update(int(year) for year in options['years'])
+            statuses.update(options['statuses'])
 
         filters['project_departments'] = sorted(depts)
         filters['project_years'] = sorted(years, reverse=True)
@@ -225,72 +226,169 @@ def get_filter_options(current_user_id):
         filters['externship_departments'] = filters['project_departments']
 
         if _table_exists(conn, 'research_mous'):
-            cur.execute(
-                """
-                SELECT DISTINCT EXTRACT(YEAR FROM date_signed)::INT AS year
-                FROM research_mous
-                ORDER BY year DESC
-                """
-            )
-            filters['mou_years'] = [int(row['year']) for row in cur.fetchall() if row['year'] is not None]
+            options = distinct_values(conn, 'research_mous', (
+                Dimension('years', 'EXTRACT(YEAR FROM date_signed)::INT', 'DESC'),
+            ))
+            filters['mou_years'] = [int(year) for year in options['years']]
 
         if _table_exists(conn, 'research_patents'):
-            cur.execute(
-                """
-                SELECT DISTINCT EXTRACT(YEAR FROM COALESCE(grant_date::date, filing_date))::INT AS year
-                FROM research_patents
-                WHERE filing_date IS NOT NULL OR grant_date IS NOT NULL
-                ORDER BY year DESC
-                """
-            )
-            filters['patent_years'] = [int(row['year']) for row in cur.fetchall() if row['year'] is not None]
-
-            cur.execute(
-                "SELECT DISTINCT patent_status FROM research_patents ORDER BY patent_status"
-            )
-            filters['patent_statuses'] = [row['patent_status'] for row in cur.fetchall()]
+            options = distinct_values(conn, 'research_patents', (
+                Dimension('years', 'EXTRACT(YEAR FROM COALESCE(grant_date::date, filing_date))::INT', 'DESC'),
+                Dimension('statuses', 'patent_status', include_null=True),
+            ))
+            filters['patent_years'] = [int(year) for year in options['years']]
+            filters['patent_statuses'] = list(options['statuses'])
 
         if _table_exists(conn, 'research_publications'):
-            cur.execute(
-                "SELECT DISTINCT department FROM research_publications WHERE department IS NOT NULL ORDER BY department"
-            )
-            filters['publication_departments'] = [row['department'] for row in cur.fetchall()]
-
-            cur.execute(
-                "SELECT DISTINCT publication_year FROM research_publications ORDER BY publication_year DESC"
-            )
-            filters['publication_years'] = [
-                int(row['publication_year']) for row in cur.fetchall() if row['publication_year'] is not None
-            ]
-
-            cur.execute(
-                "SELECT DISTINCT publication_type FROM research_publications ORDER BY publication_type"
-            )
-            filters['publication_types'] = [row['publication_type'] for row in cur.fetchall()]
+            options = distinct_values(conn, 'research_publications', (
+                Dimension('departments', 'department'),
+                Dimension('years', 'publication_year', 'DESC'),
+                Dimension('types', 'publication_type', include_null=True),
+            ))
+            filters['publication_departments'] = list(options['departments'])
+            filters['publication_years'] = [int(year) for year in options['years']]
+            filters['publication_types'] = list(options['types'])
 
         if _table_exists(conn, 'externship_info'):
-            cur.execute(
-                """
-                SELECT DISTINCT EXTRACT(YEAR FROM startdate)::INT AS year
-                FROM externship_info
-                WHERE startdate IS NOT NULL
-                ORDER BY year DESC
-                """
-            )
-            filters['externship_years'] = [int(row['year']) for row in cur.fetchall() if row['year'] is not None]
+            options = distinct_values(conn, 'externship_info', (
+                Dimension('years', 'EXTRACT(YEAR FROM startdate)::INT', 'DESC'),
+            ))
+            filters['externship_years'] = [int(year) for year in options['years']]
 
         return jsonify(filters)
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch research filter options: {exc}'}), 500
     finally:
-        if cur:
-            cur.close()
         if conn:
             conn.close()
 
 
+# ---------------------------------------------------------------------------
+# ICSR overview: the summary cards, the project trend and the revenue trend
+# share their filters and come from one UNION ALL aggregate statement. Each
+# project table is grouped by GROUPING SETS ((), (year)), so its totals and
+# its yearly figures are read in the same scan.
+# ---------------------------------------------------------------------------
+
+# Overview source → (table, department column used by _build_project_filters)
+PROJECT_SOURCES = {
+    'funded': ('icsr_sponsered_projects', 'principal_investigator_department'),
+    'consultancy': ('icsr_consultancy_projects', 'department'),
+}
+OVERVIEW_TABLES = ('icsr_consultancy_projects', 'icsr_sponsered_projects', 'research_mous', 'research_patents')
+PATENT_STATUS_KEYS = ['Filed', 'Granted', 'Published']
+
+
+def _fetch_overview(cur, conn, department, project_year, status, sources) -> List[Dict[str, Any]]:
+    """
+    Aggregates of the requested overview ``sources`` ('funded', 'consultancy',
+    'mous', 'patents'; missing tables are skipped) in one statement. Rows:
+    ``source``, ``year`` (None on the ``overall`` rows), ``patent_status``,
+    ``total`` and ``amount``.
+    """
+    selects: List[str] = []
+    params: List[Any] = []
+
+    for source, (table, dept_column) in PROJECT_SOURCES.items():
+        if source not in sources or not _table_exists(conn, table):
+            continue
+        where_clause, where_params = _build_project_filters(department, project_year, status, dept_column=dept_column)
+        selects.append(f"""
+            SELECT '{source}' AS source, {PROJECT_YEAR_EXPR} AS year, NULL::TEXT AS patent_status,
+                   COUNT(*) AS total, COALESCE(SUM(amount_sanctioned), 0) AS amount,
+                   GROUPING({PROJECT_YEAR_EXPR}) = 1 AS overall
+            FROM {table}
+            {where_clause}
+            GROUP BY GROUPING SETS ((), ({PROJECT_YEAR_EXPR}))
+        """)
+        params.extend(where_params)
+
+    if 'mous' in sources and _table_exists(conn, 'research_mous'):
+        where_clause, where_params = _build_year_filter('date_signed', project_year)
+        selects.append(f"""
+            SELECT 'mous' AS source, NULL::INT AS year, NULL::TEXT AS patent_status,
+                   COUNT(*) AS total, 0::NUMERIC AS amount, TRUE AS overall
+            FROM research_mous
+            {where_clause}
+        """)
+        params.extend(where_params)
+
+    if 'patents' in sources and _table_exists(conn, 'research_patents'):
+        where_clause, where_params = _build_patent_filters(project_year, None)
+        selects.append(f"""
+            SELECT 'patents' AS source, NULL::INT AS year, patent_status::TEXT AS patent_status,
+                   COUNT(*) AS total, 0::NUMERIC AS amount, TRUE AS overall
+            FROM research_patents
+            {where_clause}
+            GROUP BY patent_status
+        """)
+        params.extend(where_params)
+
+    if not selects:
+        return []
+    cur.execute(' UNION ALL '.join(selects), params)
+    return cur.fetchall()
+
+
+def _summary_payload(rows, project_type) -> Dict[str, Any]:
+    counted = {'funded': 0, 'consultancy': 0, 'mous': 0}
+    consultancy_revenue = 0.0
+    patent_breakdown = {key: 0 for key in PATENT_STATUS_KEYS}
+    total_patents = 0
+    for row in rows:
+        if not row['overall']:
+            continue
+        if row['source'] == 'patents':
+            patent_breakdown[row['patent_status']] = row['total']
+            total_patents += row['total']
+        elif row['source'] in PROJECT_SOURCES and project_type not in (None, '', 'All', row['source'].title()):
+            continue
+        else:
+            counted[row['source']] = int(row['total'])
+            if row['source'] == 'consultancy':
+                consultancy_revenue = _decimal_to_float(row['amount'])
+
+    total_projects = counted['funded'] + counted['consultancy']
+    return {
+        'funded_projects': counted['funded'],
+        'consultancy_projects': counted['consultancy'],
+        'sanctioned_projects': total_projects,
+        'total_projects': total_projects,
+        'total_mous': counted['mous'],
+        'total_patents': total_patents,
+        'patent_breakdown': patent_breakdown,
+        'consultancy_revenue': consultancy_revenue,
+    }
+
+
+def _yearly_payload(rows, suffix, value, empty) -> List[Dict[str, Any]]:
+    """
+    ``{'year', 'funded<suffix>', 'consultancy<suffix>'}`` per year of the
+    project tables (projects without dates are left out): ``value(row)`` of
+    each yearly aggregate row, ``empty`` for a year a table has no row for.
+    """
+    yearly: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        if row['source'] not in PROJECT_SOURCES or row['overall'] or row['year'] is None:
+            continue
+        year = int(row['year'])
+        if year not in yearly:
+            yearly[year] = {'year': year, **{source + suffix: empty for source in PROJECT_SOURCES}}
+        yearly[year][row['source'] + suffix] = value(row)
+    return [yearly[year] for year in sorted(yearly)]
+
+
+def _project_trend_payload(rows):
+    return _yearly_payload(rows, '', lambda row: int(row['total']), 0)
+
+
+def _revenue_trend_payload(rows):
+    return _yearly_payload(rows, '_revenue', lambda row: _decimal_to_float(row['amount']), 0.0)
+
+
 @research_bp.route('/summary', methods=['GET'])
 @token_required
+@cached('icsr_consultancy_projects', 'icsr_sponsered_projects', 'research_mous', 'research_patents')
 def get_summary(current_user_id):
     conn = None
     cur = None
@@ -303,78 +401,12 @@ def get_summary(current_user_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
 
-        funded_total = 0
-        consultancy_total = 0
-        consultancy_revenue = 0.0
-        total_projects = 0
-
-        # Count funded (sponsored) projects
-        if _table_exists(conn, 'icsr_sponsered_projects') and project_type in (None, '', 'All', 'Funded'):
-            where_clause, params = _build_project_filters(
-                department, project_year, status, dept_column='principal_investigator_department'
-            )
-            cur.execute(
-                f"SELECT COUNT(*) AS total, COALESCE(SUM(amount_sanctioned), 0) AS amount FROM icsr_sponsered_projects {where_clause}",
-                params,
-            )
-            row = cur.fetchone()
-            funded_total = int(row['total'])
-            total_projects += funded_total
-
-        # Count consultancy projects
-        if _table_exists(conn, 'icsr_consultancy_projects') and project_type in (None, '', 'All', 'Consultancy'):
-            where_clause, params = _build_project_filters(
-                department, project_year, status, dept_column='department'
-            )
-            cur.execute(
-                f"SELECT COUNT(*) AS total, COALESCE(SUM(amount_sanctioned), 0) AS amount FROM icsr_consultancy_projects {where_clause}",
-                params,
-            )
-            row = cur.fetchone()
-            consultancy_total = int(row['total'])
-            consultancy_revenue = _decimal_to_float(row['amount'])
-            total_projects += consultancy_total
-
-        total_mous = 0
-        if _table_exists(conn, 'research_mous'):
-            mou_where, mou_params = _build_year_filter('date_signed', project_year)
-            cur.execute(
-                f"SELECT COUNT(*) AS total FROM research_mous {mou_where}",
-                mou_params,
-            )
-            total_mous = cur.fetchone()['total']
-
-        status_keys = ['Filed', 'Granted', 'Published']
-        patent_breakdown = {key: 0 for key in status_keys}
-        total_patents = 0
-        if _table_exists(conn, 'research_patents'):
-            patent_where, patent_params = _build_patent_filters(project_year, None)
-            cur.execute(
-                f"""
-                SELECT patent_status, COUNT(*) AS total
-                FROM research_patents
-                {patent_where}
-                GROUP BY patent_status
-                """,
-                patent_params,
-            )
-            for row in cur.fetchall():
-                status_value = row['patent_status']
-                count = row['total']
-                patent_breakdown[status_value] = count
-                total_patents += count
-
-        summary = {
-            'funded_projects': funded_total,
-            'consultancy_projects': consultancy_total,
-            'sanctioned_projects': total_projects,
-            'total_projects': total_projects,
-            'total_mous': total_mous,
-            'total_patents': total_patents,
-            'patent_breakdown': patent_breakdown,
-            'consultancy_revenue': consultancy_revenue,
-        }
-        return jsonify(summary)
+        sources = ['mous', 'patents'] + [
+            source for source in PROJECT_SOURCES
+            if project_type in (None, '', 'All', source.title())
+        ]
+        rows = _fetch_overview(cur, conn, department, project_year, status, sources)
+        return jsonify(_summary_payload(rows, project_type))
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch research summary: {exc}'}), 500
     finally:
@@ -386,6 +418,7 @@ def get_summary(current_user_id):
 
 @research_bp.route('/projects/trend', methods=['GET'])
 @token_required
+@cached('icsr_consultancy_projects', 'icsr_sponsered_projects')
 def funded_project_trend(current_user_id):
     """Return yearly project counts from both sponsored and consultancy tables."""
     conn = None
@@ -398,45 +431,46 @@ def funded_project_trend(current_user_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
 
-        yearly: Dict[int, Dict[str, int]] = defaultdict(lambda: {'funded': 0, 'consultancy': 0})
+        rows = _fetch_overview(cur, conn, department, project_year, status, PROJECT_SOURCES)
+        return jsonify({'data': _project_trend_payload(rows)}), 200
+    except Exception as exc:
+        return jsonify({'message': f'Failed to fetch project trend: {exc}'}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
 
-        # Sponsored (funded) projects
-        if _table_exists(conn, 'icsr_sponsered_projects'):
-            wc, p = _build_project_filters(department, project_year, status, dept_column='principal_investigator_department')
-            if wc:
-                wc += " AND COALESCE(start_date, end_date) IS NOT NULL"
-            else:
-                wc = "WHERE COALESCE(start_date, end_date) IS NOT NULL"
-            cur.execute(
-                f"SELECT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year, COUNT(*) AS total FROM icsr_sponsered_projects {wc} GROUP BY year",
-                p,
-            )
-            for row in cur.fetchall():
-                if row['year'] is not None:
-                    yearly[int(row['year'])]['funded'] = int(row['total'])
 
-        # Consultancy projects
-        if _table_exists(conn, 'icsr_consultancy_projects'):
-            wc, p = _build_project_filters(department, project_year, status, dept_column='department')
-            if wc:
-                wc += " AND COALESCE(start_date, end_date) IS NOT NULL"
-            else:
-                wc = "WHERE COALESCE(start_date, end_date) IS NOT NULL"
-            cur.execute(
-                f"SELECT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year, COUNT(*) AS total FROM icsr_consultancy_projects {wc} GROUP BY year",
-                p,
-            )
-            for row in cur.fetchall():
-                if row['year'] is not None:
-                    yearly[int(row['year'])]['consultancy'] = int(row['total'])
+@research_bp.route('/overview', methods=['GET'])
+@token_required
+@cached(*OVERVIEW_TABLES)
+def get_overview(current_user_id):
+    """
+    The ICSR overview in one round trip: what /summary, /projects/trend and
+    /consultancy/revenue-trend return for the same filters.
+    """
+    conn = None
+    cur = None
+    try:
+        department = request.args.get('department')
+        project_year = request.args.get('project_year')
+        status = request.args.get('status')
+        project_type = request.args.get('project_type')
 
-        data = [
-            {'year': y, 'funded': yearly[y]['funded'], 'consultancy': yearly[y]['consultancy']}
-            for y in sorted(yearly.keys())
-        ]
-        return jsonify({'data': data}), 200
+        conn = get_db_connection()
+        cur = conn.cursor(cursor_factory=extras.RealDictCursor)
+
+        rows = _fetch_overview(
+            cur, conn, department, project_year, status, list(PROJECT_SOURCES) + ['mous', 'patents']
+        )
+        return jsonify({
+            'summary': _summary_payload(rows, project_type),
+            'project_trend': _project_trend_payload(rows),
+            'revenue_trend': _revenue_trend_payload(rows),
+        }), 200
     except Exception as exc:
-        return jsonify({'message': f'Failed to fetch project trend: {exc}'}), 500
+        return jsonify({'message': f'Failed to fetch research overview: {exc}'}), 500
     finally:
         if cur:
             cur.close()
@@ -446,6 +480,7 @@ def funded_project_trend(current_user_id):
 
 @research_bp.route('/projects/list', methods=['GET'])
 @token_required
+@cached('icsr_consultancy_projects', 'icsr_sponsered_projects')
 def project_list(current_user_id):
     conn = None
     cur = None
@@ -454,78 +489,73 @@ def project_list(current_user_id):
         project_year = request.args.get('project_year')
         status = request.args.get('status')
         project_type = request.args.get('project_type')
+        page_request = pagination.from_request(optional=True)
 
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
-        rows = []
+        selects = []
+        params: List[Any] = []
 
-        # Fetch funded (sponsored) projects
+        # Funded (sponsored) projects
         if _table_exists(conn, 'icsr_sponsered_projects') and project_type in (None, '', 'All', 'Funded'):
-            where_clause, params = _build_project_filters(
+            where_clause, where_params = _build_project_filters(
                 department, project_year, status, dept_column='principal_investigator_department'
             )
-            cur.execute(
-                f"""
+            selects.append(f"""
                 SELECT project_id, project_title, principal_investigator,
                        principal_investigator_department AS department,
                        'Funded' AS project_type,
                        funding_agency, client_organization,
-                       amount_sanctioned, start_date, end_date, status
+                       amount_sanctioned, start_date, end_date, status,
+                       COALESCE(start_date, end_date) AS sort_date
                 FROM icsr_sponsered_projects
                 {where_clause}
-                """,
-                params,
-            )
-            for row in cur.fetchall():
-                rows.append({
-                    'project_id': row['project_id'],
-                    'project_title': row['project_title'],
-                    'principal_investigator': row['principal_investigator'],
-                    'department': row['department'],
-                    'project_type': row['project_type'],
-                    'funding_agency': row['funding_agency'],
-                    'client_organization': row['client_organization'],
-                    'amount_sanctioned': _decimal_to_float(row['amount_sanctioned']),
-                    'start_date': _serialize_date(row['start_date']),
-                    'end_date': _serialize_date(row['end_date']),
-                    'status': row['status'],
-                })
-
-        # Fetch consultancy projects
+            """)
+            params.extend(where_params)
+
+        # Consultancy projects
         if _table_exists(conn, 'icsr_consultancy_projects') and project_type in (None, '', 'All', 'Consultancy'):
-            where_clause, params = _build_project_filters(
+            where_clause, where_params = _build_project_filters(
                 department, project_year, status, dept_column='department'
             )
-            cur.execute(
-                f"""
+            selects.append(f"""
                 SELECT project_id, project_title, principal_investigator,
                        department,
                        'Consultancy' AS project_type,
                        funding_agency, client_organization,
-                       amount_sanctioned, start_date, end_date, status
+                       amount_sanctioned, start_date, end_date, status,
+                       COALESCE(start_date, end_date) AS sort_date
                 FROM icsr_consultancy_projects
                 {where_clause}
-                """,
-                params,
-            )
-            for row in cur.fetchall():
-                rows.append({
-                    'project_id': row['project_id'],
-                    'project_title': row['project_title'],
-                    'principal_investigator': row['principal_investigator'],
-                    'department': row['department'],
-                    'project_type': row['project_type'],
-                    'funding_agency': row['funding_agency'],
-                    'client_organization': row['client_organization'],
-                    'amount_sanctioned': _decimal_to_float(row['amount_sanctioned']),
-                    'start_date': _serialize_date(row['start_date']),
-                    'end_date': _serialize_date(row['end_date']),
-                    'status': row['status'],
-                })
-
-        # Sort combined results
-        rows.sort(key=lambda r: (r['start_date'] or r['end_date'] or '', r['project_title'] or ''), reverse=True)
-        return jsonify({'data': rows})
+            """)
+            params.extend(where_params)
+
+        if not selects:
+            return jsonify({'data': []})
+
+        # Both tables in one ordered query, newest first
+        fetched, page_info = pagination.fetch(
+            cur, ' UNION ALL '.join(selects), params, PROJECT_ORDER,
+            ['icsr_consultancy_projects', 'icsr_sponsered_projects'], page_request
+        )
+        rows = []
+        for row in fetched:
+            rows.append({
+                'project_id': row['project_id'],
+                'project_title': row['project_title'],
+                'principal_investigator': row['principal_investigator'],
+                'department': row['department'],
+                'project_type': row['project_type'],
+                'funding_agency': row['funding_agency'],
+                'client_organization': row['client_organization'],
+                'amount_sanctioned': _decimal_to_float(row['amount_sanctioned']),
+                'start_date': _serialize_date(row['start_date']),
+                'end_date': _serialize_date(row['end_date']),
+                'status': row['status'],
+            })
+        return jsonify(_list_response(rows, page_info))
+    except pagination.InvalidCursor as exc:
+        return jsonify({'message': str(exc)}), 400
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch projects: {exc}'}), 500
     finally:
@@ -537,6 +567,7 @@ def project_list(current_user_id):
 
 @research_bp.route('/consultancy/revenue-trend', methods=['GET'])
 @token_required
+@cached('icsr_consultancy_projects', 'icsr_sponsered_projects')
 def consultancy_revenue_trend(current_user_id):
     """Return yearly revenue from both sponsored and consultancy tables."""
     conn = None
@@ -549,43 +580,8 @@ def consultancy_revenue_trend(current_user_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
 
-        yearly: Dict[int, Dict[str, float]] = defaultdict(lambda: {'funded_revenue': 0.0, 'consultancy_revenue': 0.0})
-
-        # Sponsored (funded) revenue
-        if _table_exists(conn, 'icsr_sponsered_projects'):
-            wc, p = _build_project_filters(department, project_year, status, dept_column='principal_investigator_department')
-            if wc:
-                wc += " AND COALESCE(start_date, end_date) IS NOT NULL"
-            else:
-                wc = "WHERE COALESCE(start_date, end_date) IS NOT NULL"
-            cur.execute(
-                f"SELECT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year, COALESCE(SUM(amount_sanctioned), 0) AS revenue FROM icsr_sponsered_projects {wc} GROUP BY year",
-                p,
-            )
-            for row in cur.fetchall():
-                if row['year'] is not None:
-                    yearly[int(row['year'])]['funded_revenue'] = _decimal_to_float(row['revenue'])
-
-        # Consultancy revenue
-        if _table_exists(conn, 'icsr_consultancy_projects'):
-            wc, p = _build_project_filters(department, project_year, status, dept_column='department')
-            if wc:
-                wc += " AND COALESCE(start_date, end_date) IS NOT NULL"
-            else:
-                wc = "WHERE COALESCE(start_date, end_date) IS NOT NULL"
-            cur.execute(
-                f"SELECT EXTRACT(YEAR FROM COALESCE(start_date, end_date))::INT AS year, COALESCE(SUM(amount_sanctioned), 0) AS revenue FROM icsr_consultancy_projects {wc} GROUP BY year",
-                p,
-            )
-            for row in cur.fetchall():
-                if row['year'] is not None:
-                    yearly[int(row['year'])]['consultancy_revenue'] = _decimal_to_float(row['revenue'])
-
-        data = [
-            {'year': y, 'funded_revenue': yearly[y]['funded_revenue'], 'consultancy_revenue': yearly[y]['consultancy_revenue']}
-            for y in sorted(yearly.keys())
-        ]
-        return jsonify({'data': data}), 200
+        rows = _fetch_overview(cur, conn, department, project_year, status, PROJECT_SOURCES)
+        return jsonify({'data': _revenue_trend_payload(rows)}), 200
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch revenue trend: {exc}'}), 500
     finally:
@@ -597,6 +593,7 @@ def consultancy_revenue_trend(current_user_id):
 
 @research_bp.route('/mous/list', methods=['GET'])
 @token_required
+@cached('research_mous')
 def mou_list(current_user_id):
     conn = None
     cur = None
@@ -644,6 +641,7 @@ def mou_list(current_user_id):
 
 @research_bp.route('/mous/trend', methods=['GET'])
 @token_required
+@cached('research_mous')
 def mou_trend(current_user_id):
     conn = None
     cur = None
@@ -680,6 +678,7 @@ def mou_trend(current_user_id):
 
 @research_bp.route('/patents/stats', methods=['GET'])
 @token_required
+@cached('research_patents')
 def patent_stats(current_user_id):
     conn = None
     cur = None
@@ -740,12 +739,15 @@ def patent_stats(current_user_id):
 
 @research_bp.route('/patents/list', methods=['GET'])
 @token_required
+@cached('research_patents')
 def patent_list(current_user_id):
     conn = None
     cur = None
     try:
         patent_year = request.args.get('patent_year')
         patent_status = request.args.get('patent_status')
+        search_term = request.args.get('search', '', type=str)
+        page_request = pagination.from_request(optional=True)
 
         conn = get_db_connection()
         if not _table_exists(conn, 'research_patents'):
@@ -753,6 +755,8 @@ def patent_list(current_user_id):
 
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_patent_filters(patent_year, patent_status)
+        where_clause, params = search.add_condition(where_clause, params, search_term, PATENT_SEARCH_COLUMNS)
+        rank, rank_params, rank_keys = search.rank_column(conn, search_term, PATENT_SEARCH_COLUMNS)
 
         query = f"""
             SELECT patent_id,
@@ -764,14 +768,17 @@ def patent_list(current_user_id):
                    patent_status,
                    filing_date,
                    grant_date,
-                   remarks
+                   remarks,
+                   COALESCE(grant_date::date, filing_date) AS sort_date
+                   {rank}
             FROM research_patents
             {where_clause}
-            ORDER BY COALESCE(grant_date::date, filing_date) DESC NULLS LAST, patent_title
         """
-        cur.execute(query, params)
+        fetched, page_info = pagination.fetch(
+            cur, query, rank_params + params, rank_keys + PATENT_ORDER, ['research_patents'], page_request
+        )
         rows = []
-        for row in cur.fetchall():
+        for row in fetched:
             # Build a combined inventors string from individual inventor columns
             inventors_list = [row[f'inventor{i}'] for i in range(1, 5) if row.get(f'inventor{i}')]
             rows.append({
@@ -791,7 +798,9 @@ def patent_list(current_user_id):
                 'grant_date': _serialize_date(row['grant_date']),
                 'remarks': row['remarks'],
             })
-        return jsonify({'data': rows})
+        return jsonify(_list_response(rows, page_info))
+    except pagination.InvalidCursor as exc:
+        return jsonify({'message': str(exc)}), 400
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch patents: {exc}'}), 500
     finally:
@@ -803,6 +812,7 @@ def patent_list(current_user_id):
 
 @research_bp.route('/externships/summary', methods=['GET'])
 @token_required
+@cached('externship_info')
 def externship_summary(current_user_id):
     conn = None
     cur = None
@@ -894,6 +904,7 @@ def externship_summary(current_user_id):
 
 @research_bp.route('/externships/list', methods=['GET'])
 @token_required
+@cached('externship_info')
 def externship_list(current_user_id):
     conn = None
     cur = None
@@ -967,6 +978,7 @@ def externship_list(current_user_id):
 
 @research_bp.route('/publications/summary', methods=['GET'])
 @token_required
+@cached('research_publications')
 def publication_summary(current_user_id):
     conn = None
     cur = None
@@ -979,18 +991,20 @@ def publication_summary(current_user_id):
         if not _table_exists(conn, 'research_publications'):
             return jsonify({'total': 0, 'by_type': {}, 'latest_year': None})
 
+        # Served from the publication cube unless an upload has not been rolled up yet.
+        src = aggregates.source(conn, aggregates.PUBLICATION_CUBE)
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_publication_filters(department, publication_year, publication_type)
 
         query_total = f"""
-            SELECT COUNT(*) AS total FROM research_publications {where_clause}
+            SELECT {src.count} AS total FROM {src.relation} {where_clause}
         """
         cur.execute(query_total, params)
         total = cur.fetchone()['total']
 
         query_type = f"""
-            SELECT publication_type, COUNT(*) AS total
-            FROM research_publications
+            SELECT publication_type, {src.count} AS total
+            FROM {src.relation}
             {where_clause}
             GROUP BY publication_type
         """
@@ -1014,14 +1028,7 @@ def publication_summary(current_user_id):
             if 'conference' in words:
                 conference_count += count
 
-        cur.execute(
-            f"""
-            SELECT MAX(publication_year) AS latest_year
-            FROM research_publications
-            {where_clause}
-            """
-        , params)
-        latest_year = cur.fetchone()['latest_year']
+        latest_year = periods.latest(conn, periods.PUBLICATION_YEAR, where_clause, params)
 
         return jsonify({
             'total': total,
@@ -1041,6 +1048,7 @@ def publication_summary(current_user_id):
 
 @research_bp.route('/publications/trend', methods=['GET'])
 @token_required
+@cached('research_publications')
 def publication_trend(current_user_id):
     conn = None
     cur = None
@@ -1052,13 +1060,14 @@ def publication_trend(current_user_id):
         if not _table_exists(conn, 'research_publications'):
             return jsonify({'data': []})
 
+        src = aggregates.source(conn, aggregates.PUBLICATION_CUBE)
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_publication_filters(department, None, publication_type)
 
         query = f"""
             SELECT publication_year AS year,
-                   COUNT(*) AS total
-            FROM research_publications
+                   {src.count} AS total
+            FROM {src.relation}
             {where_clause}
             GROUP BY publication_year
             ORDER BY publication_year
@@ -1077,6 +1086,7 @@ def publication_trend(current_user_id):
 
 @research_bp.route('/publications/department', methods=['GET'])
 @token_required
+@cached('research_publications')
 def publication_by_department(current_user_id):
     conn = None
     cur = None
@@ -1088,13 +1098,14 @@ def publication_by_department(current_user_id):
         if not _table_exists(conn, 'research_publications'):
             return jsonify({'data': []})
 
+        src = aggregates.source(conn, aggregates.PUBLICATION_CUBE)
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_publication_filters(None, publication_year, publication_type)
 
         query = f"""
             SELECT COALESCE(department, 'Unspecified') AS department,
-                   COUNT(*) AS total
-            FROM research_publications
+                   {src.count} AS total
+            FROM {src.relation}
             {where_clause}
             GROUP BY COALESCE(department, 'Unspecified')
             ORDER BY total DESC
@@ -1113,6 +1124,7 @@ def publication_by_department(current_user_id):
 
 @research_bp.route('/publications/type-distribution', methods=['GET'])
 @token_required
+@cached('research_publications')
 def publication_type_distribution(current_user_id):
     conn = None
     cur = None
@@ -1124,12 +1136,13 @@ def publication_type_distribution(current_user_id):
         if not _table_exists(conn, 'research_publications'):
             return jsonify({'data': []})
 
+        src = aggregates.source(conn, aggregates.PUBLICATION_CUBE)
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_publication_filters(department, publication_year, None)
 
         query = f"""
-            SELECT publication_type, COUNT(*) AS total
-            FROM research_publications
+            SELECT publication_type, {src.count} AS total
+            FROM {src.relation}
             {where_clause}
             GROUP BY publication_type
         """
@@ -1147,6 +1160,7 @@ def publication_type_distribution(current_user_id):
 
 @research_bp.route('/publications/list', methods=['GET'])
 @token_required
+@cached('research_publications')
 def publication_list(current_user_id):
     conn = None
     cur = None
@@ -1154,6 +1168,8 @@ def publication_list(current_user_id):
         department = request.args.get('department')
         publication_year = request.args.get('publication_year')
         publication_type = request.args.get('publication_type')
+        search_term = request.args.get('search', '', type=str)
+        page_request = pagination.from_request(optional=True)
 
         conn = get_db_connection()
         if not _table_exists(conn, 'research_publications'):
@@ -1161,6 +1177,8 @@ def publication_list(current_user_id):
 
         cur = conn.cursor(cursor_factory=extras.RealDictCursor)
         where_clause, params = _build_publication_filters(department, publication_year, publication_type)
+        where_clause, params = search.add_condition(where_clause, params, search_term, PUBLICATION_SEARCH_COLUMNS)
+        rank, rank_params, rank_keys = search.rank_column(conn, search_term, PUBLICATION_SEARCH_COLUMNS)
 
         query = f"""
             SELECT publication_id,
@@ -1170,13 +1188,15 @@ def publication_list(current_user_id):
                    faculty_name,
                    publication_year,
                    publication_type
+                   {rank}
             FROM research_publications
             {where_clause}
-            ORDER BY publication_year DESC, publication_title
         """
-        cur.execute(query, params)
+        fetched, page_info = pagination.fetch(
+            cur, query, rank_params + params, rank_keys + PUBLICATION_ORDER, ['research_publications'], page_request
+        )
         data = []
-        for row in cur.fetchall():
+        for row in fetched:
             data.append({
                 'publication_id': row['publication_id'],
                 'publication_title': row['publication_title'],
@@ -1186,7 +1206,9 @@ def publication_list(current_user_id):
                 'publication_year': row['publication_year'],
                 'publication_type': row['publication_type'],
             })
-        return jsonify({'data': data})
+        return jsonify(_list_response(data, page_info))
+    except pagination.InvalidCursor as exc:
+        return jsonify({'message': str(exc)}), 400
     except Exception as exc:
         return jsonify({'message': f'Failed to fetch publications: {exc}'}), 500
     finally:
@@ -0,0 +1,274 @@
+"""
+Process-wide cache of table metadata read from the PostgreSQL catalog.
+
+Uploads used to query information_schema.tables and information_schema.columns
+(slow catalog views) and rebuild the required / serial / optional column sets
+on every request. The snapshot kept here covers every table of the public
+schema in a single pg_catalog query: columns, types, nullability, defaults,
+varchar lengths and the upload conflict keys, with the derived column sets
+computed once.
+
+The snapshot is warmed by init_app() at startup. It is revalidated against a
+cheap catalog fingerprint (pg_class / pg_attribute row versions, which change
+on any DDL) at most every SCHEMA_CACHE_CHECK_INTERVAL seconds, or on every
+call with ``revalidate=True`` as the upload endpoint does, and can be
+reloaded explicitly with refresh().
+
+tables_available() is the table-availability registry behind the stats
+modules' "is this module's data loaded?" guards: a hit is a dict lookup with
+no database round-trip.
+
+Settings (environment variables):
+    SCHEMA_CACHE_CHECK_INTERVAL  seconds between fingerprint checks (default 60)
+"""
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .db import get_db_connection
+
+SCHEMA_CACHE_CHECK_INTERVAL = float(os.environ.get('SCHEMA_CACHE_CHECK_INTERVAL', 60))
+
+_COLUMNS_QUERY = """
+    SELECT c.relname AS table_name,
+           a.attname AS column_name,
+           format_type(a.atttypid, NULL) AS base_type,
+           format_type(a.atttypid, a.atttypmod) AS full_type,
+           NOT a.attnotnull AS nullable,
+           pg_get_expr(d.adbin, d.adrelid) AS column_default,
+           a.attgenerated <> '' AS is_generated,
+           CASE WHEN a.atttypid IN ('varchar'::regtype, 'bpchar'::regtype) AND a.atttypmod > 0
+                THEN a.atttypmod - 4 END AS max_length
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+    ORDER BY c.relname, a.attnum;
+"""
+
+# Any DDL on a public table rewrites its pg_class and/or pg_attribute rows.
+_FINGERPRINT_QUERY = """
+    SELECT md5(string_agg(c.oid::text || ':' || c.xmin::text || ':' || a.attrs, ',' ORDER BY c.oid)) AS fingerprint
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    CROSS JOIN LATERAL (
+        SELECT string_agg(a.attnum::text || '.' || a.xmin::text, ' ' ORDER BY a.attnum) AS attrs
+        FROM pg_attribute a
+        WHERE a.attrelid = c.oid AND a.attnum > 0
+    ) a
+    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'm', 'f');
+"""
+
+
+class ColumnMeta(NamedTuple):
+    name: str
+    base_type: str
+    full_type: str
+    nullable: bool
+    default: Optional[str]
+    is_generated: bool
+    max_length: Optional[int]
+
+    @property
+    def is_serial(self) -> bool:
+        return (self.default or '').startswith('nextval(')
+
+
+class TableMeta(NamedTuple):
+    """Catalog snapshot of one table plus the column sets the upload needs."""
+    name: str
+    columns: Tuple[ColumnMeta, ...]
+    conflict_keys: Tuple[str, ...]
+    db_columns: Tuple[str, ...]         # uploadable (not generated, not serial)
+    serial_cols: Tuple[str, ...]
+    optional_cols: Tuple[str, ...]      # nullable or defaulted
+    required_cols: frozenset            # lower-cased NOT NULL without default
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        return {c.name: c.base_type for c in self.columns}
+
+    @property
+    def max_lengths(self) -> Dict[str, int]:
+        return {c.name.lower(): c.max_length for c in self.columns if c.max_length}
+
+    def column(self, name: str) -> Optional[ColumnMeta]:
+        name = name.lower()
+        return next((c for c in self.columns if c.name.lower() == name), None)
+
+
+def _build_table(name: str, columns: List[ColumnMeta], conflict_keys) -> TableMeta:
+    db_columns, serial_cols, optional_cols, required_cols = [], [], [], set()
+    for col in columns:
+        if col.is_generated:
+            continue
+        if col.is_serial:
+            serial_cols.append(col.name)
+            continue
+        if col.default or col.nullable:
+            optional_cols.append(col.name)
+        db_columns.append(col.name)
+        if not col.nullable and not col.default:
+            required_cols.add(col.name.lower())
+    resolved_keys = tuple(
+        next((c for c in db_columns if c.lower() == k.lower()), k) for k in conflict_keys
+    )
+    return TableMeta(
+        name=name,
+        columns=tuple(columns),
+        conflict_keys=resolved_keys,
+        db_columns=tuple(db_columns),
+        serial_cols=tuple(serial_cols),
+        optional_cols=tuple(optional_cols),
+        required_cols=frozenset(required_cols),
+    )
+
+
+class SchemaCache:
+    """Thread-safe holder of the current catalog snapshot."""
+
+    def __init__(self):
+        self._tables: Dict[str, TableMeta] = {}
+        self._conflict_keys: Dict[str, List[str]] = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, conflict_keys: Dict[str, List[str]]):
+        self._conflict_keys = {t.lower(): keys for t, keys in conflict_keys.items()}
+
+    def refresh(self, conn=None) -> bool:
+        """Reloads the snapshot from the catalog. Returns False if the DB is unreachable."""
+        return self._with_conn(conn, self._load)
+
+    def get(self, table_name: str, revalidate: bool = False) -> Optional[TableMeta]:
+        self._ensure_fresh(force=revalidate)
+        return self._tables.get(table_name.lower())
+
+    def has_tables(self, table_names) -> bool:
+        """
+        Availability check for the stats guards. Answered from the snapshot
+        without touching the database; only a miss re-checks the catalog
+        (at most once per check interval) so newly created tables appear.
+        """
+        if self._fingerprint is None:
+            self._ensure_fresh()
+        names = [t.lower() for t in table_names]
+        if all(t in self._tables for t in names):
+            return True
+        self._ensure_fresh()
+        return all(t in self._tables for t in names)
+
+    def table_names(self) -> List[str]:
+        self._ensure_fresh()
+        return sorted(t.name for t in self._tables.values())
+
+    def _with_conn(self, conn, fn):
+        """
+        Runs ``fn(cur)``, returning False if it fails. The connection may be
+        the request's (mid-upload, say), so outside autocommit the queries
+        run in a savepoint: a failed catalog query is rolled back to it and
+        does not abort the caller's transaction.
+        """
+        own = conn is None
+        if own:
+            conn = get_db_connection()
+            if not conn:
+                return False
+        savepoint = not conn.autocommit
+        try:
+            cur = conn.cursor()
+            try:
+                if savepoint:
+                    cur.execute("SAVEPOINT _schema_cache")
+                try:
+                    result = fn(cur)
+                except Exception:
+                    if savepoint:
+                        cur.execute("ROLLBACK TO SAVEPOINT _schema_cache")
+                    raise
+                if savepoint:
+                    cur.execute("RELEASE SAVEPOINT _schema_cache")
+                return result
+            finally:
+                cur.close()
+        except Exception as e:
+            print(f"Schema cache: catalog query failed: {e}")
+            return False
+        finally:
+            if own:
+                conn.close()
+
+    def _ensure_fresh(self, force=False):
+        if not force and self._fingerprint is not None \
+                and time.monotonic() - self._checked_at < SCHEMA_CACHE_CHECK_INTERVAL:
+            return
+        self._with_conn(None, self._revalidate)
+
+    def _revalidate(self, cur):
+        cur.execute(_FINGERPRINT_QUERY)
+        fingerprint = cur.fetchone()['fingerprint']
+        if fingerprint == self._fingerprint:
+            self._checked_at = time.monotonic()
+            return True
+        return self._load(cur)
+
+    def _load(self, cur):
+        cur.execute(_FINGERPRINT_QUERY)
+        fingerprint = cur.fetchone()['fingerprint']
+        cur.execute(_COLUMNS_QUERY)
+        by_table: Dict[str, List[ColumnMeta]] = {}
+        for r in cur.fetchall():
+            by_table.setdefault(r['table_name'], []).append(ColumnMeta(
+                name=r['column_name'],
+                base_type=r['base_type'],
+                full_type=r['full_type'],
+                nullable=r['nullable'],
+                default=r['column_default'],
+                is_generated=r['is_generated'],
+                max_length=r['max_length'],
+            ))
+        tables = {
+            name.lower(): _build_table(name, cols, self._conflict_keys.get(name.lower(), []))
+            for name, cols in by_table.items()
+        }
+        with self._lock:
+            self._tables = tables
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+        print(f"Schema cache: loaded metadata for {len(tables)} tables.")
+        return True
+
+
+_cache = SchemaCache()
+
+
+def get_table(table_name: str, revalidate: bool = False) -> Optional[TableMeta]:
+    """
+    Cached metadata of a public table (case-insensitive name), or None if it
+    does not exist. ``revalidate`` checks the catalog fingerprint first.
+    """
+    return _cache.get(table_name, revalidate=revalidate)
+
+
+def tables_available(*table_names: str) -> bool:
+    """True if every named table exists; free on the hot path (see has_tables)."""
+    return _cache.has_tables(table_names)
+
+
+def table_exists(table_name: str) -> bool:
+    return tables_available(table_name)
+
+
+def refresh(conn=None) -> bool:
+    """Reloads all table metadata now (e.g. after applying a migration)."""
+    return _cache.refresh(conn)
+
+
+def init_app(app, conflict_keys: Dict[str, List[str]]):
+    """Registers the upload conflict keys and warms the cache."""
+    _cache.configure(conflict_keys)
+    if not refresh():
+        print("⚠️  Schema cache could not be warmed; it will load on first use.")
@@ -0,0 +1,100 @@
+"""
+Shared ``search`` handling for the list endpoints.
+
+A list endpoint declares the text columns its search box covers and asks
+this module for two pieces of SQL:
+
+- condition(): case-insensitive substring match of the term on any of the
+  columns (the ILIKE '%term%' the endpoints used to build by hand, with
+  LIKE wildcards in the term now matched literally);
+- rank_order(): an ORDER BY prefix putting the best matches first, ahead of
+  the endpoint's own ordering (rank_column() is the same for lists read
+  through pagination.fetch()).
+
+Migration 005 adds a pg_trgm GIN index on every searched column, which turns
+the leading-wildcard ILIKE into index scans (for terms of three or more
+characters). With pg_trgm installed, results are ranked by word_similarity()
+of the term to the best matching column; without it, by how early the term
+occurs in a column.
+"""
+from typing import List, Sequence, Tuple
+
+from .pagination import Key
+
+_trigram_available = None
+
+
+def _escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def trigram_available(conn) -> bool:
+    """Whether pg_trgm is installed (checked once per process)."""
+    global _trigram_available
+    if _trigram_available is None:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') AS available;")
+            _trigram_available = bool(cur.fetchone()['available'])
+        finally:
+            cur.close()
+    return _trigram_available
+
+
+def condition(term: str, columns: Sequence[str]) -> Tuple[str, List[str]]:
+    """``(sql, params)`` matching ``term`` anywhere in any of ``columns``; ``('', [])`` without a term."""
+    term = (term or '').strip()
+    if not term:
+        return '', []
+    pattern = f'%{_escape_like(term)}%'
+    return '(' + ' OR '.join(f'{col} ILIKE %s' for col in columns) + ')', [pattern] * len(columns)
+
+
+def rank_key(conn, term: str, columns: Sequence[str]) -> Tuple[str, List[str], bool]:
+    """
+    ``(expression, params, descending)`` scoring how well a row matches the
+    term, best first in that direction (rows matching no column score NULL);
+    ``('', [], False)`` without a term.
+    """
+    term = (term or '').strip()
+    if not term:
+        return '', [], False
+    if trigram_available(conn):
+        ranks = ', '.join(f'word_similarity(%s, {col})' for col in columns)
+        # float8: the value survives a round trip through a pagination cursor.
+        return f'GREATEST({ranks})::float8', [term] * len(columns), True
+    positions = ', '.join(f'NULLIF(strpos(lower({col}), %s), 0)' for col in columns)
+    return f'LEAST({positions})', [term.lower()] * len(columns), False
+
+
+def rank_order(conn, term: str, columns: Sequence[str]) -> Tuple[str, List[str]]:
+    """
+    ``(sql, params)`` to prepend to an ORDER BY clause (it ends with ', ') so
+    the best matches come first; ``('', [])`` without a term.
+    """
+    rank, params, descending = rank_key(conn, term, columns)
+    if not rank:
+        return '', []
+    return f"{rank} {'DESC' if descending else 'ASC'} NULLS LAST, ", params
+
+
+def rank_column(conn, term: str, columns: Sequence[str]) -> Tuple[str, List[str], List[Key]]:
+    """
+    The rank as an extra select-list column: ``(', <rank> AS search_rank',
+    params, [its pagination Key])`` to put ahead of a list's own sort keys;
+    ``('', [], [])`` without a term.
+    """
+    rank, params, descending = rank_key(conn, term, columns)
+    if not rank:
+        return '', [], []
+    return f', {rank} AS search_rank', params, [Key('search_rank', descending, nulls_last=True)]
+
+
+def add_condition(where_clause: str, params: List[str], term: str,
+                  columns: Sequence[str]) -> Tuple[str, List[str]]:
+    """Extends an existing ``WHERE ...`` clause (or '') and its params with condition()."""
+    search_cond, search_params = condition(term, columns)
+    if not search_cond:
+        return where_clause, params
+    where_clause = f'{where_clause} AND {search_cond}' if where_clause else f'WHERE {search_cond}'
+    return where_clause, params + search_params
@@ -0,0 +1,158 @@
+"""
+Streamed JSON for list endpoints that return a whole table.
+
+json_list() reads such a list through a server-side (named) cursor,
+STREAM_BATCH_SIZE rows per round trip. A list that fits in the first batch
+is answered with an ordinary JSON response (which @cached can keep); a
+longer one is sent with chunked transfer encoding, one batch at a time, so
+neither the backend nor the driver ever holds the whole table in memory.
+The rows are read on the request's own connection; a streamed response
+takes it over and returns it to the pool when the stream ends, so a list
+never holds a second connection.
+
+batches() / stream() are the building blocks, also used by the bulk export
+(export.py).
+
+fields() implements the ``fields`` argument of these lists: a
+comma-separated subset of the table's columns, so a client only receives
+what it renders.
+
+Settings (environment variables):
+    LIST_STREAM_BATCH_SIZE  rows fetched per round trip  (default 500)
+"""
+import itertools
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Response, current_app, jsonify
+from psycopg2 import extras
+
+from . import schema
+from .db import detach_db_connection, get_db_connection
+
+STREAM_BATCH_SIZE = int(os.environ.get('LIST_STREAM_BATCH_SIZE', 500))
+
+
+class InvalidFields(ValueError):
+    """Raised for a ``fields`` argument naming columns the list does not have."""
+
+
+def fields(table: str, requested: Optional[str], withheld: Sequence[str] = ()) -> List[str]:
+    """
+    Columns of ``table`` selected by a ``fields`` argument, in the order
+    given; every column, in table order, when it is blank. ``withheld``
+    columns are never returned. Raises InvalidFields for names that are
+    not columns of the table or are withheld.
+    """
+    meta = schema.get_table(table)
+    available = [c.name for c in meta.columns if c.name not in withheld] if meta else []
+    names = [name.strip().lower() for name in (requested or '').split(',') if name.strip()]
+    if not names:
+        return available
+    refused = [name for name in names if name in withheld]
+    if refused:
+        raise InvalidFields(f"Field(s) not available: {', '.join(refused)}.")
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}.")
+    return list(dict.fromkeys(names))
+
+
+def _visible(row, hidden: Sequence[str]) -> Dict[str, Any]:
+    return {key: value for key, value in row.items() if key not in hidden}
+
+
+def batches(query: str, params: Sequence[Any], batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the rows of ``query`` in lists of up to ``batch_size``, read
+    through a named cursor on the request's connection (inside its
+    transaction). The cursor is closed when the generator is exhausted or
+    closed.
+    """
+    batch_size = batch_size or STREAM_BATCH_SIZE
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('Database connection failed.')
+    cur = None
+    try:
+        cur = conn.cursor(name='streamed_rows', cursor_factory=extras.RealDictCursor)
+        cur.itersize = batch_size
+        cur.execute(query, list(params))
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        try:
+            if cur is not None and not cur.closed:
+                cur.close()
+        finally:
+            conn.close()
+
+
+def primed(rows: Iterator[List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], Iterator[List[Dict[str, Any]]]]:
+    """
+    Runs the query behind batches() and fetches the first batch now, so a
+    failing query is reported before the response headers are sent.
+    Returns ``(first batch or [], every batch)``.
+    """
+    first = next(rows, [])
+    return first, itertools.chain([first] if first else [], rows)
+
+
+def stream(chunks: Iterable[str], rows: Iterator, mimetype: str, label: str, headers=None) -> Response:
+    """
+    Streamed response of ``chunks`` (generated from ``rows``, a batches()
+    generator of this request that is closed however the stream ends). The
+    response takes over the request's connection, which the rows are read
+    on after the view has returned, and releases it once closed.
+    """
+    conn = detach_db_connection()
+
+    def generate():
+        try:
+            yield ''    # consumed below, so close() runs the cleanup even if nothing was sent
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent: the client sees a truncated body.
+            print(f"{label} stream error: {e}")
+        finally:
+            try:
+                rows.close()
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    body = generate()
+    next(body)
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def json_list(query: str, params: Sequence[Any], envelope: Dict[str, Any],
+              hidden: Sequence[str] = (), batch_size: Optional[int] = None):
+    """
+    Responds with ``envelope`` plus ``'data'``: the rows of ``query`` (which
+    carries its own ORDER BY) without the ``hidden`` columns. A list that
+    fits in one batch gets an ordinary JSON response, a longer one is
+    streamed.
+    """
+    batch_size = batch_size or STREAM_BATCH_SIZE
+    rows = batches(query, params, batch_size)
+    first, all_rows = primed(rows)
+    if len(first) < batch_size:
+        rows.close()
+        return jsonify({**envelope, 'data': [_visible(row, hidden) for row in first]}), 200
+
+    dumps = current_app.json.dumps
+
+    def chunks():
+        yield '{' + ''.join(f'{dumps(key)}: {dumps(value)}, ' for key, value in envelope.items())
+        yield '"data": ['
+        separator = ''
+        for batch in all_rows:
+            yield separator + ', '.join(dumps(_visible(row, hidden)) for row in batch)
+            separator = ', '
+        yield ']}'
+
+    return stream(chunks(), rows, 'application/json', 'List')
@@ -0,0 +1,220 @@
+"""
+Streaming per-table row transforms for CSV uploads.
+
+upload.TABLE_TRANSFORMS maps a table to a list of transforms (renames, date
+normalisation, FK lookups, synthetic keys). apply_transforms() binds them to
+the uploaded header once, then rewrites every row in a single pass as it is
+streamed towards COPY. Rows are plain lists, so there is no intermediate
+list(reader) and no re-serialisation to CSV text.
+
+A transform's bind(headers, conn) returns ``(new_headers, row_fn, finish_fn)``:
+``row_fn`` maps one row list to the next (None when the transform has nothing
+to do for this header), ``finish_fn`` runs after the last row and may raise
+RowValidationError for problems collected along the way. All per-upload
+state lives in the closures bind() creates, so the registered transform
+objects are safe to share between requests.
+"""
+from .ingest import RowValidationError
+
+
+def _position(headers, name, match_case=False):
+    """Index of the first header matching ``name`` (case-insensitively by default), or None."""
+    if match_case:
+        return next((i for i, h in enumerate(headers) if h == name), None)
+    name = name.lower()
+    return next((i for i, h in enumerate(headers) if h.lower() == name), None)
+
+
+def _cell(row, i):
+    return row[i] if i is not None and i < len(row) else None
+
+
+def _preprocessing_error(message):
+    print(f"\n{'='*80}")
+    print("PRE-PROCESSING ERROR")
+    print(f"{'='*80}")
+    print(f"Error: {message}")
+    print(f"{'='*80}\n")
+    return RowValidationError({'message': message, 'error_type': 'preprocessing_error'})
+
+
+class Rename:
+    """Renames CSV headers (matched case-insensitively) to their database names."""
+
+    def __init__(self, mapping):
+        self.mapping = {k.lower(): v for k, v in mapping.items()}
+
+    def bind(self, headers, conn):
+        return [self.mapping.get(h.lower(), h) for h in headers], None, None
+
+
+class DropColumns:
+    """Removes CSV columns whose values are always derived server-side."""
+
+    def __init__(self, *names):
+        self.names = {n.lower() for n in names}
+
+    def bind(self, headers, conn):
+        keep = [i for i, h in enumerate(headers) if h.lower() not in self.names]
+        if len(keep) == len(headers):
+            return headers, None, None
+        return [headers[i] for i in keep], (lambda row: [_cell(row, i) for i in keep]), None
+
+
+def normalise_date(val, pivot=30):
+    """DD/MM/YY(YY) or DD-MM-YY(YY) → YYYY-MM-DD; ISO and unparseable values pass through."""
+    if not val or not val.strip():
+        return val
+    val = val.strip()
+    if len(val) == 10 and val[4] == '-':
+        return val  # Already ISO
+    parts = val.replace('-', '/').split('/')
+    if len(parts) == 3:
+        day, month, year = parts
+        if len(year) == 2:
+            yr = int(year)
+            year = str(2000 + yr) if yr <= pivot else str(1900 + yr)
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    return val
+
+
+class NormaliseDates:
+    """Rewrites day-first dates in the given columns to ISO format."""
+
+    def __init__(self, *columns, pivot=30):
+        self.columns = {c.lower() for c in columns}
+        self.pivot = pivot
+
+    def bind(self, headers, conn):
+        targets = [i for i, h in enumerate(headers) if h.lower() in self.columns]
+        if not targets:
+            return headers, None, None
+        pivot = self.pivot
+
+        def row_fn(row):
+            row = list(row)
+            for i in targets:
+                if i < len(row):
+                    row[i] = normalise_date(row[i], pivot)
+            return row
+        return headers, row_fn, None
+
+
+class SyntheticKey:
+    """
+    Prepends a key column built by concatenating the stripped values of
+    ``parts``. With ``match_case`` a part only matches a header spelled
+    exactly the same; parts with no matching header contribute ''.
+    """
+
+    def __init__(self, column, parts, match_case=False):
+        self.column = column
+        self.parts = parts
+        self.match_case = match_case
+
+    def bind(self, headers, conn):
+        positions = [_position(headers, p, self.match_case) for p in self.parts]
+
+        def row_fn(row):
+            key = ''.join((_cell(row, i) or '').strip() for i in positions)
+            return [key] + list(row)
+        return [self.column] + list(headers), row_fn, None
+
+
+class Lookup:
+    """
+    Resolves human-readable ``key_columns`` to the id in ``target`` using a
+    mapping loaded once per upload by ``query`` (key parts..., value). Applies
+    only when the first key column is in the CSV; unresolved keys are reported
+    together once the whole file has been read.
+    """
+
+    def __init__(self, key_columns, target, query, drop=(), fold_case=False,
+                 label='{0}', missing_message='Values not found in database: {missing}.',
+                 max_listed=None, empty_message=None):
+        self.key_columns = key_columns
+        self.target = target
+        self.query = query
+        self.drop = DropColumns(*drop) if drop else None
+        self.fold_case = fold_case
+        self.label = label
+        self.missing_message = missing_message
+        self.max_listed = max_listed
+        self.empty_message = empty_message
+
+    def _key(self, parts):
+        parts = tuple(str(p if p is not None else '').strip() for p in parts)
+        return tuple(p.lower() for p in parts) if self.fold_case else parts
+
+    def bind(self, headers, conn):
+        if _position(headers, self.key_columns[0]) is None:
+            return headers, None, None
+
+        cur = conn.cursor()
+        try:
+            cur.execute(self.query)
+            lookup = {}
+            for r in cur.fetchall():
+                *key, value = r.values()
+                lookup[self._key(key)] = value
+        finally:
+            cur.close()
+
+        key_positions = [_position(headers, c) for c in self.key_columns]
+        headers = list(headers)
+        target_pos = _position(headers, self.target)
+        if target_pos is None:
+            headers.append(self.target)
+            target_pos = len(headers) - 1
+        width = len(headers)
+        drop_fn = None
+        if self.drop:
+            headers, drop_fn, _ = self.drop.bind(headers, conn)
+
+        missing, seen = {}, [False]
+
+        def row_fn(row):
+            row = list(row) + [None] * (width - len(row))
+            parts = [(_cell(row, i) or '').strip() for i in key_positions]
+            if parts[0]:
+                seen[0] = True
+                value = lookup.get(self._key(parts))
+                if value is not None:
+                    row[target_pos] = str(value)
+                else:
+                    missing.setdefault(self.label.format(*parts), None)
+            return drop_fn(row) if drop_fn else row
+
+        def finish_fn():
+            if self.empty_message and not seen[0]:
+                raise _preprocessing_error(self.empty_message)
+            if missing:
+                listed = list(missing)[:self.max_listed] if self.max_listed else list(missing)
+                raise _preprocessing_error(self.missing_message.format(missing=', '.join(listed)))
+
+        return headers, row_fn, finish_fn
+
+
+def apply_transforms(transforms, rows, headers, conn):
+    """
+    Binds ``transforms`` to ``headers`` and returns ``(rows, new_headers)``
+    where ``rows`` lazily yields every row rewritten by the whole chain.
+    """
+    row_fns, finish_fns = [], []
+    for transform in transforms:
+        headers, row_fn, finish_fn = transform.bind(headers, conn)
+        if row_fn:
+            row_fns.append(row_fn)
+        if finish_fn:
+            finish_fns.append(finish_fn)
+    if not row_fns and not finish_fns:
+        return rows, headers
+
+    def stream():
+        for row in rows:
+            for fn in row_fns:
+                row = fn(row)
+            yield row
+        for fn in finish_fns:
+            fn()
+    return stream(), headers
@@ -2,7 +2,7 @@
 CSV upload endpoint: secure bulk-upsert to any whitelisted database table.
 
 Security: table name is validated against UPDATABLE_TABLES before any DB
-interaction. Column names come from information_schema, not raw user input.
+interaction. Column names come from the catalog (see schema.py), not raw user input.
 """
 import csv
 import io
@@ -12,8 +12,16 @@ import psycopg2
 import psycopg2.extras
 from flask import Blueprint, jsonify, request
 
+from . import aggregates, schema
 from .auth import token_required
+from .cache import invalidate
 from .db import get_db_connection
+from .diagnose import bisect_failing_row, find_invalid_rows, first_failing_row
+from .ingest import (
+    RowValidationError, copy_rows, create_staging_table, merge_staging,
+)
+from .normalise import iter_normalised_frames
+from .transforms import DropColumns, Lookup, NormaliseDates, Rename, SyntheticKey, apply_transforms
 
 upload_bp = Blueprint('upload', __name__)
 
@@ -65,6 +73,47 @@ UPDATABLE_TABLES = {
     'nirf_ranking':                 ['year'],
 }
 
+# Per-table row transforms, applied in order in a single streaming pass
+# (see transforms.apply_transforms). Tables not listed are uploaded as-is.
+TABLE_TRANSFORMS = {
+    'employees': [
+        DropColumns('id'),                      # always derived below
+        Rename({'group': 'group_name'}),        # reserved SQL word
+        NormaliseDates('dob', 'initial_doj', 'doj', 'dor', 'notificationdate'),
+        # Header names match exactly, as they always have: the shipped "empId"
+        # header is not part of the key. Changing that changes every stored id.
+        SyntheticKey('id', ['empid', 'designation', 'doj'], match_case=True),
+    ],
+    'student_table': [
+        Rename({
+            'aadhar number':                      'aadhar_number',
+            'preparatory ay':                     'preparatory_ay',
+            'withdrawn/ terminated':              'withdrawn_terminated',
+            'date of withdrawal/ termination':    'date_of_withdrawal_termination',
+            'ay of withdrawal/ termination':      'ay_of_withdrawal_termination',
+            'reason for withdrawal/ termination': 'reason_for_withdrawal_termination',
+        }),
+    ],
+    'uba_events': [
+        Lookup(
+            ['project_title'], 'project_id',
+            "SELECT LOWER(project_title) AS project_title, project_id FROM uba_projects",
+            drop=['project_title'], fold_case=True,
+            missing_message='Project titles not found in database: {missing}. Ensure strings match exactly.',
+            empty_message='No project_title values found in CSV.',
+        ),
+    ],
+    'nptel_enrollments': [
+        Lookup(
+            ['course_code', 'enrollment_year', 'enrollment_semester'], 'course_id',
+            "SELECT course_code, offering_year::text, COALESCE(offering_semester, ''), course_id "
+            "FROM nptel_courses",
+            drop=['course_code'], label='{0} ({1} {2})', max_listed=5,
+            missing_message='Could not find course_id for: {missing}. Ensure NPTEL Courses are uploaded first.',
+        ),
+    ],
+}
+
 
 def safe_rollback(conn):
     """Safely rolls back a connection that may already be closed."""
@@ -75,220 +124,39 @@ def safe_rollback(conn):
             pass
 
 
-def _find_failing_row(cur, conn, query, data, use_truncate, table_name):
+class _UploadStream(io.RawIOBase):
     """
-    Retries insertion row-by-row inside a savepoint to identify which CSV data
-    row caused a bulk-insert failure.  All changes are rolled back afterwards.
-    Returns (1-based row number, exception) or (None, None) if every row passes.
+    Read-only raw stream over an uploaded file, so io.TextIOWrapper can
+    decode it. Werkzeug spools uploads to a SpooledTemporaryFile, which has
+    no readable() before Python 3.11.
     """
-    try:
-        cur.execute("SAVEPOINT _diag_start")
-        if use_truncate:
-            cur.execute(f'TRUNCATE TABLE "{table_name}" RESTART IDENTITY CASCADE;')
-        for i, row in enumerate(data, start=1):
-            cur.execute("SAVEPOINT _diag_row")
-            try:
-                psycopg2.extras.execute_values(cur, query, [row])
-                cur.execute("RELEASE SAVEPOINT _diag_row")
-            except Exception as row_err:
-                cur.execute("ROLLBACK TO SAVEPOINT _diag_row")
-                cur.execute("ROLLBACK TO SAVEPOINT _diag_start")
-                cur.execute("RELEASE SAVEPOINT _diag_start")
-                return i, row_err
-        # All rows passed individually — roll back diagnostic inserts
-        cur.execute("ROLLBACK TO SAVEPOINT _diag_start")
-        cur.execute("RELEASE SAVEPOINT _diag_start")
-    except Exception:
-        safe_rollback(conn)
-    return None, None
 
+    def __init__(self, stream):
+        self._stream = stream
 
-# ---------------------------------------------------------------------------
-# Per-table pre-processing helpers
-# ---------------------------------------------------------------------------
-
-def _preprocess_employees(reader, csv_headers):
-    """
-    For the 'employees' table:
-    - Renames 'group' → 'group_name' (reserved SQL word).
-    - Drops any existing 'id' column and auto-generates it as empid+designation+doj.
-    - Normalises date columns from DD/MM/YY to YYYY-MM-DD.
-
-    Returns (new_headers, processed_rows, error) — rows as a plain list of dicts
-    so the caller can use them directly without re-reading the original stream.
-    """
-    DATE_COLS = {'dob', 'initial_doj', 'doj', 'dor', 'notificationdate'}
-
-    def _norm_date(val):
-        if not val or not val.strip():
-            return val
-        val = val.strip()
-        if len(val) == 10 and val[4] == '-':
-            return val  # Already ISO
-        parts = val.replace('-', '/').split('/')
-        if len(parts) == 3:
-            day, month, year = parts
-            if len(year) == 2:
-                yr = int(year)
-                year = str(2000 + yr) if yr <= 30 else str(1900 + yr)
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        return val
-
-    rows = list(reader)
-    if not rows:
-        return None, None, 'CSV file is empty.'
-
-    new_headers = ['id'] + [
-        'group_name' if h.lower() == 'group' else h
-        for h in csv_headers if h.lower() != 'id'
-    ]
-
-    processed = []
-    for row in rows:
-        new_row = {}
-        for k, v in row.items():
-            if k.lower() == 'id':
-                continue
-            key = 'group_name' if k.lower() == 'group' else k
-            new_row[key] = _norm_date(v) if key.lower() in DATE_COLS else v
-
-        empid = (new_row.get('empid') or '').strip()
-        desig  = (new_row.get('designation') or '').strip()
-        doj    = (new_row.get('doj') or '').strip()
-        new_row['id'] = f"{empid}{desig}{doj}"
-        processed.append(new_row)
-
-    return _rebuild_stream(new_headers, processed)
-
-
-def _preprocess_student_table(reader, csv_headers):
-    """
-    For the 'student_table':
-    Renames human-readable CSV column names to their snake_case database equivalents.
-    """
-    RENAME_MAP = {
-        'aadhar number':                      'aadhar_number',
-        'preparatory ay':                     'preparatory_ay',
-        'withdrawn/ terminated':              'withdrawn_terminated',
-        'date of withdrawal/ termination':    'date_of_withdrawal_termination',
-        'ay of withdrawal/ termination':      'ay_of_withdrawal_termination',
-        'reason for withdrawal/ termination': 'reason_for_withdrawal_termination',
-    }
-
-    needs_rename = any(h.lower() in RENAME_MAP for h in csv_headers)
-    if not needs_rename:
-        return reader, csv_headers, None
-
-    rows = list(reader)
-    new_headers = [RENAME_MAP.get(h.lower(), h) for h in csv_headers]
-
-    processed = []
-    for row in rows:
-        new_row = {}
-        for old_key, val in row.items():
-            new_key = RENAME_MAP.get(old_key.lower(), old_key)
-            new_row[new_key] = val
-        processed.append(new_row)
-
-    return _rebuild_stream(new_headers, processed)
-
-
-def _preprocess_uba_events(reader, csv_headers, conn):
-    """
-    For the 'uba_events' table:
-    Accepts 'project_title' in CSV and resolves it to 'project_id' via DB lookup.
-    """
-    if 'project_title' not in csv_headers:
-        return reader, csv_headers, None
-
-    rows = list(reader)
-    if not rows:
-        return None, None, 'CSV file is empty.'
-
-    titles = {r.get('project_title', '').strip() for r in rows if r.get('project_title')}
-    if not titles:
-        return None, None, 'No project_title values found in CSV.'
-
-    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-    try:
-        cur.execute(
-            "SELECT project_title, project_id FROM uba_projects WHERE LOWER(project_title) = ANY(%s)",
-            ([t.lower() for t in titles],)
-        )
-        title_to_id = {r['project_title'].lower(): r['project_id'] for r in cur.fetchall()}
-    finally:
-        cur.close()
-
-    missing = [t for t in titles if t.lower() not in title_to_id]
-    if missing:
-        return None, None, (
-            f"Project titles not found in database: {', '.join(missing)}. "
-            "Ensure strings match exactly."
-        )
-
-
-
-def _preprocess_nptel_enrollments(reader, csv_headers, conn):
-    """
-    For the 'nptel_enrollments' table:
-    Accepts 'course_code' in CSV and resolves it to 'course_id' via DB lookup.
-    """
-    if 'course_code' not in csv_headers:
-        return reader, csv_headers, None
+    def readable(self):
+        return True
 
-    rows = list(reader)
-    if not rows:
-        return None, None, 'CSV file is empty.'
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
 
-    codes = [r.get('course_code', '').strip() for r in rows if r.get('course_code')]
 
-    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-    try:
-        cur.execute(
-            "SELECT course_id, course_code, offering_year, offering_semester FROM nptel_courses WHERE course_code = ANY(%s)",
-            (codes,)
-        )
-        lookup = {
-            (r['course_code'].strip(), str(r['offering_year']), (r['offering_semester'] or '').strip()): r['course_id']
-            for r in cur.fetchall()
-        }
-    finally:
-        cur.close()
-
-    new_headers = [h for h in csv_headers if h != 'course_code']
-    if 'course_id' not in new_headers:
-        new_headers.append('course_id')
-
-    missing, processed = [], []
-    for row in rows:
-        code = row.pop('course_code', '').strip()
-        year = row.get('enrollment_year', '').strip()
-        sem  = row.get('enrollment_semester', '').strip()
-        cid  = lookup.get((code, year, sem))
-        if cid:
-            row['course_id'] = cid
-        elif code:
-            missing.append(f"{code} ({year} {sem})")
-        processed.append(row)
-
-    if missing:
-        return None, None, (
-            f"Could not find course_id for: {', '.join(missing[:5])}. "
-            "Ensure NPTEL Courses are uploaded first."
+def _truncate_targets(cur, table_name):
+    """Tables emptied by TRUNCATE ... CASCADE on table_name (itself included)."""
+    cur.execute("""
+        WITH RECURSIVE refs(relid) AS (
+            SELECT %s::regclass
+            UNION
+            SELECT c.conrelid
+            FROM pg_constraint c
+            JOIN refs ON c.confrelid = refs.relid
+            WHERE c.contype = 'f'
         )
-
-    return _rebuild_stream(new_headers, processed)
-
-
-def _rebuild_stream(headers, rows):
-    """Serialises processed rows back into a DictReader-ready StringIO stream."""
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=headers)
-    writer.writeheader()
-    writer.writerows(rows)
-    buf.seek(0)
-    reader = csv.DictReader(buf)
-    return reader, reader.fieldnames, None
+        SELECT relid::regclass::text AS table_name FROM refs;
+    """, (f'public."{table_name}"',))
+    return [row['table_name'].replace('"', '') for row in cur.fetchall()]
 
 
 # ---------------------------------------------------------------------------
@@ -335,18 +203,18 @@ def upload_csv(current_user_id):
     print(f"{'='*80}\n")
 
     conn = None
-    _failing_row_num = None   # set by _find_failing_row if a specific row is at fault
+    _failing_row_num = None   # first CSV row at fault, if the diagnosis finds one
+    _diagnosis = {}           # every offending row found by find_invalid_rows
     try:
-        csv_text = io.StringIO(file.stream.read().decode('utf-8'))
-        reader   = csv.DictReader(csv_text)
-        csv_headers = reader.fieldnames or []
+        # Decode lazily: rows are streamed from the upload, never read whole.
+        csv_text = io.TextIOWrapper(io.BufferedReader(_UploadStream(file.stream)), encoding='utf-8', newline='')
+        reader   = csv.reader(csv_text)
+        csv_headers = next((row for row in reader if row), [])
         
         # Strip BOM from the first column name if present
         if csv_headers and csv_headers[0].startswith('\ufeff'):
             original_first = csv_headers[0]
             csv_headers = [csv_headers[0].lstrip('\ufeff')] + csv_headers[1:]
-            # Also update the reader's fieldnames
-            reader.fieldnames = csv_headers
             print(f"\n{'='*80}")
             print(f"BOM DETECTED AND STRIPPED")
             print(f"{'='*80}")
@@ -361,72 +229,32 @@ def upload_csv(current_user_id):
         if not conn:
             return jsonify({'message': 'Database connection failed.'}), 500
 
-        # --- Per-table pre-processing ---
-        # processed_rows: plain list of dicts produced by preprocessing (bypasses
-        # the csv_text.seek(0) re-read in the data-collection phase below).
-        error = None
-        if table_name == 'employees':
-            reader, csv_headers, error = _preprocess_employees(reader, csv_headers)
-        elif table_name == 'student_table':
-            reader, csv_headers, error = _preprocess_student_table(reader, csv_headers)
-        elif table_name == 'uba_events' and 'project_title' in csv_headers:
-            reader, csv_headers, error = _preprocess_uba_events(reader, csv_headers, conn)
-        elif table_name == 'nptel_enrollments' and 'course_code' in csv_headers:
-            reader, csv_headers, error = _preprocess_nptel_enrollments(reader, csv_headers, conn)
-
-        if error:
-            print(f"\n{'='*80}")
-            print(f"PRE-PROCESSING ERROR - Table: {table_name}")
-            print(f"{'='*80}")
-            print(f"Error: {error}")
-            print(f"{'='*80}\n")
-            return jsonify({'message': error, 'error_type': 'preprocessing_error'}), 400
+        # --- Per-table pre-processing (streamed; blank lines are skipped) ---
+        rows = (row for row in reader if row)
+        rows, csv_headers = apply_transforms(
+            TABLE_TRANSFORMS.get(table_name, []), rows, csv_headers, conn
+        )
 
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-        # Check the table exists
-        cur.execute(
-            "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND LOWER(table_name) = LOWER(%s)) AS ok;",
-            (table_name,)
-        )
-        if not cur.fetchone()['ok']:
+        # Table metadata comes from the process-wide schema cache; revalidating
+        # only costs a catalog fingerprint query unless the DDL changed.
+        meta = schema.get_table(table_name, revalidate=True)
+        if meta is None:
             return jsonify({'message': f"Table '{table_name}' does not exist in the database."}), 400
 
-        # Fetch column metadata
-        cur.execute(
-            """
-            SELECT column_name, is_generated, column_default, data_type, is_nullable, character_maximum_length
-            FROM information_schema.columns
-            WHERE table_schema = 'public' AND LOWER(table_name) = LOWER(%s)
-            ORDER BY ordinal_position;
-            """,
-            (table_name,)
-        )
-        col_rows = cur.fetchall()
-
-        db_columns, serial_cols, optional_cols, required_cols = [], [], [], set()
-        for r in col_rows:
-            if (r.get('is_generated') or 'NEVER').upper() == 'ALWAYS':
-                continue
-            default   = r.get('column_default') or ''
-            nullable  = (r.get('is_nullable') or 'YES').upper()
-            is_serial = default.startswith('nextval(')
-            if is_serial:
-                serial_cols.append(r['column_name'])
-                continue
-            if default or nullable == 'YES':
-                optional_cols.append(r['column_name'])
-            db_columns.append(r['column_name'])
-            if nullable == 'NO' and not default:
-                required_cols.add(r['column_name'].lower())
+        col_rows = meta.columns
+        db_columns    = list(meta.db_columns)
+        serial_cols   = list(meta.serial_cols)
+        optional_cols = list(meta.optional_cols)
+        required_cols = meta.required_cols
 
         if not db_columns:
             return jsonify({'message': f"No uploadable columns found for '{table_name}'."}), 400
 
         csv_lower    = [h.lower() for h in csv_headers]
         db_lower     = [c.lower() for c in db_columns]
-        all_db_lower = [r['column_name'].lower() for r in col_rows]
+        all_db_lower = [c.name.lower() for c in col_rows]
 
         missing = [c for c in required_cols if c not in csv_lower]
         if missing:
@@ -437,7 +265,7 @@ def upload_csv(current_user_id):
             print(f"Missing required columns: {missing}")
             print(f"Expected required columns: {sorted(required_cols)}")
             print(f"CSV provided columns: {csv_headers}")
-            print(f"Database required columns: {sorted([c for r in col_rows if (r.get('is_nullable') or 'YES').upper() == 'NO' and not (r.get('column_default') or '') for c in [r['column_name']]])}")
+            print(f"Database required columns: {sorted(c.name for c in col_rows if not c.nullable and not c.default)}")
             print(f"{'='*80}\n")
             # Return enhanced error response
             return jsonify({
@@ -446,7 +274,7 @@ def upload_csv(current_user_id):
                     'missing_in_csv': missing,
                     'required_columns': sorted(list(required_cols)),
                     'provided_columns': csv_headers,
-                    'expected_required': sorted([r['column_name'] for r in col_rows if (r.get('is_nullable') or 'YES').upper() == 'NO' and not (r.get('column_default') or '')]),
+                    'expected_required': sorted(c.name for c in col_rows if not c.nullable and not c.default),
                 },
                 'error_type': 'missing_columns',
             }), 400
@@ -473,7 +301,7 @@ def upload_csv(current_user_id):
                 print(f"  - '{ex_col}' (lowercase: '{ex_col.lower()}')")
                 # Try to find similar columns in database (case-insensitive)
                 possible_matches = [
-                    c for c in [r['column_name'] for r in col_rows]
+                    c for c in [r.name for r in col_rows]
                     if c.lower() == ex_col.lower()
                 ]
                 if possible_matches:
@@ -481,7 +309,7 @@ def upload_csv(current_user_id):
                 else:
                     print(f"    → NOT found in database (even with case variations)")
             
-            print(f"\nValid database columns (all {len(col_rows)}): {sorted([r['column_name'] for r in col_rows])}")
+            print(f"\nValid database columns (all {len(col_rows)}): {sorted(r.name for r in col_rows)}")
             print(f"CSV provided columns ({len(csv_headers)}): {csv_headers}")
             print(f"\nSerial/Auto-generated columns (skipped): {serial_cols}")
             print(f"Optional columns (skipped): {optional_cols}")
@@ -495,7 +323,7 @@ def upload_csv(current_user_id):
                     'extra_in_csv': extra,
                     'expected_columns': db_columns,
                     'provided_columns': csv_headers,
-                    'all_valid_columns': [r['column_name'] for r in col_rows],
+                    'all_valid_columns': [r.name for r in col_rows],
                     'suggested_columns': [c for c in csv_headers if c.lower() not in extra],
                     'serial_columns': serial_cols,
                     'optional_columns': optional_cols,
@@ -504,141 +332,76 @@ def upload_csv(current_user_id):
             }), 400
 
         # Build INSERT … ON CONFLICT query
-        conflict_keys = UPDATABLE_TABLES[table_name]
         columns_to_insert = [c for c in db_columns if c.lower() in csv_lower]
-        conflict_keys_db  = [
-            next((c for c in db_columns if c.lower() == k.lower()), k)
-            for k in conflict_keys
-        ]
+        conflict_keys_db  = list(meta.conflict_keys)
         update_cols = [c for c in columns_to_insert if c not in conflict_keys_db]
 
         # Check if conflict key columns are actually present in the CSV
         conflict_keys_in_csv = [k for k in conflict_keys_db if k.lower() in csv_lower]
 
-        cols_sql = ', '.join(f'"{c}"' for c in columns_to_insert)
+        # Conflict keys not in CSV (e.g. auto-increment PK) — truncate and re-insert
+        use_truncate = not conflict_keys_in_csv
+        merge_keys = None if use_truncate else conflict_keys_db
+        column_types = meta.column_types
+        col_max_lengths = meta.max_lengths
 
-        if conflict_keys_in_csv:
-            # Normal upsert: conflict keys are in the CSV
-            conflict_sql = ', '.join(f'"{c}"' for c in conflict_keys_db)
-            conflict_action = (
-                f"DO UPDATE SET {', '.join(f'{chr(34)}{c}{chr(34)} = EXCLUDED.{chr(34)}{c}{chr(34)}' for c in update_cols)}"
-                if update_cols and conflict_keys_db else "DO NOTHING"
-            )
-            query = f'INSERT INTO "{table_name}" ({cols_sql}) VALUES %s ON CONFLICT ({conflict_sql}) {conflict_action};'
-            use_truncate = False
-        else:
-            # Conflict keys not in CSV (e.g. auto-increment PK) — truncate and re-insert
-            query = f'INSERT INTO "{table_name}" ({cols_sql}) VALUES %s;'
-            use_truncate = True
-
-        # Collect and normalise rows.
-        # `reader` is always the correct stream to use: either the original
-        # DictReader (header already consumed, data rows intact) or the
-        # rebuilt stream returned by a per-table pre-processor.
-        data_iter = reader
-        data, rows_processed = [], 0
-        for i, row in enumerate(data_iter, start=1):
-            row_vals, is_empty = [], True
-            for col in columns_to_insert:
-                val = next(
-                    (row[h] for h in csv_headers if h.lower() == col.lower() and h in row),
-                    row.get(col)
-                )
-                if val is not None and str(val).strip() == '':
-                    val = None
-                if val is not None:
-                    is_empty = False
-                if val is None and col.lower() in required_cols:
-                    return jsonify({'message': f"Row {i}: '{col}' cannot be empty."}), 400
-                row_vals.append(val)
-
-            if is_empty:
-                continue
-
-            # Normalise booleans and enums
-            norm = list(row_vals)
-            BOOL_COLS = {'pwd', 'is_active', 'is_from_iitpkd', 'pwd_exs',
-                         'certification_earned', 'is_top_recruiter', 'isactive'}
-            for idx, col in enumerate(columns_to_insert):
-                v = norm[idx]
-                if v is None:
-                    continue
-                vs = str(v).strip()
-                if col.lower() in BOOL_COLS:
-                    norm[idx] = 'TRUE' if vs.lower() in {'yes', 'y', 'true', '1'} else (
-                                 'FALSE' if vs.lower() in {'no', 'n', 'false', '0'} else v)
-                if table_name == 'student_table' and col.lower() == 'program':
-                    norm[idx] = vs.replace('.', '')
-                if col.lower() == 'category' and vs.lower() == 'general':
-                    norm[idx] = 'Gen'
-                if table_name == 'student_table' and col.lower() == 'status' and vs.lower() == 'active':
-                    norm[idx] = 'Ongoing'
-
-            data.append(tuple(norm))
-            rows_processed += 1
-
-        if not data:
-            return jsonify({'message': 'CSV contains no data rows.'}), 400
+        # Stream rows: CSV → validation/normalisation → COPY into a temp staging table.
+        stage = create_staging_table(cur, columns_to_insert)
+        frames = iter_normalised_frames(
+            rows, csv_headers, columns_to_insert, required_cols, col_max_lengths, table_name
+        )
+        try:
+            rows_processed = copy_rows(cur, stage, columns_to_insert, frames)
+        except RowValidationError as e:
+            safe_rollback(conn)
+            return jsonify(e.payload), 400
 
-        # Deduplicate on conflict keys — psycopg2 cannot handle duplicates in the same INSERT
-        dupes = 0
-        if conflict_keys_db:
-            key_indices = [
-                next((i for i, c in enumerate(columns_to_insert) if c.lower() == k.lower()), None)
-                for k in conflict_keys_db
-            ]
-            key_indices = [i for i in key_indices if i is not None]
-            
-            # Only deduplicate if we actually have some conflict key indices in the CSV
-            if key_indices:
-                seen, deduped = set(), []
-                for row in data:
-                    key = tuple(row[i] for i in key_indices)
-                    if key in seen:
-                        dupes += 1
-                        continue
-                    seen.add(key)
-                    deduped.append(row)
-                data = deduped
-                if not data:
-                    return jsonify({'message': 'No unique rows after deduplication.'}), 400
-
-        # Validate string lengths before insertion to give precise error
-        col_max_lengths = {r['column_name'].lower(): r['character_maximum_length'] for r in col_rows if r.get('character_maximum_length')}
-        for row_idx, row in enumerate(data):
-            for col_idx, col_name in enumerate(columns_to_insert):
-                val = row[col_idx]
-                max_len = col_max_lengths.get(col_name.lower())
-                if val is not None and max_len is not None and len(str(val)) > max_len:
-                    error_details = f"Value '{val}' (length {len(str(val))}) exceeds maximum length {max_len} for column '{col_name}' at row {row_idx + 1}."
-                    print(f"\n{'='*80}")
-                    print(f"VALIDATION ERROR - String Too Long")
-                    print(f"{'='*80}")
-                    print(f"Table: {table_name}")
-                    print(f"Column: {col_name} (Max: {max_len})")
-                    print(f"Value: '{val}' (Length: {len(str(val))})")
-                    print(f"Row Index: {row_idx}")
-                    print(f"Full Row: {row}")
-                    print(f"{'='*80}\n")
-                    return jsonify({
-                        'message': 'Data Truncation Error', 
-                        'details': error_details
-                    }), 400
+        if not rows_processed:
+            return jsonify({'message': 'CSV contains no data rows.'}), 400
 
+        changed_tables = [table_name]
         if use_truncate:
+            changed_tables = _truncate_targets(cur, table_name)
             cur.execute(f'TRUNCATE TABLE "{table_name}" RESTART IDENTITY CASCADE;')
+
+        # One set-based merge; duplicates on the conflict key are dropped in SQL.
+        cur.execute("SAVEPOINT _merge")
         try:
-            psycopg2.extras.execute_values(cur, query, data)
-            conn.commit()
-        except Exception:
-            safe_rollback(conn)
-            _failing_row_num, _ = _find_failing_row(cur, conn, query, data, use_truncate, table_name)
-            raise
+            unique_rows = merge_staging(
+                cur, stage, table_name, columns_to_insert, column_types,
+                conflict_keys=merge_keys, update_cols=update_cols, dedupe_keys=conflict_keys_in_csv,
+            )
+        except Exception as merge_err:
+            try:
+                cur.execute("ROLLBACK TO SAVEPOINT _merge")
+                problems, total = find_invalid_rows(
+                    cur, stage, table_name, columns_to_insert,
+                    conflict_keys=merge_keys, dedupe_keys=conflict_keys_in_csv,
+                )
+                if problems:
+                    _failing_row_num = first_failing_row(problems, merge_err)
+                    _diagnosis = {'invalid_rows': problems, 'invalid_row_count': total}
+                    print(f"Upload diagnosis: {total} problem(s) found, first at CSV row {_failing_row_num}.")
+                else:
+                    _failing_row_num, _ = bisect_failing_row(
+                        cur, stage, table_name, columns_to_insert, column_types,
+                        merge_keys, update_cols, dedupe_keys=conflict_keys_in_csv,
+                    )
+            except Exception as e:
+                print(f"Upload diagnosis failed: {e}")
+            raise merge_err
+        conn.commit()
+        dupes = rows_processed - unique_rows
+
+        # Rebuild the aggregate cubes fed by the changed tables, then drop
+        # cached stats responses that read any of them.
+        aggregates.refresh(conn, changed_tables)
+        invalidate(*changed_tables)
 
         if use_truncate:
-            msg = f"Successfully replaced all data in '{table_name}' with {len(data)} rows."
+            msg = f"Successfully replaced all data in '{table_name}' with {unique_rows} rows."
         else:
-            msg = f"Successfully updated {len(data)} rows in '{table_name}'."
+            msg = f"Successfully updated {unique_rows} rows in '{table_name}'."
         if dupes > 0:
             msg += f" Removed {dupes} duplicate row(s)."
         
@@ -648,7 +411,7 @@ def upload_csv(current_user_id):
         print(f"{'='*80}")
         print(f"Table: {table_name}")
         print(f"Rows processed: {rows_processed}")
-        print(f"Rows inserted/updated: {len(data)}")
+        print(f"Rows inserted/updated: {unique_rows}")
         if dupes > 0:
             print(f"Duplicate rows removed: {dupes}")
         print(f"Columns inserted: {columns_to_insert}")
@@ -667,7 +430,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Data Too Long For Column{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 400
+                        'row_number': _failing_row_num, **_diagnosis}), 400
     except psycopg2.errors.UniqueViolation as e:
         safe_rollback(conn)
         error_msg = str(e).split('DETAIL:')[-1].strip()
@@ -679,7 +442,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Duplicate Entry Error{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 409
+                        'row_number': _failing_row_num, **_diagnosis}), 409
     except psycopg2.errors.InvalidTextRepresentation as e:
         safe_rollback(conn)
         error_msg = str(e).strip()
@@ -691,7 +454,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Data Format Error{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 400
+                        'row_number': _failing_row_num, **_diagnosis}), 400
     except psycopg2.errors.NotNullViolation as e:
         safe_rollback(conn)
         error_msg = str(e).strip()
@@ -703,7 +466,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Missing Required Data{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 400
+                        'row_number': _failing_row_num, **_diagnosis}), 400
     except psycopg2.errors.DatatypeMismatch as e:
         safe_rollback(conn)
         error_msg = str(e).strip()
@@ -715,7 +478,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Data Type Mismatch{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 400
+                        'row_number': _failing_row_num, **_diagnosis}), 400
     except psycopg2.errors.ForeignKeyViolation as e:
         safe_rollback(conn)
         error_msg = str(e).split('DETAIL:')[-1].strip()
@@ -727,7 +490,7 @@ def upload_csv(current_user_id):
         print(f"Error: {error_msg}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'Foreign Key Constraint Violation{row_hint}', 'details': error_msg,
-                        'row_number': _failing_row_num}), 400
+                        'row_number': _failing_row_num, **_diagnosis}), 400
     except Exception as e:
         safe_rollback(conn)
         error_msg = str(e)
@@ -741,7 +504,7 @@ def upload_csv(current_user_id):
         print(f"Traceback:\n{traceback.format_exc()}")
         print(f"{'='*80}\n")
         return jsonify({'message': f'An error occurred during processing{row_hint}.', 'error': error_msg,
-                        'row_number': _failing_row_num}), 500
+                        'row_number': _failing_row_num, **_diagnosis}), 500
     finally:
         if conn:
             try:
@@ -0,0 +1,24 @@
+"""
+ASGI entry point, for serving the API from an ASGI server instead of
+Flask's development server (run.py):
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Each worker runs the Flask views on a pool of ASGI_THREADS threads, so a
+dashboard's parallel requests are served side by side while the event loop
+keeps accepting connections. Needs the optional ``a2wsgi`` and ``uvicorn``
+packages (see requirements.txt); with ``psycopg`` installed as well, the
+independent queries inside an endpoint also run concurrently (app/async_db.py).
+
+Settings (environment variables):
+    ASGI_THREADS    requests handled at once per worker   (default 10)
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 10))
+
+app = WSGIMiddleware(create_app(), workers=ASGI_THREADS)
@@ -0,0 +1,22 @@
+-- Classifies each alumnus's outcome from current_job once, when the row is
+-- written, instead of on every IAR stats request. Mirrors the keyword list
+-- the dashboard used to apply in Python: an academic/research hint means
+-- HigherStudies, anything else (including no job) Corporate.
+--
+-- Already included in schema_dump.sql; run this only on databases restored
+-- from an older dump.
+
+ALTER TABLE public.alumni
+    ADD COLUMN IF NOT EXISTS outcome public.alumni_outcome_type
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN lower(current_job) LIKE ANY (ARRAY[
+                '%research%', '%phd%', '%ms %', '%msc%', '%fellow%', '%scholar%',
+                '%professor%', '%lecturer%', '%postdoc%', '%university%', '%institute%',
+                '%college%', '%academia%', '%doctoral%'
+            ]) THEN 'HigherStudies'::public.alumni_outcome_type
+            ELSE 'Corporate'::public.alumni_outcome_type
+        END
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_alumni_outcome ON public.alumni USING btree (outcome);
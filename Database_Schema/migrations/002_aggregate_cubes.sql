@@ -0,0 +1,87 @@
+-- Materialized aggregate "cubes" for the most-hit dashboards. Each cube
+-- groups its source table by every column the stats endpoints filter or
+-- group on, so any of those queries can be answered by summing cube rows
+-- instead of scanning the raw table. (placement_summary needs no cube: it
+-- already holds one row per year / program / gender.)
+--
+-- aggregate_status tracks freshness per cube: a statement-level trigger on
+-- the source table bumps source_version on every write, and a refresh (see
+-- Backend/app/aggregates.py, run after each successful upload) records the
+-- version it saw in refreshed_version. While refreshed_version lags behind,
+-- the endpoints read the live table instead.
+--
+-- Already included in schema_dump.sql; run this only on databases restored
+-- from an older dump.
+
+CREATE TABLE IF NOT EXISTS public.aggregate_status (
+    cube_name character varying(100) NOT NULL PRIMARY KEY,
+    source_table character varying(100) NOT NULL,
+    source_version bigint DEFAULT 0 NOT NULL,
+    refreshed_version bigint DEFAULT -1 NOT NULL,
+    refreshed_at timestamp with time zone
+);
+
+CREATE INDEX IF NOT EXISTS idx_aggregate_status_source ON public.aggregate_status USING btree (source_table);
+
+CREATE OR REPLACE FUNCTION public.mark_aggregates_stale() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.aggregate_status
+       SET source_version = source_version + 1
+     WHERE source_table = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$;
+
+
+-- student_table by year / program / batch / branch / department / category / gender / state / PwD
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.student_cube AS
+ SELECT admission_year, programme_current, admission_batch, stream_current,
+        department_current, original_category, gender, state, pwd_status,
+        count(*) AS student_count
+   FROM public.student_table
+  GROUP BY admission_year, programme_current, admission_batch, stream_current,
+           department_current, original_category, gender, state, pwd_status;
+
+CREATE UNIQUE INDEX IF NOT EXISTS student_cube_key ON public.student_cube
+    USING btree (admission_year, programme_current, admission_batch, stream_current,
+                 department_current, original_category, gender, state, pwd_status) NULLS NOT DISTINCT;
+
+
+-- employees by department / designation / gender / type / status / group / category
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.employee_cube AS
+ SELECT department, designation, gender, emp_type, empstatus, group_name, appointed_category,
+        count(*) AS employee_count
+   FROM public.employees
+  GROUP BY department, designation, gender, emp_type, empstatus, group_name, appointed_category;
+
+CREATE UNIQUE INDEX IF NOT EXISTS employee_cube_key ON public.employee_cube
+    USING btree (department, designation, gender, emp_type, empstatus, group_name, appointed_category) NULLS NOT DISTINCT;
+
+
+-- research_publications by year / department / type
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.publication_cube AS
+ SELECT publication_year, department, publication_type,
+        count(*) AS publication_count
+   FROM public.research_publications
+  GROUP BY publication_year, department, publication_type;
+
+CREATE UNIQUE INDEX IF NOT EXISTS publication_cube_key ON public.publication_cube
+    USING btree (publication_year, department, publication_type) NULLS NOT DISTINCT;
+
+
+INSERT INTO public.aggregate_status (cube_name, source_table, source_version, refreshed_version, refreshed_at)
+VALUES ('student_cube', 'student_table', 0, 0, now()),
+       ('employee_cube', 'employees', 0, 0, now()),
+       ('publication_cube', 'research_publications', 0, 0, now())
+ON CONFLICT (cube_name) DO NOTHING;
+
+CREATE OR REPLACE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.student_table
+    FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+CREATE OR REPLACE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.employees
+    FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+CREATE OR REPLACE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.research_publications
+    FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
@@ -0,0 +1,136 @@
+-- Employee headcount per calendar year, maintained incrementally from the
+-- doj / dor intervals of public.employees. One row per year and combination
+-- of the columns the administrative dashboards filter on, with two counts:
+--
+--   year_end_count  on the rolls on 31 December:
+--                   doj <= Y-12-31 AND (dor IS NULL OR dor >= Y-12-31)
+--   in_year_count   on the rolls at any point of the year:
+--                   doj <= Y-12-31 AND (dor IS NULL OR dor >= Y-01-01)
+--
+-- Statement-level triggers with transition tables add the contribution of
+-- inserted rows and subtract that of deleted ones (an UPDATE does both), so
+-- the table is always in step with employees inside the same transaction.
+-- Years are materialised up to employee_headcount_horizon.through_year;
+-- employee_headcount_extend() moves the horizon forward (the backend calls it
+-- once the calendar year passes it).
+--
+-- Already included in schema_dump.sql; run this only on databases restored
+-- from an older dump.
+
+CREATE TABLE IF NOT EXISTS public.employee_headcount (
+    year integer NOT NULL,
+    department character varying(150),
+    designation character varying(100),
+    gender character varying(10),
+    emp_type character varying(50),
+    employmentnature character varying(100),
+    group_name character varying(50),
+    appointed_category character varying(10),
+    year_end_count integer DEFAULT 0 NOT NULL,
+    in_year_count integer DEFAULT 0 NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS employee_headcount_key ON public.employee_headcount
+    USING btree (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category) NULLS NOT DISTINCT;
+
+CREATE TABLE IF NOT EXISTS public.employee_headcount_horizon (
+    through_year integer NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS employee_headcount_horizon_single_row ON public.employee_headcount_horizon
+    USING btree ((true));
+
+
+-- Adds sign * (contribution of the given employees) for years first_year..last_year.
+CREATE OR REPLACE FUNCTION public.employee_headcount_add(sign integer, changed public.employees[], first_year integer, last_year integer) RETURNS void
+    LANGUAGE sql
+    AS $$
+    INSERT INTO public.employee_headcount AS h
+           (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category,
+            year_end_count, in_year_count)
+    SELECT y.yr, e.department, e.designation, e.gender, e.emp_type, e.employmentnature, e.group_name, e.appointed_category,
+           sign * COUNT(*) FILTER (WHERE e.dor IS NULL OR e.dor >= make_date(y.yr, 12, 31)),
+           sign * COUNT(*)
+      FROM unnest(changed) e
+     CROSS JOIN LATERAL generate_series(
+               GREATEST(EXTRACT(YEAR FROM e.doj)::integer, first_year),
+               LEAST(COALESCE(EXTRACT(YEAR FROM e.dor)::integer, last_year), last_year)) AS y(yr)
+     WHERE e.doj IS NOT NULL
+     GROUP BY y.yr, e.department, e.designation, e.gender, e.emp_type, e.employmentnature, e.group_name, e.appointed_category
+    ON CONFLICT (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category)
+    DO UPDATE SET year_end_count = h.year_end_count + excluded.year_end_count,
+                  in_year_count = h.in_year_count + excluded.in_year_count;
+
+    DELETE FROM public.employee_headcount WHERE in_year_count = 0 AND year_end_count = 0;
+$$;
+
+
+CREATE OR REPLACE FUNCTION public.maintain_employee_headcount() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    horizon integer;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM public.employee_headcount;
+        RETURN NULL;
+    END IF;
+    -- Shared lock: employee_headcount_extend() must not move the horizon mid-statement.
+    SELECT through_year INTO horizon FROM public.employee_headcount_horizon FOR SHARE;
+    IF horizon IS NULL THEN
+        RETURN NULL;    -- not built yet; employee_headcount_extend() reads employees in full
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.employee_headcount_add(-1, ARRAY(SELECT o::public.employees FROM old_rows o), 1, horizon);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM public.employee_headcount_add(1, ARRAY(SELECT n::public.employees FROM new_rows n), 1, horizon);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+-- Materialises the years after the current horizon up to target_year. Returns the horizon.
+CREATE OR REPLACE FUNCTION public.employee_headcount_extend(target_year integer) RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    horizon integer;
+BEGIN
+    -- Waits for writers holding the horizon row, and blocks new ones until commit.
+    LOCK TABLE public.employee_headcount_horizon IN EXCLUSIVE MODE;
+    SELECT through_year INTO horizon FROM public.employee_headcount_horizon;
+    IF horizon IS NULL THEN
+        -- First build: every year of every employee.
+        DELETE FROM public.employee_headcount;
+        INSERT INTO public.employee_headcount_horizon VALUES (target_year);
+        PERFORM public.employee_headcount_add(1, ARRAY(SELECT e FROM public.employees e), 1, target_year);
+        RETURN target_year;
+    END IF;
+    IF target_year <= horizon THEN
+        RETURN horizon;
+    END IF;
+    PERFORM public.employee_headcount_add(1, ARRAY(SELECT e FROM public.employees e), horizon + 1, target_year);
+    UPDATE public.employee_headcount_horizon SET through_year = target_year;
+    RETURN target_year;
+END;
+$$;
+
+
+CREATE OR REPLACE TRIGGER employee_headcount_insert AFTER INSERT ON public.employees
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+CREATE OR REPLACE TRIGGER employee_headcount_update AFTER UPDATE ON public.employees
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+CREATE OR REPLACE TRIGGER employee_headcount_delete AFTER DELETE ON public.employees
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+CREATE OR REPLACE TRIGGER employee_headcount_truncate AFTER TRUNCATE ON public.employees
+    FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+SELECT public.employee_headcount_extend(EXTRACT(YEAR FROM CURRENT_DATE)::integer);
@@ -0,0 +1,63 @@
+-- Indexes for the dashboard filter columns. Each one is matched to the
+-- WHERE / GROUP BY / ORDER BY pattern of a blueprint; tests/explain_endpoints.py
+-- replays the endpoints through EXPLAIN ANALYZE and reports which index each
+-- query ends up using.
+--
+-- Already included in schema_dump.sql; run this only on databases restored
+-- from an older dump. On a large live database, run the statements one by one
+-- with CREATE INDEX CONCURRENTLY instead (outside --single-transaction).
+
+-- academic_stats: build_filter_query() filters on year of admission, then
+-- program, and groups by gender / program; get_latest_year() takes MAX(admission_year).
+-- (Live fallback while student_cube is being refreshed.)
+CREATE INDEX IF NOT EXISTS idx_student_table_year_program_gender
+    ON public.student_table USING btree (admission_year, programme_current, gender);
+
+CREATE INDEX IF NOT EXISTS idx_student_table_department_year
+    ON public.student_table USING btree (department_current, admission_year);
+
+-- administrative_stats: department x designation breakdown and the
+-- emp_type / empstatus filters.
+CREATE INDEX IF NOT EXISTS idx_employees_department_designation
+    ON public.employees USING btree (department, designation);
+
+CREATE INDEX IF NOT EXISTS idx_employees_type_status
+    ON public.employees USING btree (emp_type, empstatus);
+
+-- yearwise-strength fallback: doj / dor window and MIN(doj).
+CREATE INDEX IF NOT EXISTS idx_employees_tenure
+    ON public.employees USING btree (doj, dor);
+
+-- faculty-gender-last-five-years fallback only ever reads Teaching staff.
+CREATE INDEX IF NOT EXISTS idx_employees_teaching_tenure
+    ON public.employees USING btree (doj, dor) INCLUDE (gender)
+    WHERE emp_type = 'Teaching';
+
+-- iar_stats: year / department / course_type filters.
+CREATE INDEX IF NOT EXISTS idx_alumni_year_department
+    ON public.alumni USING btree (year_of_graduation, department);
+
+CREATE INDEX IF NOT EXISTS idx_alumni_department_course
+    ON public.alumni USING btree (department, course_type);
+
+-- research_module: publication filters (the list orders by year, then title).
+CREATE INDEX IF NOT EXISTS idx_research_publications_year_department
+    ON public.research_publications USING btree (publication_year, department);
+
+CREATE INDEX IF NOT EXISTS idx_research_publications_department_year
+    ON public.research_publications USING btree (department, publication_year);
+
+-- education_stats: year / department filters, department x engagement_type
+-- breakdown, list ordered by year.
+CREATE INDEX IF NOT EXISTS idx_faculty_engagement_year_department
+    ON public.faculty_engagement USING btree (year, department);
+
+CREATE INDEX IF NOT EXISTS idx_faculty_engagement_department_type
+    ON public.faculty_engagement USING btree (department, engagement_type);
+
+-- placement_stats: company views filter on year and sector, grouping by year.
+CREATE INDEX IF NOT EXISTS idx_placement_companies_year_sector
+    ON public.placement_companies USING btree (placement_year, sector);
+
+ANALYZE public.student_table, public.employees, public.alumni,
+        public.research_publications, public.faculty_engagement, public.placement_companies;
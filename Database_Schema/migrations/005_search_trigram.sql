@@ -0,0 +1,60 @@
+-- Trigram indexes for the ``search`` parameter of the list endpoints
+-- (Backend/app/search.py). search.condition() matches the term with
+-- ILIKE '%term%' on each searched column; a B-tree cannot serve a leading
+-- wildcard, a pg_trgm GIN index can (for terms of three or more characters).
+-- With pg_trgm installed the backend also ranks matches by word_similarity().
+--
+-- NOT included in schema_dump.sql: pg_trgm is a contrib module that not every
+-- PostgreSQL install ships. On a server without it this script only prints a
+-- notice, and search keeps working on sequential scans. Run it on any database
+-- whose server has pg_trgm (creating the extension needs the CREATE privilege
+-- on the database), then restart the backend so ranking switches over.
+-- Columns of tables missing from the database are skipped.
+
+DO $$
+DECLARE
+    target record;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        RAISE NOTICE 'pg_trgm is not available on this server; search indexes not created';
+        RETURN;
+    END IF;
+
+    CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+    FOR target IN
+        SELECT c.table_name, c.column_name
+          FROM (VALUES
+                    ('startups', 'startup_name'),
+                    ('startups', 'founder_name'),
+                    ('startups', 'innovation_focus_area'),
+                    ('courses_table', 'course_code'),
+                    ('courses_table', 'course_name'),
+                    ('courses_table', 'proposing_faculty_name'),
+                    ('industry_events', 'event_name'),
+                    ('industry_events', 'hosted_by'),
+                    ('industry_events', 'target_audience'),
+                    ('open_house', 'theme'),
+                    ('open_house', 'target_audience'),
+                    ('open_house', 'departments_participated'),
+                    ('outreach', 'program_name'),
+                    ('research_publications', 'publication_title'),
+                    ('research_publications', 'journal_name'),
+                    ('research_publications', 'faculty_name'),
+                    ('research_patents', 'patent_title'),
+                    ('research_patents', 'inventor1'),
+                    ('research_patents', 'inventor2'),
+                    ('research_patents', 'inventor3'),
+                    ('research_patents', 'inventor4')
+               ) AS wanted(table_name, column_name)
+          JOIN information_schema.columns c
+            ON c.table_schema = 'public'
+           AND c.table_name = wanted.table_name
+           AND c.column_name = wanted.column_name
+    LOOP
+        EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON public.%I USING gin (%I public.gin_trgm_ops)',
+                       'idx_' || target.table_name || '_' || target.column_name || '_trgm',
+                       target.table_name, target.column_name);
+    END LOOP;
+END;
+$$;
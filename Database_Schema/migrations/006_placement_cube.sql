@@ -0,0 +1,65 @@
+-- Placement fact cube: placement_summary (year / program / gender counts)
+-- pre-joined with placement_packages (year / program package figures), so
+-- the summary, the trends and the breakdowns of the placement dashboard are
+-- each answered by one aggregate over one relation.
+--
+-- One row per year / program / gender of placement_summary, carrying the
+-- package figures of its year and program; a package row with no matching
+-- summary row appears once with a NULL gender and NULL counts. Package
+-- figures repeat on every gender row of their program, so package_row marks
+-- exactly one row per placement_packages row: package statistics aggregate
+-- over ``FILTER (WHERE package_row)``.
+--
+-- placement_packages.placement_year is text, placement_summary's an integer:
+-- the cube keeps the year as text (the join key).
+--
+-- Freshness works as for the cubes of 002_aggregate_cubes.sql. The cube has
+-- two sources, so mark_aggregates_stale() now also takes the names of the
+-- cubes to mark as trigger arguments (placement_packages passes
+-- 'placement_cube'); the backend refreshes it after either table is uploaded.
+-- Keep the SELECT in step with aggregates.PLACEMENT_FACTS, which the
+-- endpoints read while the cube is stale.
+--
+-- Already included in schema_dump.sql; run this only on databases restored
+-- from an older dump.
+
+CREATE OR REPLACE FUNCTION public.mark_aggregates_stale() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.aggregate_status
+       SET source_version = source_version + 1
+     WHERE source_table = TG_TABLE_NAME OR cube_name = ANY(TG_ARGV);
+    RETURN NULL;
+END;
+$$;
+
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.placement_cube AS
+ SELECT COALESCE(s.placement_year::text, p.placement_year) AS placement_year,
+        COALESCE(s.program, p.program) AS program,
+        s.gender,
+        s.registered,
+        s.placed,
+        p.highest_package,
+        p.lowest_package,
+        p.average_package,
+        (p.placement_year IS NOT NULL
+         AND row_number() OVER (PARTITION BY p.placement_year, p.program ORDER BY s.gender) = 1) AS package_row
+   FROM public.placement_summary s
+   FULL JOIN public.placement_packages p
+     ON p.placement_year = s.placement_year::text AND p.program = s.program;
+
+CREATE UNIQUE INDEX IF NOT EXISTS placement_cube_key ON public.placement_cube
+    USING btree (placement_year, program, gender) NULLS NOT DISTINCT;
+
+
+INSERT INTO public.aggregate_status (cube_name, source_table, source_version, refreshed_version, refreshed_at)
+VALUES ('placement_cube', 'placement_summary', 0, 0, now())
+ON CONFLICT (cube_name) DO NOTHING;
+
+CREATE OR REPLACE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.placement_summary
+    FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+CREATE OR REPLACE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.placement_packages
+    FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale('placement_cube');
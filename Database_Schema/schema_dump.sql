@@ -348,6 +348,175 @@ SET default_tablespace = '';
 
 SET default_table_access_method = heap;
 
+--
+-- Name: employees; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.employees (
+    id character varying(150) NOT NULL,
+    empid character varying(50),
+    empname character varying(150),
+    designation character varying(100),
+    phonenumber character varying(20),
+    bloodgroup character varying(10),
+    dob date,
+    initial_doj date,
+    doj date,
+    dor date,
+    gender character varying(10),
+    email character varying(150),
+    personalmail character varying(150),
+    marital_status character varying(20),
+    address text,
+    paylevel character varying(20),
+    group_name character varying(50),
+    ltchometown character varying(150),
+    employmentnature character varying(100),
+    appointmentmode character varying(100),
+    basicpay numeric(10,2),
+    department character varying(150),
+    emp_type character varying(50),
+    pwd character varying(255),
+    notificationnumber character varying(100),
+    notificationdate date,
+    empstatus character varying(50),
+    prior_industry_exp_in_months integer,
+    prior_research_exp_in_months integer,
+    prior_teaching_exp_in_months integer,
+    total_teaching_exp_in_months integer,
+    original_category character varying(10),
+    appointed_category character varying(10)
+);
+
+
+ALTER TABLE public.employees OWNER TO postgres;
+
+--
+-- Name: employee_headcount_add(integer, public.employees[], integer, integer); Type: FUNCTION; Schema: public; Owner: postgres
+--
+
+CREATE FUNCTION public.employee_headcount_add(sign integer, changed public.employees[], first_year integer, last_year integer) RETURNS void
+    LANGUAGE sql
+    AS $$
+    INSERT INTO public.employee_headcount AS h
+           (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category,
+            year_end_count, in_year_count)
+    SELECT y.yr, e.department, e.designation, e.gender, e.emp_type, e.employmentnature, e.group_name, e.appointed_category,
+           sign * COUNT(*) FILTER (WHERE e.dor IS NULL OR e.dor >= make_date(y.yr, 12, 31)),
+           sign * COUNT(*)
+      FROM unnest(changed) e
+     CROSS JOIN LATERAL generate_series(
+               GREATEST(EXTRACT(YEAR FROM e.doj)::integer, first_year),
+               LEAST(COALESCE(EXTRACT(YEAR FROM e.dor)::integer, last_year), last_year)) AS y(yr)
+     WHERE e.doj IS NOT NULL
+     GROUP BY y.yr, e.department, e.designation, e.gender, e.emp_type, e.employmentnature, e.group_name, e.appointed_category
+    ON CONFLICT (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category)
+    DO UPDATE SET year_end_count = h.year_end_count + excluded.year_end_count,
+                  in_year_count = h.in_year_count + excluded.in_year_count;
+
+    DELETE FROM public.employee_headcount WHERE in_year_count = 0 AND year_end_count = 0;
+$$;
+
+
+ALTER FUNCTION public.employee_headcount_add(sign integer, changed public.employees[], first_year integer, last_year integer) OWNER TO postgres;
+
+--
+-- Name: employee_headcount_extend(integer); Type: FUNCTION; Schema: public; Owner: postgres
+--
+
+CREATE FUNCTION public.employee_headcount_extend(target_year integer) RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    horizon integer;
+BEGIN
+    -- Waits for writers holding the horizon row, and blocks new ones until commit.
+    LOCK TABLE public.employee_headcount_horizon IN EXCLUSIVE MODE;
+    SELECT through_year INTO horizon FROM public.employee_headcount_horizon;
+    IF horizon IS NULL THEN
+        -- First build: every year of every employee.
+        DELETE FROM public.employee_headcount;
+        INSERT INTO public.employee_headcount_horizon VALUES (target_year);
+        PERFORM public.employee_headcount_add(1, ARRAY(SELECT e FROM public.employees e), 1, target_year);
+        RETURN target_year;
+    END IF;
+    IF target_year <= horizon THEN
+        RETURN horizon;
+    END IF;
+    PERFORM public.employee_headcount_add(1, ARRAY(SELECT e FROM public.employees e), horizon + 1, target_year);
+    UPDATE public.employee_headcount_horizon SET through_year = target_year;
+    RETURN target_year;
+END;
+$$;
+
+
+ALTER FUNCTION public.employee_headcount_extend(target_year integer) OWNER TO postgres;
+
+--
+-- Name: maintain_employee_headcount(); Type: FUNCTION; Schema: public; Owner: postgres
+--
+
+CREATE FUNCTION public.maintain_employee_headcount() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    horizon integer;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM public.employee_headcount;
+        RETURN NULL;
+    END IF;
+    -- Shared lock: employee_headcount_extend() must not move the horizon mid-statement.
+    SELECT through_year INTO horizon FROM public.employee_headcount_horizon FOR SHARE;
+    IF horizon IS NULL THEN
+        RETURN NULL;    -- not built yet; employee_headcount_extend() reads employees in full
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.employee_headcount_add(-1, ARRAY(SELECT o::public.employees FROM old_rows o), 1, horizon);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM public.employee_headcount_add(1, ARRAY(SELECT n::public.employees FROM new_rows n), 1, horizon);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION public.maintain_employee_headcount() OWNER TO postgres;
+
+--
+-- Name: mark_aggregates_stale(); Type: FUNCTION; Schema: public; Owner: postgres
+--
+
+CREATE FUNCTION public.mark_aggregates_stale() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.aggregate_status
+       SET source_version = source_version + 1
+     WHERE source_table = TG_TABLE_NAME OR cube_name = ANY(TG_ARGV);
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION public.mark_aggregates_stale() OWNER TO postgres;
+
+--
+-- Name: aggregate_status; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.aggregate_status (
+    cube_name character varying(100) NOT NULL,
+    source_table character varying(100) NOT NULL,
+    source_version bigint DEFAULT 0 NOT NULL,
+    refreshed_version bigint DEFAULT '-1'::integer NOT NULL,
+    refreshed_at timestamp with time zone
+);
+
+
+ALTER TABLE public.aggregate_status OWNER TO postgres;
+
 --
 -- Name: alumni; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -366,7 +535,12 @@ CREATE TABLE public.alumni (
     alumni_contribution text,
     gender character varying(10),
     name character varying(150),
-    sector character varying(50)
+    sector character varying(50),
+    outcome public.alumni_outcome_type GENERATED ALWAYS AS (
+CASE
+    WHEN (lower(current_job) ~~ ANY (ARRAY['%research%'::text, '%phd%'::text, '%ms %'::text, '%msc%'::text, '%fellow%'::text, '%scholar%'::text, '%professor%'::text, '%lecturer%'::text, '%postdoc%'::text, '%university%'::text, '%institute%'::text, '%college%'::text, '%academia%'::text, '%doctoral%'::text])) THEN 'HigherStudies'::public.alumni_outcome_type
+    ELSE 'Corporate'::public.alumni_outcome_type
+END) STORED
 );
 
 
@@ -417,47 +591,55 @@ CREATE TABLE public.department (
 ALTER TABLE public.department OWNER TO postgres;
 
 --
--- Name: employees; Type: TABLE; Schema: public; Owner: postgres
+-- Name: employee_cube; Type: MATERIALIZED VIEW; Schema: public; Owner: postgres
 --
 
-CREATE TABLE public.employees (
-    id character varying(150) NOT NULL,
-    empid character varying(50),
-    empname character varying(150),
+CREATE MATERIALIZED VIEW public.employee_cube AS
+ SELECT department,
+    designation,
+    gender,
+    emp_type,
+    empstatus,
+    group_name,
+    appointed_category,
+    count(*) AS employee_count
+   FROM public.employees
+  GROUP BY department, designation, gender, emp_type, empstatus, group_name, appointed_category
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW public.employee_cube OWNER TO postgres;
+
+--
+-- Name: employee_headcount; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.employee_headcount (
+    year integer NOT NULL,
+    department character varying(150),
     designation character varying(100),
-    phonenumber character varying(20),
-    bloodgroup character varying(10),
-    dob date,
-    initial_doj date,
-    doj date,
-    dor date,
     gender character varying(10),
-    email character varying(150),
-    personalmail character varying(150),
-    marital_status character varying(20),
-    address text,
-    paylevel character varying(20),
-    group_name character varying(50),
-    ltchometown character varying(150),
-    employmentnature character varying(100),
-    appointmentmode character varying(100),
-    basicpay numeric(10,2),
-    department character varying(150),
     emp_type character varying(50),
-    pwd character varying(255),
-    notificationnumber character varying(100),
-    notificationdate date,
-    empstatus character varying(50),
-    prior_industry_exp_in_months integer,
-    prior_research_exp_in_months integer,
-    prior_teaching_exp_in_months integer,
-    total_teaching_exp_in_months integer,
-    original_category character varying(10),
-    appointed_category character varying(10)
+    employmentnature character varying(100),
+    group_name character varying(50),
+    appointed_category character varying(10),
+    year_end_count integer DEFAULT 0 NOT NULL,
+    in_year_count integer DEFAULT 0 NOT NULL
 );
 
 
-ALTER TABLE public.employees OWNER TO postgres;
+ALTER TABLE public.employee_headcount OWNER TO postgres;
+
+--
+-- Name: employee_headcount_horizon; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.employee_headcount_horizon (
+    through_year integer NOT NULL
+);
+
+
+ALTER TABLE public.employee_headcount_horizon OWNER TO postgres;
 
 --
 -- Name: ewd_yearwise; Type: TABLE; Schema: public; Owner: postgres
@@ -1077,6 +1259,27 @@ CREATE TABLE public.placement_summary (
 
 ALTER TABLE public.placement_summary OWNER TO postgres;
 
+--
+-- Name: placement_cube; Type: MATERIALIZED VIEW; Schema: public; Owner: postgres
+--
+
+CREATE MATERIALIZED VIEW public.placement_cube AS
+ SELECT COALESCE((s.placement_year)::text, (p.placement_year)::text) AS placement_year,
+    COALESCE(s.program, p.program) AS program,
+    s.gender,
+    s.registered,
+    s.placed,
+    p.highest_package,
+    p.lowest_package,
+    p.average_package,
+    ((p.placement_year IS NOT NULL) AND (row_number() OVER (PARTITION BY p.placement_year, p.program ORDER BY s.gender) = 1)) AS package_row
+   FROM (public.placement_summary s
+     FULL JOIN public.placement_packages p ON ((((p.placement_year)::text = (s.placement_year)::text) AND (p.program = s.program))))
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW public.placement_cube OWNER TO postgres;
+
 --
 -- Name: research_mous; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -1161,6 +1364,7 @@ ALTER SEQUENCE public.research_patents_patent_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.research_patents_patent_id_seq OWNED BY public.research_patents.patent_id;
 
 
+
 --
 -- Name: research_publications; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -1179,6 +1383,22 @@ CREATE TABLE public.research_publications (
 
 ALTER TABLE public.research_publications OWNER TO postgres;
 
+--
+-- Name: publication_cube; Type: MATERIALIZED VIEW; Schema: public; Owner: postgres
+--
+
+CREATE MATERIALIZED VIEW public.publication_cube AS
+ SELECT publication_year,
+    department,
+    publication_type,
+    count(*) AS publication_count
+   FROM public.research_publications
+  GROUP BY publication_year, department, publication_type
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW public.publication_cube OWNER TO postgres;
+
 --
 -- Name: research_publications_publication_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
 --
@@ -1311,6 +1531,28 @@ CREATE TABLE public.student_table (
 
 ALTER TABLE public.student_table OWNER TO postgres;
 
+--
+-- Name: student_cube; Type: MATERIALIZED VIEW; Schema: public; Owner: postgres
+--
+
+CREATE MATERIALIZED VIEW public.student_cube AS
+ SELECT admission_year,
+    programme_current,
+    admission_batch,
+    stream_current,
+    department_current,
+    original_category,
+    gender,
+    state,
+    pwd_status,
+    count(*) AS student_count
+   FROM public.student_table
+  GROUP BY admission_year, programme_current, admission_batch, stream_current, department_current, original_category, gender, state, pwd_status
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW public.student_cube OWNER TO postgres;
+
 --
 -- Name: techin_program_table; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -1597,6 +1839,14 @@ ALTER TABLE ONLY public.uba_projects ALTER COLUMN project_id SET DEFAULT nextval
 ALTER TABLE ONLY public.users ALTER COLUMN id SET DEFAULT nextval('public.users_id_seq'::regclass);
 
 
+--
+-- Name: aggregate_status aggregate_status_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.aggregate_status
+    ADD CONSTRAINT aggregate_status_pkey PRIMARY KEY (cube_name);
+
+
 --
 -- Name: alumni alumni_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1941,6 +2191,97 @@ ALTER TABLE ONLY public.users
     ADD CONSTRAINT users_username_key UNIQUE (username);
 
 
+--
+-- Name: employee_cube_key; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX employee_cube_key ON public.employee_cube USING btree (department, designation, gender, emp_type, empstatus, group_name, appointed_category) NULLS NOT DISTINCT;
+
+
+--
+-- Name: employee_headcount_horizon_single_row; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX employee_headcount_horizon_single_row ON public.employee_headcount_horizon USING btree ((true));
+
+
+--
+-- Name: employee_headcount_key; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX employee_headcount_key ON public.employee_headcount USING btree (year, department, designation, gender, emp_type, employmentnature, group_name, appointed_category) NULLS NOT DISTINCT;
+
+
+--
+-- Name: idx_aggregate_status_source; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_aggregate_status_source ON public.aggregate_status USING btree (source_table);
+
+
+--
+-- Name: idx_alumni_department_course; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_alumni_department_course ON public.alumni USING btree (department, course_type);
+
+
+--
+-- Name: idx_alumni_outcome; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_alumni_outcome ON public.alumni USING btree (outcome);
+
+
+--
+-- Name: idx_alumni_year_department; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_alumni_year_department ON public.alumni USING btree (year_of_graduation, department);
+
+
+--
+-- Name: idx_employees_department_designation; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_employees_department_designation ON public.employees USING btree (department, designation);
+
+
+--
+-- Name: idx_employees_teaching_tenure; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_employees_teaching_tenure ON public.employees USING btree (doj, dor) INCLUDE (gender) WHERE ((emp_type)::text = 'Teaching'::text);
+
+
+--
+-- Name: idx_employees_tenure; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_employees_tenure ON public.employees USING btree (doj, dor);
+
+
+--
+-- Name: idx_employees_type_status; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_employees_type_status ON public.employees USING btree (emp_type, empstatus);
+
+
+--
+-- Name: idx_faculty_engagement_department_type; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_faculty_engagement_department_type ON public.faculty_engagement USING btree (department, engagement_type);
+
+
+--
+-- Name: idx_faculty_engagement_year_department; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_faculty_engagement_year_department ON public.faculty_engagement USING btree (year, department);
+
+
 --
 -- Name: idx_innovation_projects_sector; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1969,6 +2310,41 @@ CREATE INDEX idx_open_house_date ON public.open_house USING btree (event_date);
 CREATE INDEX idx_open_house_year ON public.open_house USING btree (event_year);
 
 
+--
+-- Name: idx_placement_companies_year_sector; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_placement_companies_year_sector ON public.placement_companies USING btree (placement_year, sector);
+
+
+--
+-- Name: idx_research_publications_department_year; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_research_publications_department_year ON public.research_publications USING btree (department, publication_year);
+
+
+--
+-- Name: idx_research_publications_year_department; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_research_publications_year_department ON public.research_publications USING btree (publication_year, department);
+
+
+--
+-- Name: idx_student_table_department_year; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_student_table_department_year ON public.student_table USING btree (department_current, admission_year);
+
+
+--
+-- Name: idx_student_table_year_program_gender; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_student_table_year_program_gender ON public.student_table USING btree (admission_year, programme_current, gender);
+
+
 --
 -- Name: idx_uba_events_date; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1983,6 +2359,90 @@ CREATE INDEX idx_uba_events_date ON public.uba_events USING btree (event_date);
 CREATE INDEX idx_uba_projects_status ON public.uba_projects USING btree (project_status);
 
 
+--
+-- Name: placement_cube_key; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX placement_cube_key ON public.placement_cube USING btree (placement_year, program, gender) NULLS NOT DISTINCT;
+
+
+--
+-- Name: publication_cube_key; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX publication_cube_key ON public.publication_cube USING btree (publication_year, department, publication_type) NULLS NOT DISTINCT;
+
+
+--
+-- Name: student_cube_key; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX student_cube_key ON public.student_cube USING btree (admission_year, programme_current, admission_batch, stream_current, department_current, original_category, gender, state, pwd_status) NULLS NOT DISTINCT;
+
+
+--
+-- Name: employees aggregate_source_changed; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.employees FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+
+--
+-- Name: placement_packages aggregate_source_changed; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.placement_packages FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale('placement_cube');
+
+
+--
+-- Name: placement_summary aggregate_source_changed; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.placement_summary FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+
+--
+-- Name: research_publications aggregate_source_changed; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.research_publications FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+
+--
+-- Name: student_table aggregate_source_changed; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER aggregate_source_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.student_table FOR EACH STATEMENT EXECUTE FUNCTION public.mark_aggregates_stale();
+
+
+--
+-- Name: employees employee_headcount_delete; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER employee_headcount_delete AFTER DELETE ON public.employees REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+
+--
+-- Name: employees employee_headcount_insert; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER employee_headcount_insert AFTER INSERT ON public.employees REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+
+--
+-- Name: employees employee_headcount_truncate; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER employee_headcount_truncate AFTER TRUNCATE ON public.employees FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+
+--
+-- Name: employees employee_headcount_update; Type: TRIGGER; Schema: public; Owner: postgres
+--
+
+CREATE TRIGGER employee_headcount_update AFTER UPDATE ON public.employees REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.maintain_employee_headcount();
+
+
 --
 -- Name: users fk_role; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -17,10 +17,7 @@ import {
 
 import {
   fetchFilterOptions,
-  fetchSummary,
-  fetchStateDistribution,
-  fetchCountryDistribution,
-  fetchOutcomeBreakdown
+  fetchDashboard
 } from '../services/iarStats';
 
 import DataUploadModal from './DataUploadModal';
@@ -116,16 +113,11 @@ function IarSection({ user, isPublicView = false }) {
     try {
       setLoading(true);
       setError(null);
-      const [summaryResp, stateResp, countryResp, outcomeResp] = await Promise.all([
-        fetchSummary(filters, token),
-        fetchStateDistribution(filters, token),
-        fetchCountryDistribution(filters, token),
-        fetchOutcomeBreakdown(filters, token)
-      ]);
-      setSummary(summaryResp?.data || { total_alumni: 0, higher_studies: 0, corporate: 0, trend: [] });
-      setStateDistribution(stateResp?.data || []);
-      setCountryDistribution(countryResp?.data || []);
-      setOutcomeBreakdown(outcomeResp?.data || []);
+      const dashboard = (await fetchDashboard(filters, token))?.data || {};
+      setSummary(dashboard.summary || { total_alumni: 0, higher_studies: 0, corporate: 0, trend: [] });
+      setStateDistribution(dashboard.state_distribution || []);
+      setCountryDistribution(dashboard.country_distribution || []);
+      setOutcomeBreakdown(dashboard.outcome_breakdown || []);
     } catch (err) {
       console.error('Failed to load IAR data:', err);
       setError(err.message || 'Failed to load alumni statistics.');
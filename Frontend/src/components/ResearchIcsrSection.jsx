@@ -14,9 +14,7 @@ import {
 
 import {
   fetchResearchFilterOptions,
-  fetchIcsrSummary,
-  fetchIcsrProjectTrend,
-  fetchConsultancyTrend,
+  fetchIcsrOverview,
   fetchIcsrProjectList,
   fetchMouTrend,
   fetchMouList,
@@ -197,18 +195,14 @@ function ResearchIcsrSection({ user, isPublicView = false }) {
         setError(null);
 
         const [
-          summaryResp,
-          projectTrendResp,
-          consultancyTrendResp,
+          overviewResp,
           projectListResp,
           mouTrendResp,
           mouListResp,
           patentStatsResp,
           patentListResp
         ] = await Promise.all([
-          fetchIcsrSummary(filters, token),
-          fetchIcsrProjectTrend(filters, token),
-          fetchConsultancyTrend(filters, token),
+          fetchIcsrOverview(filters, token),
           fetchIcsrProjectList(filters, token),
           fetchMouTrend(token),
           fetchMouList({ mou_year: filters.mou_year }, token),
@@ -228,6 +222,7 @@ function ResearchIcsrSection({ user, isPublicView = false }) {
           )
         ]);
 
+        const summaryResp = overviewResp?.summary;
         setSummary({
           funded_projects: summaryResp?.funded_projects || 0,
           consultancy_projects: summaryResp?.consultancy_projects || 0,
@@ -240,8 +235,8 @@ function ResearchIcsrSection({ user, isPublicView = false }) {
           patent_breakdown: buildPatentBreakdown(summaryResp?.patent_breakdown)
         });
 
-        setProjectTrend(projectTrendResp?.data || []);
-        setConsultancyTrend(consultancyTrendResp?.data || []);
+        setProjectTrend(overviewResp?.project_trend || []);
+        setConsultancyTrend(overviewResp?.revenue_trend || []);
         setProjectList(projectListResp?.data || []);
         setMouTrend(mouTrendResp?.data || []);
         setMouList(mouListResp?.data || []);
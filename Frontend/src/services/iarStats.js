@@ -75,3 +75,14 @@ export const fetchOutcomeBreakdown = async (filters, token) => {
   }
 };
 
+
+// Summary, trend, state, country and outcome views in one request (one table scan).
+export const fetchDashboard = async (filters, token) => {
+  try {
+    const query = buildQueryParams(filters);
+    const response = await axios.get(`${API_BASE_URL}/dashboard?${query}`, authHeaders(token));
+    return response.data;
+  } catch (error) {
+    handleError(error, 'Failed to fetch alumni statistics');
+  }
+};
@@ -38,9 +38,15 @@ export const fetchIptifSummary = async (token) => {
 };
 
 // Trends and Data Lists
+// Columns the list tables render; the backend returns only these.
+const PROJECT_FIELDS = 'project_name,scheme,status,start_date';
+const PROGRAM_FIELDS = 'program_name,type,association,targetted_audi,no_of_attendees';
+const STARTUP_FIELDS = 'startup_name,domain,status,number_of_jobs,revenue';
+const FACILITY_FIELDS = 'facility_name,facility_type,availability_status,financial_year,revenue_made';
+
 export const fetchIptifProjects = async (filters, token) => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/trends/projects${buildQuery(filters)}`, authHeaders(token));
+    const response = await axios.get(`${API_BASE_URL}/trends/projects${buildQuery({ ...filters, fields: PROJECT_FIELDS })}`, authHeaders(token));
     return response.data;
   } catch (error) {
     handleError(error, 'Failed to fetch IPTIF projects');
@@ -49,7 +55,7 @@ export const fetchIptifProjects = async (filters, token) => {
 
 export const fetchIptifPrograms = async (filters, token) => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/trends/programs${buildQuery(filters)}`, authHeaders(token));
+    const response = await axios.get(`${API_BASE_URL}/trends/programs${buildQuery({ ...filters, fields: PROGRAM_FIELDS })}`, authHeaders(token));
     return response.data;
   } catch (error) {
     handleError(error, 'Failed to fetch IPTIF programs');
@@ -58,7 +64,7 @@ export const fetchIptifPrograms = async (filters, token) => {
 
 export const fetchIptifStartups = async (filters, token) => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/trends/startups${buildQuery(filters)}`, authHeaders(token));
+    const response = await axios.get(`${API_BASE_URL}/trends/startups${buildQuery({ ...filters, fields: STARTUP_FIELDS })}`, authHeaders(token));
     return response.data;
   } catch (error) {
     handleError(error, 'Failed to fetch IPTIF startups');
@@ -67,7 +73,7 @@ export const fetchIptifStartups = async (filters, token) => {
 
 export const fetchIptifFacilities = async (filters, token) => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/trends/facilities${buildQuery(filters)}`, authHeaders(token));
+    const response = await axios.get(`${API_BASE_URL}/trends/facilities${buildQuery({ ...filters, fields: FACILITY_FIELDS })}`, authHeaders(token));
     return response.data;
   } catch (error) {
     handleError(error, 'Failed to fetch IPTIF facilities');
@@ -37,6 +37,16 @@ export const fetchResearchFilterOptions = async (token) => {
   }
 };
 
+// Summary cards, project trend and revenue trend in one request.
+export const fetchIcsrOverview = async (filters, token) => {
+  try {
+    const response = await axios.get(`${API_BASE_URL}/overview${buildQuery(filters)}`, authHeaders(token));
+    return response.data;
+  } catch (error) {
+    handleError(error, 'Failed to fetch ICSR overview');
+  }
+};
+
 export const fetchIcsrSummary = async (filters, token) => {
   try {
     const response = await axios.get(`${API_BASE_URL}/summary${buildQuery(filters)}`, authHeaders(token));
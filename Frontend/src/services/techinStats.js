@@ -19,6 +19,11 @@ const buildQuery = (filters) => {
   return queryString ? `?${queryString}` : '';
 };
 
+// Columns the list tables render; the backend returns only these.
+const PROGRAM_FIELDS = 'program_name,type,association,start_end,event_date,no_of_attendess';
+const SKILL_DEV_FIELDS = 'program_name,category,association,start_end,event_date,no_of_attendess';
+const STARTUP_FIELDS = 'startup_name,domain,status,number_of_jobs,revenue';
+
 // ===================
 // TechIn API Endpoints
 // ===================
@@ -35,7 +40,7 @@ export const fetchTechinSummary = async (token) => {
 
 export const fetchTechinPrograms = async (filters, token) => {
   try {
-    const query = buildQuery(filters);
+    const query = buildQuery({ ...filters, fields: PROGRAM_FIELDS });
     const response = await axios.get(`${BASE_URL}/trends/programs${query}`, getHeaders(token));
     return response.data;
   } catch (error) {
@@ -46,7 +51,7 @@ export const fetchTechinPrograms = async (filters, token) => {
 
 export const fetchTechinSkillDev = async (filters, token) => {
   try {
-    const query = buildQuery(filters);
+    const query = buildQuery({ ...filters, fields: SKILL_DEV_FIELDS });
     const response = await axios.get(`${BASE_URL}/trends/skill-dev${query}`, getHeaders(token));
     return response.data;
   } catch (error) {
@@ -57,7 +62,7 @@ export const fetchTechinSkillDev = async (filters, token) => {
 
 export const fetchTechinStartups = async (filters, token) => {
   try {
-    const query = buildQuery(filters);
+    const query = buildQuery({ ...filters, fields: STARTUP_FIELDS });
     const response = await axios.get(`${BASE_URL}/trends/startups${query}`, getHeaders(token));
     return response.data;
   } catch (error) {
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: faculty gender distribution per year.
+
+Compares the old implementation (one COUNT(*) query per year x gender, i.e.
+20 round-trips for five years) against the single generate_series + FILTER
+query now used by /api/administrative/stats/faculty-gender-last-five-years.
+Both are run against the database in DATABASE_URL and their results are
+checked for equality before timings are reported.
+
+Usage:
+    python tests/bench_faculty_gender.py
+    python tests/bench_faculty_gender.py --start-year 2010 --end-year 2024 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "Backend"
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from app.administrative_stats import FACULTY_GENDER_BY_YEAR_QUERY, FACULTY_GENDERS  # noqa: E402
+
+LEGACY_QUERY = """
+    SELECT COUNT(*) AS count
+    FROM employees
+    WHERE doj <= make_date(%s, 12, 31)
+      AND (dor IS NULL OR dor >= make_date(%s, 1, 1))
+      AND gender = %s
+      AND emp_type = 'Teaching';
+"""
+
+
+def legacy_loop(cur, start_year, end_year):
+    result = {}
+    for yr in range(start_year, end_year + 1):
+        for gender in FACULTY_GENDERS:
+            cur.execute(LEGACY_QUERY, (yr, yr, gender))
+            result[(yr, gender)] = int(cur.fetchone()['count'])
+    return result
+
+
+def single_query(cur, start_year, end_year):
+    cur.execute(FACULTY_GENDER_BY_YEAR_QUERY, (start_year, end_year))
+    result = {}
+    for row in cur.fetchall():
+        for gender in FACULTY_GENDERS:
+            result[(row['year'], gender)] = int(row[gender.lower()] or 0)
+    return result
+
+
+def time_it(fn, cur, start_year, end_year, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(cur, start_year, end_year)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    current_year = date.today().year
+    parser = argparse.ArgumentParser(description="Benchmark faculty gender per-year queries")
+    parser.add_argument("--db-url", default=os.environ.get("DATABASE_URL"), help="PostgreSQL URL (default: $DATABASE_URL)")
+    parser.add_argument("--start-year", type=int, default=current_year - 5)
+    parser.add_argument("--end-year", type=int, default=current_year - 1)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    if not args.db_url:
+        parser.error("DATABASE_URL is not set; pass --db-url")
+
+    conn = psycopg2.connect(args.db_url, cursor_factory=psycopg2.extras.RealDictCursor)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM employees")
+        n_employees = cur.fetchone()['n']
+
+        old = legacy_loop(cur, args.start_year, args.end_year)
+        new = single_query(cur, args.start_year, args.end_year)
+        if old != new:
+            print("Result mismatch between legacy loop and single query!")
+            return 1
+
+        years = args.end_year - args.start_year + 1
+        legacy = time_it(legacy_loop, cur, args.start_year, args.end_year, args.repeat)
+        single = time_it(single_query, cur, args.start_year, args.end_year, args.repeat)
+    finally:
+        conn.close()
+
+    print(f"employees rows : {n_employees}")
+    print(f"years          : {args.start_year}-{args.end_year} ({years} years)")
+    print(f"{'variant':<28}{'queries':>8}{'median ms':>12}{'mean ms':>12}")
+    print(f"{'legacy (year x gender loop)':<28}{years * len(FACULTY_GENDERS):>8}"
+          f"{statistics.median(legacy):>12.2f}{statistics.mean(legacy):>12.2f}")
+    print(f"{'single FILTER query':<28}{1:>8}"
+          f"{statistics.median(single):>12.2f}{statistics.mean(single):>12.2f}")
+    print(f"speed-up (median): {statistics.median(legacy) / statistics.median(single):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSV upload normalisation.
+
+Compares the old per-row loop of upload_csv (a header scan for every cell,
+per-value strip/lower and rule checks) against the column-oriented pandas
+pipeline in app.normalise. Both run over the same synthetic student_table
+style CSV held in memory; their outputs are checked for equality before the
+rows/sec figures are reported. No database is needed.
+
+Usage:
+    python tests/bench_upload_normalise.py
+    python tests/bench_upload_normalise.py --rows 200000 --repeat 3
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "Backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.normalise import iter_normalised_frames  # noqa: E402
+from app.ingest import ROW_COLUMN  # noqa: E402
+
+TABLE = "student_table"
+HEADERS = ["Roll_No", "Name", "Program", "Category", "Status", "PwD", "Gender",
+           "Department", "Admission_Year", "State", "Remarks"]
+COLUMNS = [h.lower() for h in HEADERS]
+REQUIRED = {"roll_no"}
+MAX_LENGTHS = {"name": 100, "program": 20, "category": 20, "status": 20,
+               "gender": 20, "department": 100, "state": 50, "remarks": 200}
+
+
+def make_csv(n_rows, seed=42):
+    rnd = random.Random(seed)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADERS)
+    for i in range(n_rows):
+        writer.writerow([
+            100000 + i,
+            f"Student {i}",
+            rnd.choice(["B.Tech", "M.Tech", "Ph.D", "M.Sc"]),
+            rnd.choice(["General", "OBC", "SC", "ST", " general "]),
+            rnd.choice(["Active", "Graduated", "active", ""]),
+            rnd.choice(["Yes", "no", "Y", "N", ""]),
+            rnd.choice(["Male", "Female"]),
+            rnd.choice(["CSE", "EE", "ME", "CE"]),
+            rnd.choice(["2019", "2020", "2021", "2022"]),
+            rnd.choice(["Kerala", "Tamil Nadu", "   ", "Karnataka"]),
+            "" if i % 3 else f"note {i}",
+        ])
+    return buf.getvalue()
+
+
+def legacy_rows(reader, csv_headers, columns_to_insert, required_cols, col_max_lengths, table_name):
+    """The row-by-row loop upload_csv used before the column-oriented pipeline."""
+    BOOL_COLS = {'pwd', 'is_active', 'is_from_iitpkd', 'pwd_exs',
+                 'certification_earned', 'is_top_recruiter', 'isactive'}
+    for i, row in enumerate(reader, start=1):
+        row_vals, is_empty = [], True
+        for col in columns_to_insert:
+            val = next(
+                (row[h] for h in csv_headers if h.lower() == col.lower() and h in row),
+                row.get(col)
+            )
+            if val is not None and str(val).strip() == '':
+                val = None
+            if val is not None:
+                is_empty = False
+            if val is None and col.lower() in required_cols:
+                raise ValueError(f"Row {i}: '{col}' cannot be empty.")
+            row_vals.append(val)
+        if is_empty:
+            continue
+        norm = list(row_vals)
+        for idx, col in enumerate(columns_to_insert):
+            v = norm[idx]
+            if v is None:
+                continue
+            vs = str(v).strip()
+            if col.lower() in BOOL_COLS:
+                norm[idx] = 'TRUE' if vs.lower() in {'yes', 'y', 'true', '1'} else (
+                             'FALSE' if vs.lower() in {'no', 'n', 'false', '0'} else v)
+            if table_name == 'student_table' and col.lower() == 'program':
+                norm[idx] = vs.replace('.', '')
+            if col.lower() == 'category' and vs.lower() == 'general':
+                norm[idx] = 'Gen'
+            if table_name == 'student_table' and col.lower() == 'status' and vs.lower() == 'active':
+                norm[idx] = 'Ongoing'
+        for col_name, val in zip(columns_to_insert, norm):
+            max_len = col_max_lengths.get(col_name.lower())
+            if val is not None and max_len is not None and len(str(val)) > max_len:
+                raise ValueError(f"Row {i}: '{col_name}' too long.")
+        yield i, tuple(norm)
+
+
+def run_legacy(text):
+    reader = csv.DictReader(io.StringIO(text, newline=''))
+    return list(legacy_rows(reader, reader.fieldnames, COLUMNS, REQUIRED, MAX_LENGTHS, TABLE))
+
+
+def run_columnar(text):
+    reader = csv.DictReader(io.StringIO(text, newline=''))
+    return list(iter_normalised_frames(reader, reader.fieldnames, COLUMNS, REQUIRED, MAX_LENGTHS, TABLE))
+
+
+def frames_to_rows(frames):
+    rows = []
+    for frame in frames:
+        values = frame[COLUMNS].astype(object).where(frame[COLUMNS].notna(), None)
+        rows.extend(zip(frame[ROW_COLUMN].tolist(), map(tuple, values.itertuples(index=False))))
+    return rows
+
+
+def best_of(fn, text, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload CSV normalisation")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic CSV rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant (best is kept)")
+    args = parser.parse_args()
+
+    text = make_csv(args.rows)
+    if run_legacy(text) != frames_to_rows(run_columnar(text)):
+        print("Output mismatch between legacy loop and column-oriented pipeline!")
+        return 1
+
+    legacy = best_of(run_legacy, text, args.repeat)
+    columnar = best_of(run_columnar, text, args.repeat)
+
+    print(f"rows           : {args.rows} x {len(COLUMNS)} columns")
+    print(f"{'variant':<24}{'seconds':>10}{'rows/sec':>14}")
+    print(f"{'legacy per-row loop':<24}{legacy:>10.3f}{args.rows / legacy:>14,.0f}")
+    print(f"{'column-oriented':<24}{columnar:>10.3f}{args.rows / columnar:>14,.0f}")
+    print(f"speed-up: {legacy / columnar:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
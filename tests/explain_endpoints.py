@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Index report: which index does each dashboard query use?
+
+Calls every parameterless GET endpoint of the backend (plus the filtered
+variants in SAMPLE_QUERIES) through the Flask test client, records every
+SELECT it sends to PostgreSQL, and replays each one through
+EXPLAIN (ANALYZE, FORMAT JSON) against the database in DATABASE_URL. For each
+query the report lists its execution time, the indexes in its plan and the
+tables it still reads with a sequential scan, followed by per-index and
+per-table totals. Every replay runs in a transaction that is rolled back.
+
+On the small sample data PostgreSQL prefers sequential scans regardless of
+indexes; pass --no-seqscan to see which index the planner would pick once
+the tables grow.
+
+Usage:
+    python tests/explain_endpoints.py
+    python tests/explain_endpoints.py --prefix /api/administrative --no-seqscan
+    python tests/explain_endpoints.py --url '/api/iar/summary?year=2022' --json report.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import secrets
+import sys
+from collections import Counter
+from pathlib import Path
+
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "Backend"
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+# Representative filters, so the filter-column indexes get exercised too.
+SAMPLE_QUERIES = {
+    '/api/academic/stats/gender-distribution-filtered': ['?yearofadmission=2022&program=BTech'],
+    '/api/academic/stats/student-strength': ['?yearofadmission=2022'],
+    '/api/academic/stats/program-trends': ['?department=CSE'],
+    '/api/administrative/stats/employee-overview': ['?department=CSE&emp_type=Teaching'],
+    '/api/administrative/stats/yearwise-strength': ['?emp_type=Teaching&department=CSE'],
+    '/api/iar/summary': ['?year=2022&department=CSE'],
+    '/api/iar/dashboard': ['?department=CSE&course_type=BTech'],
+    '/api/education/summary': ['?year=2023&department=CSE'],
+    '/api/education/list': ['?department=CSE'],
+    '/api/placement/recruiters': ['?year=2023&sector=IT'],
+    '/api/research-module/publications/summary': ['?publication_year=2023&department=CSE'],
+    '/api/research-module/publications/list': ['?department=CSE'],
+}
+
+
+def record_queries():
+    """Patches RealDictCursor (used by every backend connection) to log executed SELECTs."""
+    recorded = []
+    original = psycopg2.extras.RealDictCursor.execute
+
+    def execute(cur, query, vars=None):
+        result = original(cur, query, vars)
+        sql = cur.query.decode('utf-8') if isinstance(cur.query, bytes) else cur.query
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            recorded.append(sql)
+        return result
+
+    psycopg2.extras.RealDictCursor.execute = execute
+    return recorded
+
+
+def endpoint_urls(app, prefix, extra_urls):
+    urls = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if 'GET' not in rule.methods or rule.arguments or not rule.rule.startswith(prefix):
+            continue
+        if rule.rule.startswith('/static'):
+            continue
+        urls.append(rule.rule)
+        urls.extend(rule.rule + q for q in SAMPLE_QUERIES.get(rule.rule, []))
+    return urls + list(extra_urls)
+
+
+def plan_usage(node, indexes, seq_scans):
+    """Collects (index, relation) pairs and sequentially scanned relations of a plan tree."""
+    if 'Index Name' in node:
+        indexes.append((node['Index Name'], node.get('Relation Name')))
+    elif node.get('Node Type') == 'Seq Scan':
+        seq_scans.append(node['Relation Name'])
+    for child in node.get('Plans', []):
+        plan_usage(child, indexes, seq_scans)
+
+
+def explain(cur, sql, no_seqscan):
+    cur.execute("BEGIN")
+    try:
+        if no_seqscan:
+            cur.execute("SET LOCAL enable_seqscan = off")
+        cur.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+        plan = cur.fetchone()[0][0]
+    finally:
+        cur.execute("ROLLBACK")
+    indexes, seq_scans = [], []
+    plan_usage(plan['Plan'], indexes, seq_scans)
+    return plan['Execution Time'], indexes, seq_scans
+
+
+def one_line(sql, width=100):
+    text = ' '.join(sql.split())
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the indexes used by each endpoint's queries")
+    parser.add_argument("--db-url", default=os.environ.get("DATABASE_URL"), help="PostgreSQL URL (default: $DATABASE_URL)")
+    parser.add_argument("--prefix", default="/api/", help="Only endpoints under this path")
+    parser.add_argument("--url", action="append", default=[], help="Extra URL (with query string) to replay")
+    parser.add_argument("--no-seqscan", action="store_true", help="Discourage sequential scans (enable_seqscan = off)")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    if not args.db_url:
+        parser.error("DATABASE_URL is not set; pass --db-url")
+    os.environ['DATABASE_URL'] = args.db_url
+    os.environ['RESPONSE_CACHE_ENABLED'] = '0'
+    os.environ.setdefault('JWT_SECRET_KEY', secrets.token_hex(32))
+
+    from app import create_app, cache  # noqa: E402
+    from app.auth import encode_auth_token  # noqa: E402
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {encode_auth_token(1, 1)}'}
+
+    recorded = record_queries()
+    conn = psycopg2.connect(args.db_url)
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    report, index_use, seq_use = [], Counter(), Counter()
+    try:
+        for url in endpoint_urls(app, args.prefix, args.url):
+            cache.clear()
+            recorded.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                status = client.get(url, headers=headers).status_code
+            print(f"GET {url}  [{status}]")
+            queries = []
+            for sql in recorded:
+                try:
+                    ms, indexes, seq_scans = explain(cur, sql, args.no_seqscan)
+                except psycopg2.Error as e:
+                    print(f"  EXPLAIN failed: {one_line(str(e))}")
+                    continue
+                index_use.update(name for name, rel in indexes if not (rel or '').startswith('pg_'))
+                seq_use.update(seq_scans)
+                used = ', '.join(sorted({f"{name} ({rel})" if rel else name for name, rel in indexes})) or '-'
+                print(f"  {ms:8.2f} ms  {one_line(sql)}")
+                print(f"              index: {used}")
+                if seq_scans:
+                    print(f"              seq scan: {', '.join(sorted(set(seq_scans)))}")
+                queries.append({'sql': sql, 'ms': ms, 'indexes': indexes, 'seq_scans': seq_scans})
+            report.append({'url': url, 'status': status, 'queries': queries})
+    finally:
+        conn.close()
+
+    print("\nIndex usage (plan nodes, catalog indexes left out):")
+    for name, count in index_use.most_common():
+        print(f"  {count:5}  {name}")
+    print("\nSequential scans (plan nodes):")
+    for name, count in seq_use.most_common():
+        print(f"  {count:5}  {name}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())